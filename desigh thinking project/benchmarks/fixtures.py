@@ -0,0 +1,103 @@
+"""
+Benchmark Fixtures
+==================
+
+Loads the checked-in landmark streams and sample frame used by the
+benchmarks.
+
+A landmark stream is a JSON file:
+
+    {
+      "description": "...",
+      "source": "webcam (record_landmarks.py)" or "posed (make_fixtures.py)",
+      "fps": 30,
+      "labels": [expected gesture or null, one per frame],
+      "frames": [null (no hand) or [x0, y0, z0, x1, y1, z1, ... x20, y20, z20]]
+    }
+
+Coordinates are MediaPipe's normalized image coordinates. Frames are loaded
+as objects with the same `.landmark[i].x / .y / .z` shape as MediaPipe
+results, so they can be passed straight to detect_gesture().
+"""
+
+import json
+import os
+from collections import namedtuple
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_FRAME = os.path.join(FIXTURE_DIR, "sample_frame.jpg")
+NUM_LANDMARKS = 21
+
+Landmark = namedtuple("Landmark", "x y z")
+
+
+class HandLandmarks:
+    """Stand-in for a MediaPipe NormalizedLandmarkList."""
+
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [Landmark(*p) for p in points]
+
+
+def landmark_stream_paths():
+    """All landmark stream fixtures, sorted by name."""
+    return sorted(os.path.join(FIXTURE_DIR, name) for name in os.listdir(FIXTURE_DIR)
+                  if name.startswith("landmarks_") and name.endswith(".json"))
+
+
+def load_landmark_stream(path):
+    """
+    Load a landmark stream fixture.
+
+    Args:
+        path: Fixture file (or a bare name like "landmarks_steady")
+
+    Returns:
+        dict: The fixture, with "frames" as HandLandmarks objects (or None)
+    """
+    if not os.path.exists(path):
+        path = os.path.join(FIXTURE_DIR, path if path.endswith(".json") else path + ".json")
+    with open(path) as f:
+        stream = json.load(f)
+    stream["frames"] = [
+        None if flat is None else HandLandmarks(zip(flat[0::3], flat[1::3], flat[2::3]))
+        for flat in stream["frames"]
+    ]
+    return stream
+
+
+def save_landmark_stream(path, frames, labels=None, fps=30, description="", source=""):
+    """
+    Write a landmark stream fixture.
+
+    Args:
+        path: Output JSON file
+        frames: List of None or 21 (x, y, z) points per frame
+        labels: Expected gesture per frame (None where no gesture is expected)
+        fps: Frame rate the stream was recorded at
+        description: What the stream contains
+        source: How it was produced
+    """
+    flat_frames = [
+        None if points is None else [round(v, 4) for point in points for v in point]
+        for points in frames
+    ]
+    with open(path, 'w') as f:
+        json.dump({
+            "description": description,
+            "source": source,
+            "fps": fps,
+            "labels": labels if labels is not None else [None] * len(frames),
+            "frames": flat_frames,
+        }, f, separators=(",", ":"))
+
+
+def load_sample_frame():
+    """Load the sample 640x480 BGR webcam frame."""
+    import cv2
+
+    frame = cv2.imread(SAMPLE_FRAME)
+    if frame is None:
+        raise FileNotFoundError(SAMPLE_FRAME)
+    return frame
@@ -0,0 +1,67 @@
+"""
+Benchmark Fixture Generator
+===========================
+
+Builds the checked-in benchmark fixtures without a camera:
+
+    fixtures/landmarks_steady.json   Clean holds of every gesture with
+                                     transitions between them
+    fixtures/landmarks_jittery.json  Same gestures with hand tremor, occluded
+                                     fingers and frames where the hand is lost
+    fixtures/sample_frame.jpg        640x480 webcam-like frame showing a
+                                     peace-sign hand (rendered, so the hand
+                                     model really finds a hand in it)
+
+Hands come from synthetic_hands.py (a skeleton in MediaPipe's 21-landmark
+layout), so every held frame is labelled with the gesture detect_gesture()
+should report. Streams recorded from a real webcam with record_landmarks.py
+use the same format and can be dropped into fixtures/ alongside these.
+
+Usage: python benchmarks/make_fixtures.py [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic_hands
+from fixtures import FIXTURE_DIR, SAMPLE_FRAME, save_landmark_stream
+
+
+def make_sample_frame(rng, path):
+    """Draw a 640x480 webcam-like frame with a peace-sign hand that MediaPipe detects."""
+    import cv2
+
+    frame = synthetic_hands.render_hand_frame("peace_sign", 640, 480, seed=rng.randint(0, 2 ** 31))
+    cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate benchmark fixtures")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed (fixtures are reproducible)")
+    args = parser.parse_args()
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    rng = random.Random(args.seed)
+    streams = {
+        "landmarks_steady": ("Clean holds of every gesture with transitions", dict(jitter=0.002)),
+        "landmarks_jittery": ("Hand tremor, occluded fingers and dropped frames (limited-mobility conditions)",
+                              dict(jitter=0.006, tremor=0.004, occlusion=0.15, dropout=0.08)),
+    }
+    for offset, (name, (description, conditions)) in enumerate(streams.items()):
+        sequence = synthetic_hands.generate_sequence(args.seed + offset, holds=20, **conditions)
+        frames = [points.tolist() if present else None
+                  for points, present in zip(sequence["landmarks"], sequence["present"])]
+        path = os.path.join(FIXTURE_DIR, name + ".json")
+        save_landmark_stream(path, frames, sequence["labels"], fps=30, description=description,
+                             source="synthetic (make_fixtures.py / synthetic_hands.py)")
+        print(f"✓ {path}: {len(frames)} frames")
+    make_sample_frame(rng, SAMPLE_FRAME)
+    print(f"✓ {SAMPLE_FRAME}")
+
+
+if __name__ == "__main__":
+    main()
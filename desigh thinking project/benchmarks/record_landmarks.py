@@ -0,0 +1,79 @@
+"""
+Landmark Stream Recorder
+========================
+
+Records hand landmarks from the webcam into a benchmark fixture
+(same format as fixtures/landmarks_*.json), so benchmarks can run against
+real hands without a camera later.
+
+Hold one gesture per recording and pass it with --label; every frame with
+a hand is then labelled with that gesture. Press 'q' to stop early.
+
+Usage: python benchmarks/record_landmarks.py landmarks_thumb_up_alice.json
+                                             [--seconds 10] [--label thumb_up]
+                                             [--save-frame]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+import virtual_led_controller as vlc
+from fixtures import FIXTURE_DIR, SAMPLE_FRAME, save_landmark_stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a landmark stream fixture from the webcam")
+    parser.add_argument("output", help="Fixture file name (saved in benchmarks/fixtures/ unless a path is given)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Recording length")
+    parser.add_argument("--label", help="Gesture being held (labels every frame with a hand)")
+    parser.add_argument("--save-frame", action="store_true", help="Also save a frame as the sample frame")
+    args = parser.parse_args()
+
+    output = args.output if os.path.dirname(args.output) else os.path.join(FIXTURE_DIR, args.output)
+    cap = vlc.open_webcam()
+    if cap is None:
+        print("❌ Cannot open webcam")
+        return
+    hands = vlc.load_hand_tracking()
+
+    frames, labels = [], []
+    saved_frame = not args.save_frame
+    start = time.perf_counter()
+    print(f"🎥 Recording {args.seconds:g}s - hold {args.label or 'your gestures'} in view")
+    while time.perf_counter() - start < args.seconds:
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            continue
+        frame = cv2.flip(frame, 1)
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            landmarks = results.multi_hand_landmarks[0].landmark
+            frames.append([(p.x, p.y, p.z) for p in landmarks])
+            labels.append(args.label)
+            if not saved_frame:
+                cv2.imwrite(SAMPLE_FRAME, frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                saved_frame = True
+        else:
+            frames.append(None)
+            labels.append(None)
+        cv2.imshow("Recording landmarks", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    elapsed = time.perf_counter() - start
+
+    cap.release()
+    cv2.destroyAllWindows()
+    hands.close()
+    save_landmark_stream(output, frames, labels, fps=round(len(frames) / elapsed), source="webcam (record_landmarks.py)",
+                         description=f"Recorded {time.strftime('%Y-%m-%d')}" + (f", holding {args.label}" if args.label else ""))
+    print(f"✓ Saved {len(frames)} frames to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Gesture Pipeline Benchmarks
+===========================
+
+Times the gesture pipeline against the checked-in fixtures. No camera is
+needed. A display is needed only for the draw_device benchmark, which is
+skipped without one.
+
+    detect_gesture          Landmarks → gesture, every hand frame of every stream
+    debounce_gesture        Raw gestures → confirmed gestures
+    process_gesture_action  Confirmed gestures → device changes
+    build_overlay_lines     Device states → status lines
+    draw_overlay            Status lines drawn onto the sample frame
+    draw_device             LEDController sprite swaps (needs a display)
+    pipeline_fps            Full frame: flip, colour conversion, hand inference
+                            (if MediaPipe is installed), detection, debounce,
+                            actuation and overlay. Fails if inference never
+                            finds the hand in the sample frame.
+
+Results are written as JSON. With a baseline, each benchmark is compared
+against it. The run fails (exit code 1) if any benchmark regressed by more
+than its threshold. Thresholds come from thresholds.json and can be
+overridden on the command line.
+
+Usage: python benchmarks/run_benchmarks.py                  (run and compare with the baseline)
+       python benchmarks/run_benchmarks.py --save-baseline  (run and make it the new baseline)
+       python benchmarks/run_benchmarks.py --threshold 20 --threshold-for pipeline_fps=5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import cv2
+
+import virtual_led_controller as vlc
+from fixtures import landmark_stream_paths, load_landmark_stream, load_sample_frame
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def time_passes(run_pass, calls, passes):
+    """
+    Time whole passes over a workload; per-call cost is pass time / calls.
+
+    Timing a pass rather than each call keeps clock overhead out of
+    sub-microsecond functions.
+
+    Args:
+        run_pass: Function running one pass
+        calls: Calls per pass
+        passes: Timed passes (one untimed warm-up pass runs first)
+
+    Returns:
+        dict: Median and best microseconds per call
+    """
+    run_pass()
+    per_call = []
+    for _ in range(passes):
+        start = time.perf_counter()
+        run_pass()
+        per_call.append((time.perf_counter() - start) / calls * 1e6)
+    return {
+        "value": round(statistics.median(per_call), 3),
+        "unit": "us_per_call",
+        "lower_is_better": True,
+        "best_us": round(min(per_call), 3),
+        "calls_per_pass": calls,
+        "passes": passes,
+    }
+
+
+def load_workload():
+    """Hand frames, raw gestures and confirmed gestures from every landmark stream."""
+    hands, raw, confirmed = [], [], []
+    for path in landmark_stream_paths():
+        hands += [frame for frame in load_landmark_stream(path)["frames"] if frame is not None]
+    raw = [vlc.detect_gesture(hand) for hand in hands]
+    vlc.reset_pipeline_state()
+    confirmed = [vlc.debounce_gesture(gesture) for gesture in raw]
+    return hands, raw, confirmed
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+def bench_detect_gesture(workload, passes):
+    hands = workload[0]
+    detect = vlc.detect_gesture
+
+    def run_pass():
+        for hand in hands:
+            detect(hand)
+    return time_passes(run_pass, len(hands), passes)
+
+
+def bench_debounce_gesture(workload, passes):
+    raw = workload[1]
+    debounce = vlc.debounce_gesture
+
+    def run_pass():
+        vlc.gesture_history.clear()
+        for gesture in raw:
+            debounce(gesture)
+    return time_passes(run_pass, len(raw), passes)
+
+
+def bench_process_gesture_action(workload, passes):
+    confirmed = [gesture for gesture in workload[2] if gesture]  # The frame loop skips None
+    process = vlc.process_gesture_action
+
+    def run_pass():
+        vlc.last_gesture = None
+        for gesture in confirmed:
+            process(gesture)
+
+    with contextlib.redirect_stdout(io.StringIO()):  # toggle_led prints every change
+        result = time_passes(run_pass, len(confirmed), passes)
+    vlc.reset_pipeline_state()
+    return result
+
+
+def bench_build_overlay_lines(workload, passes, repeat=200):
+    _, states = vlc.get_device_states()
+
+    def run_pass():
+        for _ in range(repeat):
+            vlc.build_overlay_lines(states, max_y=450)
+    return time_passes(run_pass, repeat, passes)
+
+
+def bench_draw_overlay(workload, passes, repeat=200):
+    frame = load_sample_frame()
+    _, states = vlc.get_device_states()
+    lines = vlc.build_overlay_lines(states, max_y=frame.shape[0] - 30)
+
+    def run_pass():
+        for _ in range(repeat):
+            vlc.draw_overlay(frame, lines)
+    return time_passes(run_pass, repeat, passes)
+
+
+def bench_draw_device(workload, passes, repeat=50):
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": f"no display ({e})"}
+    root.withdraw()
+    app = vlc.LEDController(root)
+    root.update_idletasks()
+    device_ids = list(app.led_canvases)
+
+    def run_pass():
+        for i in range(repeat):
+            app.animation_angle = (i * 15) % 360
+            for device_id in device_ids:
+                app.draw_device(app.led_canvases[device_id], device_id, bool(i % 2))
+        root.update_idletasks()
+    try:
+        return time_passes(run_pass, repeat * len(device_ids), passes)
+    finally:
+        vlc.remove_device_listener(app.on_device_change)
+        with contextlib.suppress(tk.TclError):
+            root.destroy()
+
+
+def bench_pipeline_fps(workload, passes, frames=300, use_inference=True):
+    """Full frame-loop work per frame; fixture landmarks stand in for detection results."""
+    sample = load_sample_frame()
+    hands_model = None
+    if use_inference:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                hands_model = vlc.load_hand_tracking()
+                vlc.warm_up_hands(hands_model, sample.shape[1], sample.shape[0])
+        except ImportError:
+            hands_model = None
+    hands = workload[0]
+    overlay_version, lines = -1, []
+    frame_ms = []
+    hand_frames = 0
+    vlc.reset_pipeline_state()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(frames):
+            t0 = time.perf_counter()
+            frame = cv2.flip(sample, 1)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if hands_model is not None and hands_model.process(rgb).multi_hand_landmarks:
+                hand_frames += 1
+            confirmed = vlc.debounce_gesture(vlc.detect_gesture(hands[i % len(hands)]))
+            if confirmed:
+                vlc.process_gesture_action(confirmed)
+            if overlay_version != vlc.state_version:
+                overlay_version, states = vlc.get_device_states()
+                lines = vlc.build_overlay_lines(states, max_y=frame.shape[0] - 30)
+            vlc.draw_overlay(frame, lines)
+            frame_ms.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+    if hands_model is not None:
+        hands_model.close()
+    vlc.reset_pipeline_state()
+    if hands_model is not None and not hand_frames:
+        # Without a hand only the palm detector runs, and the timing leaves out the landmark model
+        raise RuntimeError("pipeline_fps: no hand found in the sample frame - regenerate it with make_fixtures.py")
+
+    frame_ms.sort()
+    return {
+        "value": round(frames / elapsed, 1),
+        "unit": "fps",
+        "lower_is_better": False,
+        "frame_p50_ms": round(frame_ms[len(frame_ms) // 2], 3),
+        "frame_p95_ms": round(frame_ms[int(len(frame_ms) * 0.95)], 3),
+        "inference": hands_model is not None,
+        "hand_frames": hand_frames,
+        "frames": frames,
+    }
+
+
+BENCHMARKS = {
+    "detect_gesture": bench_detect_gesture,
+    "debounce_gesture": bench_debounce_gesture,
+    "process_gesture_action": bench_process_gesture_action,
+    "build_overlay_lines": bench_build_overlay_lines,
+    "draw_overlay": bench_draw_overlay,
+    "draw_device": bench_draw_device,
+    "pipeline_fps": bench_pipeline_fps,
+}
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def load_thresholds(default, overrides):
+    """
+    Regression thresholds in percent, per benchmark.
+
+    thresholds.json supplies per-benchmark values; --threshold replaces its
+    default and --threshold-for NAME=PCT replaces single benchmarks.
+    """
+    thresholds = {"default": 15.0}
+    if os.path.exists(THRESHOLDS_FILE):
+        with open(THRESHOLDS_FILE) as f:
+            thresholds.update(json.load(f))
+    if default is not None:
+        thresholds["default"] = default
+    for override in overrides:
+        name, _, pct = override.partition("=")
+        thresholds[name] = float(pct)
+    return thresholds
+
+
+def compare(results, baseline, thresholds):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        list: Names of benchmarks that regressed beyond their threshold
+    """
+    regressions = []
+    print(f"\n  {'Benchmark':24} {'Baseline':>12} {'Now':>12} {'Change':>9}  Limit")
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        if "value" not in result or "value" not in base or not base["value"]:
+            print(f"  {name:24} {'-':>12} {result.get('value', 'skipped'):>12}")
+            continue
+        change = (result["value"] - base["value"]) / base["value"] * 100
+        worse = change if result["lower_is_better"] else -change
+        limit = thresholds.get(name, thresholds["default"])
+        regressed = worse > limit
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:24} {base['value']:>12} {result['value']:>12} {change:>+8.1f}%  "
+              f"{limit:g}%{'  ❌ REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def environment():
+    """Describe the machine and library versions the results came from."""
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "fixtures": [os.path.basename(path) for path in landmark_stream_paths()],
+    }
+    try:
+        from importlib.metadata import version
+        meta["mediapipe"] = version("mediapipe")
+    except Exception:
+        meta["mediapipe"] = None
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline on recorded fixtures")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--passes", type=int, default=15, help="Timed passes per micro-benchmark")
+    parser.add_argument("--pipeline-frames", type=int, default=300, help="Frames for pipeline_fps")
+    parser.add_argument("--no-inference", action="store_true", help="Leave hands.process out of pipeline_fps")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save these results as the baseline")
+    parser.add_argument("--threshold", type=float, help="Default regression threshold in percent")
+    parser.add_argument("--threshold-for", action="append", default=[], metavar="NAME=PCT",
+                        help="Regression threshold for one benchmark")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("⏱  GESTURE PIPELINE BENCHMARKS")
+    print("=" * 70)
+    workload = load_workload()
+    print(f"  Workload: {len(workload[0])} hand frames, "
+          f"{sum(1 for g in workload[2] if g)} confirmed gestures")
+
+    results = {}
+    for name in [name for name in BENCHMARKS if not args.only or name in args.only]:  # Fixed order
+        if name == "pipeline_fps":
+            result = bench_pipeline_fps(workload, args.passes, args.pipeline_frames, not args.no_inference)
+        else:
+            result = BENCHMARKS[name](workload, args.passes)
+        results[name] = result
+        if "skipped" in result:
+            print(f"  {name:24} skipped: {result['skipped']}")
+        else:
+            print(f"  {name:24} {result['value']:>10} {result['unit']}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    report = {"meta": environment(), "results": results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {args.output}")
+
+    exit_code = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], load_thresholds(args.threshold, args.threshold_for))
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            print("\n✓ No regressions against the baseline")
+    else:
+        print(f"ℹ No baseline at {args.baseline} - run with --save-baseline to create one")
+    print("=" * 70)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
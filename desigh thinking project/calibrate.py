@@ -0,0 +1,372 @@
+"""
+Per-User Gesture Calibration
+============================
+
+Tunes the detection thresholds (DETECTION_PARAMS) and DEBOUNCE_FRAMES to one
+person's hands. Fixed thresholds suit a hand that straightens its fingers
+fully. Someone who can only bend a finger part of the way gets missed
+gestures or the wrong gesture.
+
+1. Record: the webcam window asks for each gesture in turn ("hold THUMB UP"),
+   then for a rest period with the hand moving freely. That rest period
+   measures false triggers. The recording is saved as a labelled landmark
+   stream in calibration/<user>.json.
+2. Tune: a grid search over finger angle, thumb offset and debounce length
+   runs against the recording, spread across worker processes. Each candidate
+   is scored like evaluate_accuracy.py scores recordings. The winner has the
+   best event F1 (gestures confirmed vs. false confirmations) among settings
+   whose p95 latency-to-confirm stays within --max-latency.
+3. Save: the winner is written to user_profiles/<user>.json. The controller
+   loads it at startup with --user <user>.
+
+Thresholds are tested with a vectorized copy of detect_gesture()'s rules
+over angles measured once per frame, so thousands of settings take seconds.
+The winner is then re-checked with the real detect_gesture() and
+debounce_gesture().
+
+Usage: python calibrate.py --user alice                      (record, tune, save)
+       python calibrate.py --user alice --recording calibration/alice.json [more...]
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "benchmarks"))
+
+import virtual_led_controller as vlc
+import evaluate_accuracy
+
+CALIBRATION_DIR = "calibration"  # Recorded calibration sessions (<user>.json)
+PROMPT_SECONDS = 2.0  # "Get ready" before each gesture
+HOLD_SECONDS = 3.0  # How long each gesture is held
+REACTION_SECONDS = 0.5  # Start of each hold left unlabelled while the hand gets into position
+REST_SECONDS = 6.0  # Free movement without gestures at the end (measures false triggers)
+ROUNDS = 2  # Times each gesture is asked for (in shuffled order)
+MAX_LATENCY_MS = 250.0  # Default bound on p95 latency-to-confirm
+
+# Default search space: (start, stop, step), stop included
+ANGLE_RANGE = (100, 170, 5)
+OFFSET_RANGE = (0.0, 0.12, 0.01)
+DEBOUNCE_RANGE = (1, 6, 1)
+
+FINGERS = ((8, 6, 5), (12, 10, 9), (16, 14, 13), (20, 18, 17))  # (tip, pip, mcp): index, middle, ring, pinky
+CODES = (None, "thumb_up", "thumb_down", "index_up", "peace_sign", "three_fingers")
+
+_streams = None  # Per-worker stream features, set by init_worker()
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+def calibration_script(rounds=ROUNDS, seed=None):
+    """
+    The prompts of a calibration session.
+
+    Returns:
+        list: (gesture or None for rest, seconds) steps
+    """
+    order = []
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        gestures = list(vlc.GESTURE_TO_LED)
+        rng.shuffle(gestures)
+        order += gestures
+    return [(gesture, HOLD_SECONDS) for gesture in order] + [(None, REST_SECONDS)]
+
+
+def record_session(path, rounds=ROUNDS):
+    """
+    Ask for each gesture on camera and save the labelled landmark stream.
+
+    Returns:
+        bool: True if the session was recorded (False if cancelled or no webcam)
+    """
+    import cv2
+    from fixtures import save_landmark_stream
+
+    cap = vlc.open_webcam()
+    if cap is None:
+        print("❌ Cannot open webcam")
+        return False
+    hands = vlc.load_hand_tracking()
+    frames, labels = [], []
+    start = time.perf_counter()
+    cancelled = False
+    try:
+        for gesture, seconds in calibration_script(rounds):
+            name = gesture.replace("_", " ").upper() if gesture else "REST: move your hand freely, no gestures"
+            for phase, duration in (("Get ready", PROMPT_SECONDS), ("Hold", seconds)):
+                phase_start = time.perf_counter()
+                while (elapsed := time.perf_counter() - phase_start) < duration:
+                    ret, frame = cap.read()
+                    if not ret or frame is None:
+                        continue
+                    frame = cv2.flip(frame, 1)
+                    results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                    labelled = phase == "Hold" and elapsed >= REACTION_SECONDS
+                    if results.multi_hand_landmarks:
+                        frames.append([(p.x, p.y, p.z) for p in results.multi_hand_landmarks[0].landmark])
+                    else:
+                        frames.append(None)
+                    labels.append(gesture if labelled else None)
+                    color = (0, 255, 0) if phase == "Hold" else (0, 200, 255)
+                    cv2.putText(frame, f"{phase}: {name}", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+                    cv2.putText(frame, f"{duration - elapsed:.1f}s", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+                    cv2.imshow("Calibration", frame)
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        cancelled = True
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+        hands.close()
+    if cancelled:
+        print("⚠ Calibration cancelled, nothing saved")
+        return False
+    elapsed = time.perf_counter() - start
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    save_landmark_stream(path, frames, labels, fps=round(len(frames) / elapsed), source="webcam (calibrate.py)",
+                         description=f"Calibration session {time.strftime('%Y-%m-%d')}")
+    print(f"✓ Saved {len(frames)} frames to {path}")
+    return True
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def stream_features(path):
+    """
+    Everything detect_gesture() looks at, measured once per frame.
+
+    Returns:
+        dict: Per-frame times, truth labels and hand mask; per-hand finger
+              angles, thumb measurements
+    """
+    times, truths, hand_mask, rows = [], [], [], []
+    for t, hand, truth in evaluate_accuracy.iter_frames(path):
+        times.append(t)
+        truths.append(truth)
+        hand_mask.append(hand is not None)
+        if hand is not None:
+            lm = hand.landmark
+            angles = [vlc.calculate_angle(lm[mcp], lm[pip], lm[tip]) for tip, pip, mcp in FINGERS]
+            rows.append(angles + [lm[4].y < lm[3].y, abs(lm[4].x - lm[0].x), vlc.is_thumb_extended_down(lm)])
+    rows = np.array(rows, dtype=np.float64).reshape(-1, 7)
+    return {
+        "path": path, "times": times, "truths": truths, "hands": hand_mask,
+        "hand_index": np.flatnonzero(hand_mask), "angles": rows[:, :4], "thumb_above": rows[:, 4] > 0,
+        "thumb_dx": rows[:, 5], "thumb_down": rows[:, 6] > 0,
+    }
+
+
+def classify(features, finger_angle, thumb_offset):
+    """detect_gesture()'s rules over every hand of a stream at once (codes index CODES)."""
+    extended = features["angles"] > finger_angle
+    index, middle, ring, pinky = extended.T
+    count = extended.sum(axis=1)
+    thumb_up = features["thumb_above"] & (features["thumb_dx"] > thumb_offset)
+    thumb_down = features["thumb_down"]
+    return np.select([
+        thumb_up & (count == 0) & ~thumb_down,
+        thumb_down & (count == 0) & ~thumb_up,
+        index & ~middle & ~ring & ~pinky,
+        index & middle & ~ring & ~pinky,
+        index & middle & ring & ~pinky,
+    ], [1, 2, 3, 4, 5], 0)
+
+
+def debounce(codes, frames):
+    """debounce_gesture() over a sequence of hand codes: confirmed once `frames` in a row agree."""
+    positions = np.arange(len(codes))
+    changed = np.ones(len(codes), dtype=bool)
+    changed[1:] = codes[1:] != codes[:-1]
+    run = positions - np.maximum.accumulate(np.where(changed, positions, 0)) + 1
+    return np.where((run >= frames) & (codes != 0), codes, 0)
+
+
+def score_settings(streams, finger_angle, thumb_offset, debounce_frames):
+    """
+    Score one setting over all streams.
+
+    Returns:
+        dict: accuracy_report() of the merged streams
+    """
+    results = []
+    for features in streams:
+        detected = np.zeros(len(features["times"]), dtype=np.int64)
+        confirmed = np.zeros_like(detected)
+        codes = classify(features, finger_angle, thumb_offset)
+        detected[features["hand_index"]] = codes
+        confirmed[features["hand_index"]] = debounce(codes, debounce_frames)
+        results.append(evaluate_accuracy.score_frames(zip(
+            features["times"], features["truths"], features["hands"],
+            [CODES[c] for c in detected.tolist()], [CODES[c] for c in confirmed.tolist()])))
+    return evaluate_accuracy.accuracy_report(evaluate_accuracy.merge_results(
+        [dict(result, seconds=0.0, cpu_seconds=0.0, file="") for result in results]))
+
+
+def objective(report):
+    """
+    Event F1 averaged over the gestures in the recording, and the worst p95 latency-to-confirm.
+
+    Returns:
+        tuple: (event F1, frame accuracy, p95 latency in ms or None)
+    """
+    scores, latencies = [], []
+    for gesture in report["gestures"].values():
+        if not gesture["runs"]:
+            continue
+        recall = gesture["event_recall"] or 0.0
+        precision = gesture["event_precision"] or 0.0
+        scores.append(2 * precision * recall / (precision + recall) if precision + recall else 0.0)
+        if gesture["confirm_ms"]:
+            latencies.append(gesture["confirm_ms"][1])
+    return (sum(scores) / len(scores) if scores else 0.0, report["frame_accuracy"] or 0.0,
+            max(latencies) if latencies else None)
+
+
+def init_worker(streams):
+    global _streams
+    _streams = streams
+
+
+def score_chunk(settings):
+    """Score a batch of (finger_angle, thumb_offset, debounce_frames) settings (runs in a worker)."""
+    return [(setting, objective(score_settings(_streams, *setting))) for setting in settings]
+
+
+def search(streams, angles, offsets, debounces, workers):
+    """
+    Score every combination across a process pool.
+
+    Returns:
+        list: (setting, (event F1, frame accuracy, p95 latency)) for every setting
+    """
+    grid = list(itertools.product(angles, offsets, debounces))
+    chunks = [grid[i::workers * 4] for i in range(min(len(grid), workers * 4))]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker,
+                             initargs=(streams,)) as pool:
+        return [scored for chunk in pool.map(score_chunk, chunks) for scored in chunk]
+
+
+def rank(scored, max_latency):
+    """Best first: within the latency bound, then event F1, frame accuracy and lower latency."""
+    def key(item):
+        (angle, offset, frames), (event_f1, frame_accuracy, latency) = item
+        within = latency is None or latency <= max_latency
+        return (not within, -round(event_f1, 6), -round(frame_accuracy, 6),
+                latency if latency is not None else float("inf"), frames)
+    return sorted(scored, key=key)
+
+
+def verify(paths, setting):
+    """Score a setting with the real detect_gesture() / debounce_gesture()."""
+    angle, offset, frames = setting
+    previous = dict(vlc.DETECTION_PARAMS), vlc.DEBOUNCE_FRAMES
+    vlc.apply_detection_profile({"finger_angle": angle, "thumb_offset": offset}, frames)
+    try:
+        results = [evaluate_accuracy.evaluate_file(path) for path in paths]
+    finally:
+        vlc.apply_detection_profile(*previous)
+    return objective(evaluate_accuracy.accuracy_report(evaluate_accuracy.merge_results(results)))
+
+
+def parse_range(text, cast=float):
+    """'start:stop:step' (stop included) → list of values."""
+    start, stop, step = (cast(part) for part in text.split(":"))
+    count = int(round((stop - start) / step)) + 1
+    return [cast(round(start + i * step, 6)) for i in range(count)]
+
+
+def describe(setting, score):
+    angle, offset, frames = setting
+    event_f1, frame_accuracy, latency = score
+    latency_text = "-" if latency is None else f"{latency:.0f} ms"
+    return (f"angle {angle:g}°, thumb offset {offset:.2f}, debounce {frames}: event F1 {event_f1 * 100:5.1f}%, "
+            f"frame accuracy {frame_accuracy * 100:5.1f}%, p95 confirm {latency_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate gesture detection for one user")
+    parser.add_argument("--user", required=True, help="Profile name (use the same name with the controller's --user)")
+    parser.add_argument("--recording", nargs="+", metavar="FILE",
+                        help="Tune on existing labelled recordings instead of recording a new session")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Times each gesture is asked for")
+    parser.add_argument("--max-latency", type=float, default=MAX_LATENCY_MS,
+                        help="Bound on p95 latency-to-confirm in ms")
+    parser.add_argument("--angles", default=":".join(map(str, ANGLE_RANGE)), help="Finger angle start:stop:step")
+    parser.add_argument("--offsets", default=":".join(map(str, OFFSET_RANGE)), help="Thumb offset start:stop:step")
+    parser.add_argument("--debounce", default=":".join(map(str, DEBOUNCE_RANGE)), help="Debounce frames start:stop:step")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="Show the result without saving the profile")
+    args = parser.parse_args()
+
+    paths = args.recording
+    if not paths:
+        path = os.path.join(CALIBRATION_DIR, f"{args.user}.json")
+        print(f"🎥 Calibrating {args.user}: hold each gesture when asked, press 'q' to cancel")
+        if not record_session(path, args.rounds):
+            return
+        paths = [path]
+
+    print(f"📐 Measuring {len(paths)} recording(s)...")
+    streams = [stream_features(path) for path in paths]
+    angles = parse_range(args.angles)
+    offsets = parse_range(args.offsets)
+    debounces = parse_range(args.debounce, int)
+    total = len(angles) * len(offsets) * len(debounces)
+    print(f"🔍 Searching {total} settings with {args.workers} workers...")
+    start = time.perf_counter()
+    ranked = rank(search(streams, angles, offsets, debounces, args.workers), args.max_latency)
+    print(f"✓ Searched in {time.perf_counter() - start:.1f}s")
+
+    default = (vlc.DETECTION_PARAMS["finger_angle"], vlc.DETECTION_PARAMS["thumb_offset"], vlc.DEBOUNCE_FRAMES)
+    print(f"\n   Current:  {describe(default, objective(score_settings(streams, *default)))}")
+    for place, (setting, score) in enumerate(ranked[:5], 1):
+        print(f"   #{place}:       {describe(setting, score)}")
+    best, best_score = ranked[0]
+    if best_score[2] is not None and best_score[2] > args.max_latency:
+        print(f"⚠ No setting confirms within {args.max_latency:g} ms; using the most accurate one")
+
+    checked = verify(paths, best)
+    if any(abs(a - b) > 1e-9 for a, b in zip(checked[:2], best_score[:2])):
+        print(f"⚠ detect_gesture() scores this setting differently ({checked[0] * 100:.1f}% event F1); "
+              "calibrate.py's copy of its rules is out of date")
+    else:
+        print("✓ Confirmed with detect_gesture() and debounce_gesture()")
+    if args.dry_run:
+        return
+
+    profile = {
+        "user": args.user,
+        "calibrated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "recordings": paths,
+        "detection": {"finger_angle": best[0], "thumb_offset": best[1]},
+        "debounce_frames": best[2],
+        "max_latency_ms": args.max_latency,
+        "score": {"event_f1": checked[0], "frame_accuracy": checked[1], "p95_confirm_ms": checked[2]},
+    }
+    path = vlc.user_profile_path(args.user)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"✓ Saved {path} - start the controller with --user {args.user}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Continuous Control for Virtual LED Controller
+=============================================
+
+The five gestures switch devices on and off. This module adds two hand
+poses that set a level (LEVEL_DEVICE_TYPES) and follow the hand while they
+are held:
+
+    pinch         Middle, ring and pinky straight, index bent towards the
+                  thumb (an "OK" hand). The gap between the thumb and index
+                  tips, relative to the hand's size, sets the brightness of
+                  CONTINUOUS_CONTROLS["pinch"]: closed = CONTINUOUS_MIN_LEVEL,
+                  wide open = 100%.
+    hand_height   Open palm (all four fingers straight). The height of the
+                  palm in the camera image sets the speed of
+                  CONTINUOUS_CONTROLS["hand_height"]: top of the image = 100%.
+
+detect_gesture() returns None for both poses, so they never toggle anything.
+
+The hand is measured 30 times a second, but devices and the GUI only get a
+level when it means something. Each frame (frame thread, a few landmark
+distances) goes through:
+
+    engage      The pose must be held CONTINUOUS_ENGAGE_FRAMES frames; passing
+                through it between two gestures does nothing. A few frames
+                without it (RELEASE_FRAMES, tracking glitches) don't let go.
+    smooth      Exponential moving average (CONTINUOUS_SMOOTHING) of the
+                0-1 value, against landmark jitter and tremor.
+    quantize    To CONTINUOUS_LEVEL_STEP percent, with hysteresis: the level
+                only moves once the smoothed value is HYSTERESIS of a step
+                past the halfway point, so a hand resting on a boundary
+                doesn't flicker between two levels.
+    rate limit  At most CONTINUOUS_MAX_UPDATES_PER_SEC per device. A level
+                that comes too early waits and is replaced by newer ones;
+                whatever is waiting when the interval is up is sent, so the
+                last level always arrives, also after letting go.
+
+Levels are sent with apply_device_changes({device: {"level": n}}), one batch
+per frame at most, and reach every backend (GUI, dashboard, event log) as
+any other change does.
+
+Usage: python virtual_led_controller.py --continuous
+       python continuous_control.py          (synthetic sweeps: frames in vs. updates sent)
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+import virtual_led_controller as vlc
+
+# MediaPipe landmark IDs
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP = 0, 4, 8, 9
+FINGERS = [(8, 6, 5), (12, 10, 9), (16, 14, 13), (20, 18, 17)]  # (tip, PIP, MCP): index, middle, ring, pinky
+
+PINCH_CLOSED = 0.2  # Thumb-index gap (in wrist-to-middle-knuckle lengths) that means the minimum level
+PINCH_OPEN = 0.8  # Gap that means 100%
+HEIGHT_BOTTOM = 0.8  # Palm height in the image (0 = top) that means the minimum level
+HEIGHT_TOP = 0.2  # Palm height that means 100%
+HYSTERESIS = 0.25  # Extra fraction of a step the value must move before the level changes
+RELEASE_FRAMES = 3  # Frames without the pose before a control lets go
+
+CONTROL_VERBS = {"pinch": "Brightness", "hand_height": "Speed"}
+
+
+def read_pose(hand):
+    """
+    Recognize a control pose and measure it.
+
+    Args:
+        hand: MediaPipe hand landmarks (or anything with a .landmark list)
+
+    Returns:
+        tuple: (control name, value 0-1) or (None, None)
+    """
+    landmarks = hand.landmark
+    angle = vlc.DETECTION_PARAMS["finger_angle"]
+    extended = [vlc.is_finger_extended(landmarks, tip, pip, mcp, threshold=angle) for tip, pip, mcp in FINGERS]
+    size = vlc.calculate_distance(landmarks[WRIST], landmarks[MIDDLE_MCP])
+    if size <= 0:
+        return None, None
+    if all(extended):
+        palm_y = (landmarks[WRIST].y + landmarks[MIDDLE_MCP].y) / 2
+        value = (HEIGHT_BOTTOM - palm_y) / (HEIGHT_BOTTOM - HEIGHT_TOP)
+        return "hand_height", min(1.0, max(0.0, value))
+    if not extended[0] and all(extended[1:]):
+        gap = vlc.calculate_distance(landmarks[THUMB_TIP], landmarks[INDEX_TIP]) / size
+        value = (gap - PINCH_CLOSED) / (PINCH_OPEN - PINCH_CLOSED)
+        return "pinch", min(1.0, max(0.0, value))
+    return None, None
+
+
+class LevelStream:
+    """
+    Smoothing, quantization and rate limiting of one device's level.
+    """
+
+    def __init__(self, device_id, step, min_level, smoothing, min_interval):
+        self.device_id = device_id
+        self.step = step
+        self.min_level = min_level
+        self.smoothing = smoothing
+        self.min_interval = min_interval
+        self.smoothed = None
+        self.level = None  # Quantized level of the hand (shown on the webcam feed)
+        self.sent = None  # Last level sent to the device
+        self.pending = None  # Level waiting for the rate limit
+        self.last_sent = -math.inf
+        self.updates = 0
+
+    def start(self, current):
+        """Follow the hand from scratch; current is the device's level if it is ON (else None)."""
+        self.smoothed = None
+        self.level = current
+        self.sent = current
+        self.pending = None
+
+    def feed(self, value):
+        """Add one frame's 0-1 value."""
+        if self.smoothed is None:
+            self.smoothed = value
+        else:
+            self.smoothed += self.smoothing * (value - self.smoothed)
+        percent = self.min_level + self.smoothed * (100 - self.min_level)
+        if self.level is None or abs(percent - self.level) >= self.step * (0.5 + HYSTERESIS):
+            self.level = min(100, max(self.min_level, round(percent / self.step) * self.step))
+        self.pending = self.level if self.level != self.sent else None
+
+    def flush(self, now):
+        """
+        Take the waiting level if the rate limit allows it.
+
+        Returns:
+            int: Level to send, or None
+        """
+        if self.pending is None or now - self.last_sent < self.min_interval:
+            return None
+        level, self.pending = self.pending, None
+        self.sent, self.last_sent = level, now
+        self.updates += 1
+        return level
+
+
+class ContinuousControl:
+    """
+    Turns control poses into rate-limited level updates (all methods run on the frame thread).
+    """
+
+    def __init__(self, controls, engage_frames, smoothing, step, min_level, max_updates_per_sec,
+                 clock=time.monotonic):
+        self.controls = dict(controls)
+        self.engage_frames = engage_frames
+        self.clock = clock
+        self.streams = {control: LevelStream(device_id, step, min_level, smoothing, 1.0 / max_updates_per_sec)
+                        for control, device_id in self.controls.items()}
+        self.active = None  # Control following the hand
+        self.candidate = None  # Pose seen in the last frames, and for how many
+        self.candidate_frames = 0
+        self.missed = 0
+        self.frames = 0  # Frames measured while a control was active
+
+    def update(self, hand):
+        """
+        Process one tracked frame.
+
+        Args:
+            hand: Landmarks of the first hand, or None when no hand was seen
+
+        Returns:
+            dict: The devices whose level was sent (device_id → device_status())
+        """
+        control, value = read_pose(hand) if hand is not None else (None, None)
+        if control not in self.streams:
+            control = None
+        if control == self.candidate:
+            self.candidate_frames += 1
+        else:
+            self.candidate, self.candidate_frames = control, 1
+
+        if self.active is not None:
+            if control == self.active:
+                self.missed = 0
+            else:
+                self.missed += 1
+                if self.missed >= RELEASE_FRAMES:
+                    self.active = None
+                    vlc.telemetry["continuous_control"] = None
+        if self.active is None and control is not None and self.candidate_frames >= self.engage_frames:
+            self._engage(control)
+
+        if self.active is not None and control == self.active:
+            self.streams[control].feed(value)
+            self.frames += 1
+
+        now = self.clock()
+        changes = {}
+        for stream in self.streams.values():
+            level = stream.flush(now)
+            if level is not None:
+                changes[stream.device_id] = {"level": level}
+        if not changes:
+            return {}
+        vlc.telemetry["level_updates"] = sum(stream.updates for stream in self.streams.values())
+        return vlc.apply_device_changes(changes)
+
+    def _engage(self, control):
+        device_id = self.controls[control]
+        _, states = vlc.get_device_states([device_id])
+        status = states[device_id]
+        self.streams[control].start(status["level"] if status["on"] else None)
+        self.active, self.missed = control, 0
+        vlc.telemetry["continuous_control"] = control
+
+    def overlay_text(self):
+        """'Brightness 💡 Red LED: 60%' while a control follows the hand, else None."""
+        if self.active is None:
+            return None
+        stream = self.streams[self.active]
+        level = "-" if stream.level is None else f"{stream.level}%"
+        return f"{CONTROL_VERBS[self.active]} {vlc.DEVICE_CONFIG[stream.device_id]['label']}: {level}"
+
+    def report(self):
+        """Print how many frames were measured and how many level updates that took."""
+        if not self.frames:
+            return
+        updates = {stream.device_id: stream.updates for stream in self.streams.values() if stream.updates}
+        per_device = ", ".join(f"{device_id} {count}" for device_id, count in updates.items()) or "none"
+        print(f"🎚 Continuous control: {self.frames} frames measured, "
+              f"{sum(updates.values())} level updates ({per_device})")
+
+
+def start_continuous_control(controls, engage_frames, smoothing, step, min_level, max_updates_per_sec):
+    """
+    Set up continuous control for the frame loop.
+
+    Args:
+        controls: Control name ("pinch", "hand_height") → device ID
+
+    Returns:
+        ContinuousControl: Pass each frame's hand to update(); None if no control has a level device
+    """
+    usable = {}
+    for control, device_id in controls.items():
+        if control not in CONTROL_VERBS:
+            print(f"⚠ Unknown continuous control '{control}' (use {', '.join(CONTROL_VERBS)})")
+        elif device_id not in vlc.device_levels:
+            print(f"⚠ Continuous control '{control}': {device_id} has no level "
+                  f"(types: {', '.join(vlc.LEVEL_DEVICE_TYPES)})")
+        else:
+            usable[control] = device_id
+    if not usable:
+        return None
+    control = ContinuousControl(usable, engage_frames, smoothing, step, min_level, max_updates_per_sec)
+    vlc.telemetry.update(continuous_control=None, level_updates=0)
+    names = ", ".join(f"{name} → {vlc.DEVICE_CONFIG[device_id]['label']}" for name, device_id in usable.items())
+    print(f"✓ Continuous control: {names} (≤{max_updates_per_sec:g} updates/s per device)")
+    return control
+
+
+# =============================================================================
+# SYNTHETIC SWEEP
+# =============================================================================
+
+def sweep_hands(control, seconds, fps, seed=0, jitter=0.004):
+    """
+    A hand holding a control pose and moving through its whole range and back.
+
+    Returns:
+        tuple: (list of hands, list of the intended 0-1 value per frame)
+    """
+    import synthetic_hands
+    from landmark_recorder import ReplayedHand
+
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * fps)
+    hands, targets = [], []
+    for i in range(frames):
+        phase = 1 - abs(1 - 2 * i / max(1, frames - 1))  # 0 → 1 → 0
+        if control == "pinch":
+            params = np.array([-90.0, 0.0, 1.0 - 0.55 * phase, 0.0, 0.0, 0.0])  # Index opens from the thumb
+            y = 0.7
+        else:
+            params = synthetic_hands.pose_params("open_palm")
+            y = 0.95 - 0.75 * phase  # Wrist y; the palm sits ~0.1 above it
+        points = synthetic_hands.place(synthetic_hands.skeleton(params), 0.5, y, 0.35, 0)
+        points += rng.normal(0, jitter, points.shape)
+        hands.append(ReplayedHand(points, 1, 1.0))
+        targets.append(phase)
+    return hands, targets
+
+
+def run_sweep(control, seconds=4.0, fps=30, max_updates_per_sec=vlc.CONTINUOUS_MAX_UPDATES_PER_SEC):
+    """
+    Feed a synthetic sweep through continuous control on a simulated clock.
+
+    Returns:
+        dict: frames, updates sent, distinct levels, fastest update interval,
+              final level of the device and the level the hand ended on
+    """
+    device_id = vlc.CONTINUOUS_CONTROLS[control]
+    vlc.reset_pipeline_state()
+    hands, _ = sweep_hands(control, seconds, fps)
+    clock = {"now": 0.0}
+    controller = ContinuousControl({control: device_id}, vlc.CONTINUOUS_ENGAGE_FRAMES, vlc.CONTINUOUS_SMOOTHING,
+                                   vlc.CONTINUOUS_LEVEL_STEP, vlc.CONTINUOUS_MIN_LEVEL, max_updates_per_sec,
+                                   clock=lambda: clock["now"])
+    sent = []
+    for i, hand in enumerate(hands + [None] * fps):  # One second without a hand lets the last level through
+        clock["now"] = i / fps
+        changed = controller.update(hand)
+        if device_id in changed:
+            sent.append((clock["now"], changed[device_id]["level"]))
+    gaps = [b[0] - a[0] for a, b in zip(sent, sent[1:])]
+    return {
+        "frames": len(hands),
+        "updates": len(sent),
+        "levels": sorted({level for _, level in sent}),
+        "min_interval": min(gaps) if gaps else None,
+        "final": vlc.device_levels[device_id],
+        "hand_level": controller.streams[control].level,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run synthetic sweeps through continuous control")
+    parser.add_argument("--seconds", type=float, default=4.0, help="Length of each sweep")
+    parser.add_argument("--fps", type=int, default=30, help="Simulated camera frame rate")
+    args = parser.parse_args()
+
+    for control in vlc.CONTINUOUS_CONTROLS:
+        result = run_sweep(control, args.seconds, args.fps)
+        interval = "-" if result["min_interval"] is None else f"{result['min_interval'] * 1000:.0f} ms"
+        print(f"   {control:12} {result['frames']:4d} frames → {result['updates']:3d} level updates "
+              f"(levels {result['levels'][0] if result['levels'] else '-'}-"
+              f"{result['levels'][-1] if result['levels'] else '-'}%, closest {interval} apart), "
+              f"device ends at {result['final']}%, hand at {result['hand_level']}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Web Dashboard Load Test
+=======================
+
+Checks that hundreds of dashboard viewers do not slow down the frame loop.
+
+1. Runs a simulated frame loop (colour conversion + blur on a 640x480 frame,
+   plus a device toggle every few frames) with no dashboard, for a baseline.
+2. Starts the dashboard, connects N WebSocket viewers from a separate
+   process (like real browsers), and runs the same frame loop again.
+3. Compares frame-loop latency and reports diff delivery latency per viewer.
+
+Usage: python dashboard_loadtest.py [--viewers 300] [--duration 10] [--fps 30]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import statistics
+import time
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+# =============================================================================
+# VIEWER PROCESS
+# =============================================================================
+
+async def run_viewer(host, port, token, stop, stats):
+    """One WebSocket viewer: connect, then count messages and diff latency until stopped."""
+    from web_dashboard import read_frame, encode_frame
+
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    writer.write((f"GET /ws?token={token} HTTP/1.1\r\nHost: {host}:{port}\r\nOrigin: http://{host}:{port}\r\n"
+                  f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode('latin-1'))
+    await reader.readuntil(b"\r\n\r\n")
+    stats["connected"] += 1
+    try:
+        while not stop.is_set():
+            try:
+                opcode, payload = await asyncio.wait_for(read_frame(reader, max_size=1 << 24), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            if opcode != 0x1:
+                continue
+            message = json.loads(payload)
+            stats["messages"] += 1
+            if message["type"] == "diff":
+                stats["diff_latency_ms"].append((time.time() - message["ts"]) * 1000)
+            elif message["type"] == "snapshot":
+                stats["snapshots"] += 1
+    finally:
+        writer.write(encode_frame(b"", opcode=0x8, mask=True))
+        writer.close()
+
+
+def viewer_process(host, port, token, count, connected, stop, results):
+    """Process entry point: run `count` viewers and report their stats."""
+    stats = {"connected": 0, "messages": 0, "snapshots": 0, "diff_latency_ms": []}
+
+    async def main():
+        async def report_connected():
+            while stats["connected"] < count and not stop.is_set():
+                await asyncio.sleep(0.05)
+            connected.set()
+        tasks = [asyncio.ensure_future(run_viewer(host, port, token, stop, stats)) for _ in range(count)]
+        await report_connected()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+    results.put(stats)
+
+
+# =============================================================================
+# CONTROLLER SIDE
+# =============================================================================
+
+def simulate_frame_loop(vlc, duration, fps, change_every):
+    """
+    Run a stand-in for webcam_processing_thread's per-frame work.
+
+    Returns:
+        tuple: (frame work times in ms, apply_device_changes times in ms)
+    """
+    import cv2
+    import numpy as np
+
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    device_ids = list(vlc.DEVICE_CONFIG)
+    frame_times, apply_times = [], []
+    period = 1.0 / fps
+    end = time.perf_counter() + duration
+    index = 0
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        cv2.GaussianBlur(rgb, (9, 9), 0)
+        if index % change_every == 0:
+            apply_start = time.perf_counter()
+            vlc.apply_device_changes({device_ids[index % len(device_ids)]: "toggle"})
+            apply_times.append((time.perf_counter() - apply_start) * 1000)
+        elapsed = time.perf_counter() - start
+        frame_times.append(elapsed * 1000)
+        index += 1
+        time.sleep(max(0.0, period - elapsed))
+    return frame_times, apply_times
+
+
+def report(name, frame_times, apply_times):
+    print(f"  {name:22} frame p50 {percentile(frame_times, 50):6.2f} ms | p99 {percentile(frame_times, 99):6.2f} ms"
+          f" | apply p50 {percentile(apply_times, 50) * 1000:7.1f} µs | p99 {percentile(apply_times, 99) * 1000:7.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the web dashboard against the frame loop")
+    parser.add_argument("--viewers", type=int, default=300, help="Concurrent WebSocket viewers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per measurement phase")
+    parser.add_argument("--fps", type=int, default=30, help="Simulated camera frame rate")
+    parser.add_argument("--change-every", type=int, default=3, help="Toggle a device every N frames")
+    args = parser.parse_args()
+
+    import virtual_led_controller as vlc
+    import web_dashboard
+
+    print("\n" + "=" * 70)
+    print(f"🌐 DASHBOARD LOAD TEST ({args.viewers} viewers, {args.duration:.0f}s per phase)")
+    print("=" * 70)
+
+    baseline = simulate_frame_loop(vlc, args.duration, args.fps, args.change_every)
+
+    server = web_dashboard.DashboardBridge("127.0.0.1", 0)
+    connected, stop = multiprocessing.Event(), multiprocessing.Event()
+    results = multiprocessing.Queue()
+    viewers = multiprocessing.Process(target=viewer_process,
+                                      args=("127.0.0.1", server.port, server.token, args.viewers, connected, stop, results))
+    viewers.start()
+    if not connected.wait(60):
+        print("⚠ Not all viewers connected within 60 s")
+    loaded = simulate_frame_loop(vlc, args.duration, args.fps, args.change_every)
+    time.sleep(0.5)  # Let in-flight diffs arrive
+    stop.set()
+    stats = results.get(timeout=30)
+    viewers.join(10)
+    server.stop()
+
+    report("No dashboard", *baseline)
+    report(f"{stats['connected']} viewers", *loaded)
+    delta = percentile(loaded[0], 99) - percentile(baseline[0], 99)
+    print(f"  Frame p99 change with viewers: {delta:+.2f} ms "
+          f"(mean {statistics.mean(loaded[0]) - statistics.mean(baseline[0]):+.2f} ms)")
+    print(f"  Messages delivered: {stats['messages']} ({stats['snapshots']} snapshots)")
+    latencies = stats["diff_latency_ms"]
+    print(f"  Diff delivery latency: p50 {percentile(latencies, 50):.1f} ms | p99 {percentile(latencies, 99):.1f} ms")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
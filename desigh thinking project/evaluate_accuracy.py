@@ -0,0 +1,486 @@
+"""
+Gesture Accuracy Evaluation for Virtual LED Controller
+======================================================
+
+Measures how accurate detect_gesture() and the debounce are on labelled
+recordings, fanning the files out across a process pool.
+
+Accepted inputs (searched recursively in the given directories):
+
+    *.mp4 / *.avi / *.mov / *.mkv / *.webm
+                   Videos; every worker runs its own MediaPipe Hands instance
+                   (built by load_hand_tracking(), same settings as live),
+                   reset before each video so no tracking carries over.
+                   Frames are mirrored like the live loop unless --no-flip.
+    *.json         Landmark streams (benchmarks/fixtures format, with labels)
+    *.lmrec        Landmark recordings (landmark_recorder.py)
+
+Labels, first match wins:
+
+    1. Per-frame labels inside a landmark stream
+    2. A sidecar file <input>.labels.json with {"labels": [per frame]} or
+       {"segments": [[start_frame, end_frame, label], ...]} (end exclusive)
+    3. The parent directory name, e.g. clips/thumb_up/alice.mp4
+    4. A file name prefix, e.g. thumb_up__alice.mp4
+
+Unlabelled frames (and null labels) expect no gesture ("none").
+
+Results, merged over all files:
+
+    Frame level   Per-gesture precision / recall / F1 of detect_gesture()
+                  and the full confusion matrix (truth rows, predicted columns)
+    Event level   Each labelled run of a gesture is one event: recall = runs
+                  that debounce confirmed; precision = confirmations that
+                  matched the label; latency-to-confirm from the first
+                  labelled frame to the confirmation (ms and frames; negative
+                  when debounce confirmed during the lead-in transition)
+    Throughput    Frames/s overall and per worker, and parallel efficiency
+
+Files are sent largest first, one at a time, so workers stay busy until the
+end; each worker holds no shared state, so throughput scales with cores
+until files run out (use --scaling to measure it).
+
+Usage: python evaluate_accuracy.py clips/ [more dirs...] [--workers 8] [--json report.json]
+       python evaluate_accuracy.py --synthetic 32 --scaling   (no recordings needed)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "benchmarks"))
+
+import virtual_led_controller as vlc
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+GESTURES = tuple(vlc.DEFAULT_GESTURE_TO_LED)
+NONE = "none"
+LABEL_NAMES = set(GESTURES) | {NONE}
+QUANTILES = (0.5, 0.95)
+EARLY_FRAMES = 10  # A confirmation this many frames before a labelled run still counts for it
+
+_hands = None  # Per-worker MediaPipe Hands, created on the first video and reset for each later one
+
+
+# =============================================================================
+# INPUTS AND LABELS
+# =============================================================================
+
+def find_inputs(paths):
+    """Every video, landmark stream and recording under the given paths, largest first."""
+    found = []
+    for root in paths:
+        if os.path.isfile(root) or root.rstrip("/\\").endswith(".lmrec"):
+            found.append(root)
+            continue
+        for directory, subdirs, files in os.walk(root):
+            for name in list(subdirs):
+                if name.endswith(".lmrec"):
+                    found.append(os.path.join(directory, name))
+                    subdirs.remove(name)
+            for name in files:
+                if name.lower().endswith(VIDEO_EXTENSIONS) or (
+                        name.endswith(".json") and not name.endswith(".labels.json")):
+                    found.append(os.path.join(directory, name))
+    return sorted(set(found), key=input_size, reverse=True)
+
+
+def input_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def file_labels(path):
+    """
+    Labels for an input from a sidecar, its directory or its name.
+
+    Returns:
+        callable: frame index → label, or None if the input has no labels
+    """
+    base = path.rstrip("/\\")
+    sidecar = base + ".labels.json"
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            data = json.load(f)
+        if "labels" in data:
+            labels = data["labels"]
+            return lambda i: (labels[i] if i < len(labels) else None) or NONE
+        segments = data.get("segments", [])
+        return lambda i: next((label for start, end, label in segments if start <= i < end), NONE)
+    for candidate in (os.path.basename(os.path.dirname(base)), os.path.basename(base).split("__")[0]):
+        if candidate in LABEL_NAMES:
+            return lambda i, label=candidate: label
+    return None
+
+
+def iter_frames(path, flip=True):
+    """
+    Yield (time in seconds, hand landmarks or None, truth label) per frame.
+
+    Raises:
+        ValueError: If the input has no labels
+    """
+    if path.endswith(".json"):
+        from fixtures import load_landmark_stream
+        stream = load_landmark_stream(path)
+        fps = stream.get("fps") or 30
+        labels = stream.get("labels")
+        label_at = (lambda i: labels[i] or NONE) if labels else file_labels(path)
+        if label_at is None:
+            raise ValueError("no labels")
+        for i, hand in enumerate(stream["frames"]):
+            yield i / fps, hand, label_at(i)
+        return
+
+    label_at = file_labels(path)
+    if label_at is None:
+        raise ValueError("no labels (add a .labels.json sidecar, a label folder or a label__ prefix)")
+
+    if path.rstrip("/\\").endswith(".lmrec"):
+        import landmark_recorder
+        recording = landmark_recorder.LandmarkRecording(path)
+        for i in range(len(recording)):
+            hands = recording.frame(i)
+            yield float(recording.frame_time[i]), hands[0] if hands else None, label_at(i)
+        return
+
+    import cv2
+    global _hands
+    if _hands is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _hands = vlc.load_hand_tracking()
+    else:
+        # Drop the hand tracked at the end of this worker's previous video, so
+        # per-file results don't depend on which files a worker got before
+        _hands.reset()
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError("cannot open video")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    index = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if flip:
+                frame = cv2.flip(frame, 1)
+            results = _hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+            yield index / fps, hand, label_at(index)
+            index += 1
+    finally:
+        cap.release()
+
+
+# =============================================================================
+# PER-FILE EVALUATION (runs in the workers)
+# =============================================================================
+
+def init_worker():
+    """Keep each worker to one core so N workers use N cores."""
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def pipeline_frames(path, flip=True):
+    """
+    Run one input through detect_gesture() and debounce_gesture() as the live loop does.
+
+    Yields:
+        tuple: (time, truth label, hand seen, detected gesture or None, confirmed gesture or None)
+    """
+    vlc.reset_pipeline_state()
+    for t, hand, truth in iter_frames(path, flip):
+        # Like the live loop: no hand means no detection and no debounce update
+        if hand is None:
+            yield t, truth, False, None, None
+        else:
+            gesture = vlc.detect_gesture(hand)
+            yield t, truth, True, gesture, vlc.debounce_gesture(gesture)
+
+
+def score_frames(frames):
+    """
+    Frame- and event-level counts for one stream of pipeline output.
+
+    Args:
+        frames: Iterable of (time, truth label, hand seen, detected, confirmed) per frame
+
+    Returns:
+        dict: Counts and latencies (merged by merge_results())
+    """
+    confusion = {}
+    segments = {}  # Gesture → [labelled runs, runs confirmed]
+    latency_ms, latency_frames = {}, {}
+    confirmations = {}  # Gesture → [correct, total]
+    count = hands = 0
+    run_label, run_start, run_index, run_confirmed = NONE, 0.0, 0, False
+    previous_confirmed = None
+    onset = (None, 0, 0.0)  # (gesture, frame, time) of the latest confirmation
+
+    def end_run():
+        if run_label != NONE:
+            counts = segments.setdefault(run_label, [0, 0])
+            counts[0] += 1
+            counts[1] += run_confirmed
+
+    for t, truth, hand, gesture, confirmed in frames:
+        count += 1
+        hands += hand
+        if truth != run_label:
+            end_run()
+            run_label, run_start, run_index, run_confirmed = truth, t, count, False
+            # Confirmed during the transition just before the label starts: credit it with
+            # a negative latency instead of counting a false confirmation and a miss
+            if truth == onset[0] == previous_confirmed and count - onset[1] <= EARLY_FRAMES:
+                run_confirmed = True
+                confirmations[truth][0] += 1
+                latency_ms.setdefault(truth, []).append((onset[2] - t) * 1000)
+                latency_frames.setdefault(truth, []).append(onset[1] - count)
+        row = confusion.setdefault(truth, {})
+        predicted = gesture or NONE
+        row[predicted] = row.get(predicted, 0) + 1
+
+        if confirmed and confirmed != previous_confirmed:
+            onset = (confirmed, count, t)
+            counts = confirmations.setdefault(confirmed, [0, 0])
+            counts[1] += 1
+            if confirmed == truth:
+                counts[0] += 1
+                if not run_confirmed:
+                    run_confirmed = True
+                    latency_ms.setdefault(truth, []).append((t - run_start) * 1000)
+                    latency_frames.setdefault(truth, []).append(count - run_index)
+        previous_confirmed = confirmed
+    end_run()
+    return {"frames": count, "hands": hands, "confusion": confusion, "segments": segments, "latency_ms": latency_ms,
+            "latency_frames": latency_frames, "confirmations": confirmations}
+
+
+def evaluate_file(path, flip=True):
+    """
+    Score one input (runs in a worker).
+
+    Returns:
+        dict: score_frames() counts plus the file and timings
+    """
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        result = score_frames(pipeline_frames(path, flip))
+    except ValueError as e:
+        return {"file": path, "error": str(e)}
+    result.update(file=path, seconds=time.perf_counter() - start,
+                  cpu_seconds=time.process_time() - cpu_start)
+    return result
+
+
+# =============================================================================
+# POOL AND MERGE
+# =============================================================================
+
+def run_pool(paths, workers, flip=True, progress=True):
+    """
+    Evaluate inputs across a process pool (spawned, so MediaPipe never crosses a fork).
+
+    Returns:
+        tuple: (list of per-file results, wall seconds)
+    """
+    results = []
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+        futures = [pool.submit(evaluate_file, path, flip) for path in paths]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if progress:
+                status = f"⚠ skipped: {result['error']}" if "error" in result else f"{result['frames']} frames"
+                print(f"   [{done}/{len(paths)}] {os.path.basename(result['file'])}: {status}")
+    return results, time.perf_counter() - start
+
+
+def merge_results(results):
+    """Combine per-file results into one report dict."""
+    merged = {"files": 0, "skipped": [], "frames": 0, "hands": 0, "confusion": {}, "segments": {},
+              "latency_ms": {}, "latency_frames": {}, "confirmations": {}, "worker_seconds": 0.0,
+              "cpu_seconds": 0.0}
+    for result in results:
+        if "error" in result:
+            merged["skipped"].append((result["file"], result["error"]))
+            continue
+        merged["files"] += 1
+        merged["frames"] += result["frames"]
+        merged["hands"] += result["hands"]
+        merged["worker_seconds"] += result["seconds"]
+        merged["cpu_seconds"] += result["cpu_seconds"]
+        for truth, row in result["confusion"].items():
+            target = merged["confusion"].setdefault(truth, {})
+            for predicted, count in row.items():
+                target[predicted] = target.get(predicted, 0) + count
+        for key in ("segments", "confirmations"):
+            for gesture, counts in result[key].items():
+                target = merged[key].setdefault(gesture, [0, 0])
+                target[0] += counts[0]
+                target[1] += counts[1]
+        for key in ("latency_ms", "latency_frames"):
+            for gesture, values in result[key].items():
+                merged[key].setdefault(gesture, []).extend(values)
+    return merged
+
+
+def accuracy_report(merged):
+    """
+    Precision / recall / F1 per gesture (frame and event level) and latency statistics.
+
+    Returns:
+        dict: JSON-ready report
+    """
+    confusion = merged["confusion"]
+    seen = {name for row in confusion.values() for name in row} | set(confusion)
+    names = list(GESTURES) + sorted(seen - set(GESTURES) - {NONE}) + [NONE]
+    matrix = np.array([[confusion.get(truth, {}).get(predicted, 0) for predicted in names] for truth in names])
+    gestures = {}
+    for i, name in enumerate(names[:-1]):
+        true_positive = int(matrix[i, i])
+        predicted = int(matrix[:, i].sum())
+        support = int(matrix[i, :].sum())
+        precision = true_positive / predicted if predicted else None
+        recall = true_positive / support if support else None
+        f1 = (2 * precision * recall / (precision + recall)
+              if precision is not None and recall is not None and precision + recall else None)
+        runs, runs_confirmed = merged["segments"].get(name, [0, 0])
+        correct, total = merged["confirmations"].get(name, [0, 0])
+        latency = np.array(merged["latency_ms"].get(name, []))
+        latency_frames = np.array(merged["latency_frames"].get(name, []))
+        gestures[name] = {
+            "support": support, "precision": precision, "recall": recall, "f1": f1,
+            "runs": runs, "event_recall": runs_confirmed / runs if runs else None,
+            "confirmations": total, "event_precision": correct / total if total else None,
+            "confirm_ms": [float(v) for v in np.quantile(latency, QUANTILES)] + [float(latency.max())]
+            if len(latency) else None,
+            "confirm_frames": [float(v) for v in np.quantile(latency_frames, QUANTILES)] + [float(latency_frames.max())]
+            if len(latency_frames) else None,
+        }
+    frames = int(matrix.sum())
+    return {
+        "files": merged["files"],
+        "skipped": merged["skipped"],
+        "frames": merged["frames"],
+        "hands": merged["hands"],
+        "frame_accuracy": float(np.trace(matrix) / frames) if frames else None,
+        "labels": names,
+        "confusion": matrix.tolist(),
+        "gestures": gestures,
+    }
+
+
+def format_report(report, wall, workers, merged):
+    def pct(value):
+        return "    -" if value is None else f"{value * 100:5.1f}"
+
+    def stats(values):
+        return "-" if values is None else " / ".join(f"{v:.0f}" for v in values)
+
+    lines = ["=" * 92, "🎯 GESTURE ACCURACY", "=" * 92,
+             f"  {report['files']} files, {report['frames']} frames ({report['hands']} with a hand), "
+             f"frame accuracy {pct(report['frame_accuracy'])}%"]
+    for path, error in report["skipped"]:
+        lines.append(f"  ⚠ Skipped {path}: {error}")
+    lines += ["", f"  {'gesture':15} {'support':>8} {'prec %':>7} {'recall %':>8} {'F1 %':>6}   "
+                  f"{'runs':>5} {'ev rec %':>8} {'ev prec %':>9}   confirm ms p50/p95/max (frames)"]
+    for name, g in report["gestures"].items():
+        lines.append(f"  {name:15} {g['support']:8d} {pct(g['precision']):>7} {pct(g['recall']):>8} "
+                     f"{pct(g['f1']):>6}   {g['runs']:5d} {pct(g['event_recall']):>8} "
+                     f"{pct(g['event_precision']):>9}   {stats(g['confirm_ms'])} ({stats(g['confirm_frames'])})")
+
+    labels = report["labels"]
+    width = max(6, max(len(name) for name in labels) + 1)
+    lines += ["", "  Confusion matrix (rows = truth, columns = detect_gesture())",
+              "  " + " " * width + "".join(f"{name[:width - 1]:>{width}}" for name in labels)]
+    for name, row in zip(labels, report["confusion"]):
+        lines.append(f"  {name:{width}}" + "".join(f"{count:{width}d}" for count in row))
+
+    busy = merged["worker_seconds"]
+    lines += ["", f"  Throughput: {report['frames'] / wall:,.0f} frames/s over {wall:.1f}s with {workers} "
+                  f"workers ({report['frames'] / max(busy, 1e-9):,.0f} frames/s per busy worker, "
+                  f"pool efficiency {busy / (wall * workers) * 100:.0f}%)", "=" * 92]
+    return "\n".join(lines)
+
+
+def write_synthetic_inputs(directory, count, seed=0):
+    """Labelled synthetic landmark streams (synthetic_hands.py) for trying the harness without recordings."""
+    import synthetic_hands
+    from fixtures import save_landmark_stream
+
+    paths = []
+    for i in range(count):
+        sequence = synthetic_hands.generate_sequence(seed + i, holds=30, jitter=0.004, tremor=0.002,
+                                                     occlusion=0.1, dropout=0.03)
+        frames = [points.tolist() if present else None
+                  for points, present in zip(sequence["landmarks"], sequence["present"])]
+        path = os.path.join(directory, f"synthetic_{i:03d}.json")
+        save_landmark_stream(path, frames, sequence["labels"], fps=30, source="synthetic (evaluate_accuracy.py)")
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate gesture accuracy on labelled recordings")
+    parser.add_argument("inputs", nargs="*", help="Directories or files (videos, landmark streams, .lmrec)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument("--no-flip", action="store_true", help="Don't mirror video frames (live loop mirrors them)")
+    parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Evaluate N generated labelled streams")
+    parser.add_argument("--scaling", action="store_true", help="Repeat with 1, 2, 4 ... workers and report speedup")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = find_inputs(args.inputs)
+        if args.synthetic:
+            paths += write_synthetic_inputs(scratch, args.synthetic)
+        if not paths:
+            parser.error("no inputs found (give directories of recordings, or --synthetic N)")
+
+        print(f"🔍 Evaluating {len(paths)} inputs with {args.workers} workers...")
+        results, wall = run_pool(paths, args.workers, flip=not args.no_flip)
+        merged = merge_results(results)
+        report = accuracy_report(merged)
+        print(format_report(report, wall, args.workers, merged))
+        if args.json:
+            report["throughput"] = {"workers": args.workers, "wall_seconds": wall,
+                                    "frames_per_second": report["frames"] / wall}
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"✓ Report written to {args.json}")
+
+        if args.scaling:
+            counts = sorted({1 << i for i in range(args.workers.bit_length())} | {args.workers})
+            cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+            print(f"\n📈 Scaling (same inputs, {cores} CPU cores available)")
+            base = None
+            for workers in counts:
+                _, seconds = run_pool(paths, workers, flip=not args.no_flip, progress=False)
+                rate = merged["frames"] / seconds
+                base = base or rate
+                ideal = min(workers, cores)
+                note = "  (more workers than cores)" if workers > cores else ""
+                print(f"   {workers:3d} workers: {rate:10,.0f} frames/s  speedup {rate / base:5.2f}x  "
+                      f"(ideal {ideal}x){note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,767 @@
+"""
+Gesture Event Log for Virtual LED Controller
+============================================
+
+Append-only usage log of every gesture and device transition, for analytics
+such as false-trigger rates per user and device toggles per hour.
+
+Events (one row each):
+
+    detected   A gesture appeared (first frame of a run of the same gesture)
+    confirmed  The run lasted long enough for debounce to confirm it
+               (latency = onset frame → confirmation)
+    rejected   The run ended before it was confirmed - a false trigger
+               candidate (latency = how long it was held)
+    device     A device changed state (latency = gesture onset → state
+               commit for gesture-driven changes; source "manual" for GUI,
+               dashboard and other changes)
+
+The log is a directory of segments; each segment is a directory of flat
+little-endian column files that numpy memory-maps directly:
+
+    dictionary.json          Gesture, device and user names (ids never change)
+    000001/time.f8           float64  Unix time of the event
+    000001/kind.u1           uint8    Index into KINDS
+    000001/gesture.u2        uint16   Gesture id (65535 = none)
+    000001/device.u2         uint16   Device id (65535 = none)
+    000001/state.i1          int8     Device state after the event (1 on, 0 off, -1 n/a)
+    000001/value.i2          int16    TV channel after the event (-1 n/a)
+    000001/user.u2           uint16   User id (65535 = none)
+    000001/source.u1         uint8    Index into SOURCES
+    000001/latency_ms.f4     float32  See above (NaN when not applicable)
+    000001/frames.u2         uint16   Frames in the gesture run
+    000001/segment.json      Count and time range, written when the segment closes
+
+About 25 bytes per event. A segment is closed after SEGMENT_EVENTS events or
+SEGMENT_SECONDS of wall time, so a query for a time range skips whole
+segments by their time range and binary-searches the rest. Each query
+reads only the columns it needs and counts with one numpy bincount per
+table. On a synthetic year of 20 million events (about 55,000 a day, far
+above real use) a whole-year summary takes about a second and a one-week
+summary about 20 ms.
+
+The frame loop only tracks the current gesture run and queues finished
+events; a writer thread appends them in batches.
+
+Usage: python virtual_led_controller.py --events [--user alice]
+       python event_log.py summary [--since 7d] [--until 2026-10-19] [--user alice]
+       python event_log.py hourly [--since 24h] [--by day]
+       python event_log.py tail [-n 20]
+       python event_log.py bench --events 20000000   (a synthetic year, timed queries)
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+KINDS = ("detected", "confirmed", "rejected", "device")
+SOURCES = ("gesture", "manual")
+NONE_ID = 0xFFFF
+COLUMNS = {
+    "time": "<f8", "kind": "u1", "gesture": "<u2", "device": "<u2", "state": "i1",
+    "value": "<i2", "user": "<u2", "source": "u1", "latency_ms": "<f4", "frames": "<u2",
+}
+SUFFIXES = {"<f8": "f8", "u1": "u1", "<u2": "u2", "i1": "i1", "<i2": "i2", "<f4": "f4"}
+DICTIONARY_FIELDS = ("gestures", "devices", "users")
+SEGMENT_EVENTS = 1_000_000
+SEGMENT_SECONDS = 86400.0
+TIME_SKEW = 60.0  # Events can reach the writer slightly out of order; range searches widen by this much
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def column_path(segment, name):
+    return os.path.join(segment, f"{name}.{SUFFIXES[COLUMNS[name]]}")
+
+
+def segment_dirs(path):
+    """Segment directories of a log, oldest first."""
+    if not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.isdigit() and os.path.isdir(os.path.join(path, name))]
+
+
+def load_dictionary(path):
+    """Names behind the gesture, device and user ids."""
+    try:
+        with open(os.path.join(path, "dictionary.json")) as f:
+            dictionary = json.load(f)
+    except FileNotFoundError:
+        dictionary = {}
+    return {field: list(dictionary.get(field, [])) for field in DICTIONARY_FIELDS}
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+
+class EventLogWriter:
+    """
+    Appends events to the current segment on a background thread.
+
+    append() may be called from any thread; names are turned into ids by the
+    writer, which saves new names to dictionary.json before the first event
+    that uses them.
+    """
+
+    def __init__(self, path, segment_events=SEGMENT_EVENTS, segment_seconds=SEGMENT_SECONDS):
+        self.path = path
+        self.segment_events = segment_events
+        self.segment_seconds = segment_seconds
+        os.makedirs(path, exist_ok=True)
+        self.dictionary = load_dictionary(path)
+        self._ids = {field: {name: i for i, name in enumerate(names)}
+                     for field, names in self.dictionary.items()}
+        self._dictionary_dirty = False
+        self.events = 0
+        self.segment = None
+        self._files = {}
+        self._segment_count = 0
+        self._segment_first = None
+        self._segment_last = None
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+        self._writer.start()
+
+    def append(self, when, kind, gesture=None, device=None, state=-1, value=-1, user=None,
+               source="gesture", latency_ms=float("nan"), frames=0):
+        """Queue one event (kind from KINDS, source from SOURCES)."""
+        if not self._closed:
+            self._queue.put((when, KINDS.index(kind), gesture, device, state, value, user,
+                             SOURCES.index(source), latency_ms, frames))
+
+    def _id(self, field, name):
+        if name is None:
+            return NONE_ID
+        ids = self._ids[field]
+        if name not in ids:
+            ids[name] = len(self.dictionary[field])
+            self.dictionary[field].append(name)
+            self._dictionary_dirty = True
+        return ids[name]
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            events = [event for event in batch if event is not None]
+            if events:
+                self._dictionary_dirty = False
+                rows = [(when, kind, self._id("gestures", gesture), self._id("devices", device), state, value,
+                         self._id("users", user), source, latency, frames)
+                        for when, kind, gesture, device, state, value, user, source, latency, frames in events]
+                if self._dictionary_dirty:
+                    self._save_dictionary()
+                columns = {name: np.array([row[i] for row in rows], dtype=dtype)
+                           for i, (name, dtype) in enumerate(COLUMNS.items())}
+                self.write_columns(columns)
+            if done:
+                break
+        self._close_segment()
+
+    def _save_dictionary(self):
+        path = os.path.join(self.path, "dictionary.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.dictionary, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def write_columns(self, columns):
+        """
+        Append a batch of events given as column arrays (writer thread, or bulk loads).
+
+        The batch is sorted by time and split across segments as they fill up.
+        """
+        order = np.argsort(columns["time"], kind="stable")
+        columns = {name: np.asarray(values, dtype=COLUMNS[name])[order] for name, values in columns.items()}
+        start, total = 0, len(columns["time"])
+        while start < total:
+            first = float(columns["time"][start])
+            if (self.segment is None or self._segment_count >= self.segment_events
+                    or first - self._segment_first >= self.segment_seconds):
+                self._open_segment(first)
+            end = min(total, start + self.segment_events - self._segment_count)
+            limit = int(np.searchsorted(columns["time"], self._segment_first + self.segment_seconds))
+            end = max(start + 1, min(end, limit))
+            # Time is written last: readers cut every column to the shortest one
+            for name in list(COLUMNS)[1:] + ["time"]:
+                self._files[name].write(columns[name][start:end].tobytes())
+            for f in self._files.values():
+                f.flush()
+            self._segment_count += end - start
+            self._segment_last = float(columns["time"][end - 1])
+            self.events += end - start
+            start = end
+
+    def _open_segment(self, first_time):
+        self._close_segment()
+        existing = segment_dirs(self.path)
+        number = int(os.path.basename(existing[-1])) + 1 if existing else 1
+        self.segment = os.path.join(self.path, f"{number:06d}")
+        os.makedirs(self.segment)
+        self._files = {name: open(column_path(self.segment, name), "ab") for name in COLUMNS}
+        self._segment_count = 0
+        self._segment_first = first_time
+
+    def _close_segment(self):
+        if self.segment is None:
+            return
+        for f in self._files.values():
+            f.close()
+        with open(os.path.join(self.segment, "segment.json"), "w") as f:
+            json.dump({"events": self._segment_count, "first": self._segment_first,
+                       "last": self._segment_last}, f)
+        self.segment, self._files = None, {}
+
+    def close(self):
+        """Write queued events and close the current segment (safe to call twice)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+
+# =============================================================================
+# PIPELINE HOOKS
+# =============================================================================
+
+class GestureEventTracker:
+    """
+    Turns the frame loop's per-frame gestures into detected / confirmed /
+    rejected events, and device listener calls into device events.
+
+    observe() and dispatched() run on the frame thread; on_device_change()
+    runs on whichever thread changed the device.
+    """
+
+    def __init__(self, writer, user=None):
+        self.writer = writer
+        self.user = user
+        self.clock_offset = time.time() - time.perf_counter()  # perf_counter → Unix time
+        self.run_gesture = None
+        self.run_onset = 0.0
+        self.run_last = 0.0
+        self.run_frames = 0
+        self.run_confirmed = False
+        self.dispatch_thread = None
+
+    def observe(self, gesture, confirmed, capture_ts):
+        """
+        Record one frame's raw gesture and debounce result.
+
+        Args:
+            gesture: detect_gesture() result (None when no gesture or no hand)
+            confirmed: debounce_gesture() result
+            capture_ts: perf_counter() time the frame was captured
+        """
+        if gesture != self.run_gesture:
+            self._end_run()
+            if gesture is not None:
+                self.run_gesture, self.run_onset, self.run_frames = gesture, capture_ts, 0
+                self.writer.append(capture_ts + self.clock_offset, "detected", gesture=gesture, user=self.user,
+                                   frames=1)
+        if gesture is None:
+            return
+        self.run_frames += 1
+        self.run_last = capture_ts
+        if confirmed and not self.run_confirmed:
+            self.run_confirmed = True
+            now = time.perf_counter()
+            self.writer.append(now + self.clock_offset, "confirmed", gesture=gesture, user=self.user,
+                               latency_ms=(now - self.run_onset) * 1000, frames=min(self.run_frames, NONE_ID))
+        if confirmed:
+            self.dispatch_thread = threading.get_ident()  # Device changes until dispatched() are this gesture's
+
+    def dispatched(self):
+        """The confirmed gesture's action has run."""
+        self.dispatch_thread = None
+
+    def _end_run(self):
+        if self.run_gesture is not None and not self.run_confirmed:
+            self.writer.append(self.run_last + self.clock_offset, "rejected", gesture=self.run_gesture,
+                               user=self.user, latency_ms=(self.run_last - self.run_onset) * 1000,
+                               frames=min(self.run_frames, NONE_ID))
+        self.run_gesture, self.run_confirmed = None, False
+
+    def on_device_change(self, version, changes):
+        """Device listener: one device event per changed device."""
+        now = time.perf_counter()
+        from_gesture = self.dispatch_thread == threading.get_ident()
+        for device_id, status in changes.items():
+            channel = status.get("channel_index", -1)
+            self.writer.append(
+                now + self.clock_offset, "device",
+                gesture=self.run_gesture if from_gesture else None, device=device_id,
+                state=1 if status["on"] else 0, value=-1 if channel is None else channel, user=self.user,
+                source="gesture" if from_gesture else "manual",
+                latency_ms=(now - self.run_onset) * 1000 if from_gesture else float("nan"),
+                frames=min(self.run_frames, NONE_ID) if from_gesture else 0)
+
+    def close(self):
+        """Log an unfinished rejected run and close the writer."""
+        self._end_run()
+        self.writer.close()
+
+
+def start_event_log(path, user=None):
+    """
+    Start logging the controller's gestures and device changes.
+
+    Returns:
+        GestureEventTracker: Pass to the frame loop; close() at shutdown
+    """
+    import virtual_led_controller as vlc
+
+    tracker = GestureEventTracker(EventLogWriter(path), user)
+    vlc.add_device_listener(tracker.on_device_change)
+    print(f"✓ Event log → {path}" + (f" (user: {user})" if user else ""))
+    return tracker
+
+
+# =============================================================================
+# READER AND QUERIES
+# =============================================================================
+
+class EventLog:
+    """Read-only, memory-mapped view of an event log."""
+
+    def __init__(self, path):
+        self.path = path
+        self.dictionary = load_dictionary(path)
+        self.segments = []  # (directory, first time, last time, events)
+        for segment in segment_dirs(path):
+            meta_path = os.path.join(segment, "segment.json")
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                self.segments.append((segment, meta["first"], meta["last"], meta["events"]))
+            else:  # Still being written: read its range from the columns
+                times = self._column(segment, "time", None)
+                if len(times):
+                    self.segments.append((segment, float(times[0]), float(times[-1]), len(times)))
+
+    @staticmethod
+    def _column(segment, name, rows):
+        file = column_path(segment, name)
+        dtype = np.dtype(COLUMNS[name])
+        size = os.path.getsize(file) // dtype.itemsize if os.path.exists(file) else 0
+        size = size if rows is None else min(size, rows)
+        if not size:
+            return np.zeros(0, dtype)
+        # A plain ndarray view of the map: numpy's memmap subclass slows down every slice and mask
+        return np.memmap(file, dtype=dtype, mode="r", shape=(size,)).view(np.ndarray)
+
+    @staticmethod
+    def _rows(segment):
+        """Complete rows in a segment (columns are cut to the shortest after a torn write)."""
+        sizes = [os.path.getsize(column_path(segment, name)) // np.dtype(dtype).itemsize
+                 if os.path.exists(column_path(segment, name)) else 0 for name, dtype in COLUMNS.items()]
+        return min(sizes)
+
+    def __len__(self):
+        return sum(events for *_, events in self.segments)
+
+    def scan(self, columns, since=None, until=None):
+        """
+        Yield the requested columns for each segment overlapping [since, until).
+
+        Yields:
+            dict: Column name → array (memory-mapped where no filtering was needed)
+        """
+        since = -np.inf if since is None else since
+        until = np.inf if until is None else until
+        for segment, first, last, events in self.segments:
+            if last < since - TIME_SKEW or first >= until + TIME_SKEW:
+                continue
+            rows = self._rows(segment)
+            times = self._column(segment, "time", rows)
+            lo = int(np.searchsorted(times, since - TIME_SKEW)) if since > first - TIME_SKEW else 0
+            hi = int(np.searchsorted(times, until + TIME_SKEW)) if until <= last + TIME_SKEW else rows
+            if lo >= hi:
+                continue
+            window = times[lo:hi]
+            mask = None
+            if window[0] < since or window[-1] >= until:
+                mask = (window >= since) & (window < until)
+            data = {}
+            for name in columns:
+                values = window if name == "time" else self._column(segment, name, rows)[lo:hi]
+                data[name] = values[mask] if mask is not None else values
+            yield data
+
+    def ids(self, field, name):
+        """Id of a gesture/device/user name (None if it never appears in the log)."""
+        names = self.dictionary[field]
+        return names.index(name) if name in names else None
+
+    def name(self, field, index):
+        index = int(index)
+        if index == NONE_ID:
+            return None
+        names = self.dictionary[field]
+        return names[index] if index < len(names) else f"#{index}"
+
+
+def percentiles(values):
+    """p50 / p95 / p99 of an array (NaNs dropped), or None when empty."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    return [float(v) for v in np.quantile(values, QUANTILES)]
+
+
+def summarize(log, since=None, until=None, user=None):
+    """
+    Counts, false-trigger rates and latency percentiles over a time range.
+
+    Returns:
+        dict: Totals, per-gesture, per-user and per-device breakdowns
+    """
+    user_id = None
+    if user is not None:
+        user_id = log.ids("users", user)
+        if user_id is None:
+            return {"events": 0, "span_hours": 0.0, "kinds": {}, "gestures": {}, "users": {}, "devices": {}}
+    gestures_n = len(log.dictionary["gestures"]) + 1  # Last slot: none
+    users_n = len(log.dictionary["users"]) + 1
+    devices_n = len(log.dictionary["devices"]) + 1
+    counts = np.zeros(len(KINDS) * gestures_n * users_n, dtype=np.int64)  # kind × gesture × user
+    by_device = np.zeros(2 * len(SOURCES) * devices_n, dtype=np.int64)  # state × source × device
+    confirmed_gesture, confirmed_latency, actuation_latency = [], [], []
+    first = last = None
+    confirmed_kind, device_kind = KINDS.index("confirmed"), KINDS.index("device")
+
+    columns = ["time", "kind", "gesture", "user", "device", "state", "source", "latency_ms"]
+    for data in log.scan(columns, since, until):
+        # Counts keep the user dimension, so a user filter only has to narrow the latency selections
+        mine = None if user_id is None else data["user"] == user_id
+        rows = np.flatnonzero(mine) if mine is not None else None
+        if not len(data["time"]) or (rows is not None and not len(rows)):
+            continue
+        times = data["time"] if rows is None else data["time"][rows[[0, -1]]]
+        first = float(times[0]) if first is None else min(first, float(times[0]))
+        last = float(times[-1]) if last is None else max(last, float(times[-1]))
+        # One bincount over a combined key; ids past the dictionary (none = 65535) fold into the last slot
+        kind = data["kind"]
+        gesture = np.minimum(data["gesture"], gestures_n - 1)
+        key = kind.astype(np.int32)
+        key *= gestures_n
+        key += gesture
+        key *= users_n
+        key += np.minimum(data["user"], users_n - 1)
+        counts += np.bincount(key, minlength=len(counts))
+        devices = np.flatnonzero(kind == device_kind if mine is None else (kind == device_kind) & mine)
+        if len(devices):
+            source = data["source"][devices]
+            key = data["state"][devices].clip(0, 1).astype(np.int32)
+            key *= len(SOURCES)
+            key += source
+            key *= devices_n
+            key += np.minimum(data["device"][devices], devices_n - 1)
+            by_device += np.bincount(key, minlength=len(by_device))
+            actuation_latency.append(data["latency_ms"][devices[source == SOURCES.index("gesture")]])
+        confirmed = np.flatnonzero(kind == confirmed_kind if mine is None else (kind == confirmed_kind) & mine)
+        confirmed_gesture.append(gesture[confirmed])
+        confirmed_latency.append(data["latency_ms"][confirmed])
+
+    counts = counts.reshape(len(KINDS), gestures_n, users_n)
+    if user_id is not None:
+        only = np.zeros_like(counts)
+        only[:, :, user_id] = counts[:, :, user_id]
+        counts = only
+    by_gesture = counts.sum(axis=2)
+    by_user = counts.sum(axis=1)
+    by_device = by_device.reshape(2, len(SOURCES), devices_n)
+    kind_counts = by_gesture.sum(axis=1)
+    confirmed_gesture = np.concatenate(confirmed_gesture) if confirmed_gesture else np.zeros(0, np.uint16)
+    confirmed_latency = np.concatenate(confirmed_latency) if confirmed_latency else np.zeros(0, np.float32)
+
+    def rates(counts):
+        detected, confirmed, rejected = (int(counts[KINDS.index(k)]) for k in ("detected", "confirmed", "rejected"))
+        return {"detected": detected, "confirmed": confirmed, "rejected": rejected,
+                "false_trigger_rate": rejected / detected if detected else None}
+
+    gestures = {}
+    for g in range(gestures_n - 1):
+        entry = rates(by_gesture[:, g])
+        if entry["detected"] or entry["confirmed"]:
+            entry["confirm_latency_ms"] = percentiles(confirmed_latency[confirmed_gesture == g])
+            gestures[log.dictionary["gestures"][g]] = entry
+    users = {}
+    for u in range(users_n):
+        entry = rates(by_user[:, u])
+        if entry["detected"]:
+            users[log.dictionary["users"][u] if u < users_n - 1 else None] = entry
+    devices = {}
+    for d in range(devices_n - 1):
+        counts = by_device[:, :, d]
+        if counts.any():
+            devices[log.dictionary["devices"][d]] = {
+                "on": int(counts[1].sum()), "off": int(counts[0].sum()),
+                "by_gesture": int(counts[:, 0].sum()), "manual": int(counts[:, 1].sum()),
+            }
+    span = (min(until, last) if until is not None else last) - (max(since, first) if since is not None else first) \
+        if first is not None else 0.0
+    return {
+        "events": int(kind_counts.sum()),
+        "span_hours": span / 3600,
+        "kinds": {k: int(c) for k, c in zip(KINDS, kind_counts)},
+        "gestures": gestures,
+        "users": users,
+        "devices": devices,
+        "actuation_latency_ms": percentiles(np.concatenate(actuation_latency)) if actuation_latency else None,
+    }
+
+
+def device_transitions_by_period(log, since=None, until=None, period=3600, user=None):
+    """
+    Device transitions per time bucket.
+
+    Returns:
+        list: (bucket start Unix time, {device name: transitions}) in time order
+    """
+    user_id = log.ids("users", user) if user is not None else None
+    if user is not None and user_id is None:
+        return []
+    devices_n = len(log.dictionary["devices"]) + 1
+    buckets = {}
+    device_kind = KINDS.index("device")
+    offset = time.localtime().tm_gmtoff  # Bucket by local time so days start at local midnight
+    for data in log.scan(["time", "kind", "device", "user"], since, until):
+        keep = data["kind"] == device_kind
+        if user_id is not None:
+            keep &= data["user"] == user_id
+        if not keep.any():
+            continue
+        rows = np.flatnonzero(keep)
+        bucket = ((data["time"][rows] + offset) // period).astype(np.int64)
+        base = int(bucket[0])  # Times are sorted within a segment: buckets start here
+        bucket -= base
+        periods = int(bucket[-1]) + 1
+        bucket *= devices_n
+        bucket += np.minimum(data["device"][rows], devices_n - 1)
+        counts = np.bincount(bucket, minlength=periods * devices_n).reshape(periods, devices_n)
+        for b, d in zip(*np.nonzero(counts)):
+            per_device = buckets.setdefault(base + int(b), {})
+            name = log.dictionary["devices"][d] if d < devices_n - 1 else "?"
+            per_device[name] = per_device.get(name, 0) + int(counts[b, d])
+    return [(b * period - offset, buckets[b]) for b in sorted(buckets)]
+
+
+def parse_time(text):
+    """Parse "7d" / "24h" / "30m" (ago), a Unix time, or an ISO date/datetime (local time)."""
+    if text is None:
+        return None
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+    if text[-1:] in units and text[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(text[:-1]) * units[text[-1]]
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Unrecognised time: {text}")
+
+
+def format_summary(summary):
+    """Printable report for summarize()."""
+    def pct(rate):
+        return "   -" if rate is None else f"{rate * 100:5.1f}%"
+
+    def lat(values):
+        return "-" if values is None else " / ".join(f"{v:.0f}" for v in values)
+
+    lines = ["=" * 78, "📊 GESTURE EVENTS", "=" * 78,
+             f"  {summary['events']} events over {summary['span_hours']:.1f} h: " +
+             ", ".join(f"{count} {kind}" for kind, count in summary["kinds"].items())]
+    if summary["gestures"]:
+        lines += ["", f"  {'gesture':16} {'detected':>9} {'confirmed':>9} {'rejected':>9} {'false':>7}"
+                      f"   confirm ms p50/p95/p99"]
+        for name, g in sorted(summary["gestures"].items()):
+            lines.append(f"  {name:16} {g['detected']:9d} {g['confirmed']:9d} {g['rejected']:9d} "
+                         f"{pct(g['false_trigger_rate']):>7}   {lat(g['confirm_latency_ms'])}")
+    if summary["users"]:
+        lines += ["", f"  {'user':16} {'detected':>9} {'confirmed':>9} {'rejected':>9} {'false':>7}"]
+        for name, u in sorted(summary["users"].items(), key=lambda item: str(item[0])):
+            lines.append(f"  {str(name or '(none)'):16} {u['detected']:9d} {u['confirmed']:9d} "
+                         f"{u['rejected']:9d} {pct(u['false_trigger_rate']):>7}")
+    if summary["devices"]:
+        hours = max(summary["span_hours"], 1e-9)
+        lines += ["", f"  {'device':16} {'on':>7} {'off':>7} {'gesture':>8} {'manual':>7} {'per hour':>9}"]
+        for name, d in sorted(summary["devices"].items()):
+            lines.append(f"  {name:16} {d['on']:7d} {d['off']:7d} {d['by_gesture']:8d} {d['manual']:7d} "
+                         f"{(d['on'] + d['off']) / hours:9.2f}")
+        lines.append(f"\n  Gesture onset → device ms p50/p95/p99: {lat(summary['actuation_latency_ms'])}")
+    lines.append("=" * 78)
+    return "\n".join(lines)
+
+
+def format_event(log, data, i):
+    """One event as a line of text."""
+    when = float(data["time"][i])
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(when)) + f".{int(when % 1 * 1000):03d}"
+    kind = KINDS[data["kind"][i]]
+    gesture = log.name("gestures", data["gesture"][i])
+    user = log.name("users", data["user"][i])
+    latency = float(data["latency_ms"][i])
+    parts = [stamp, f"{kind:9}"]
+    if kind == "device":
+        state = "ON" if data["state"][i] == 1 else "OFF"
+        channel = f" ch {data['value'][i]}" if data["value"][i] >= 0 else ""
+        parts.append(f"{log.name('devices', data['device'][i])} → {state}{channel}")
+        parts.append(f"({SOURCES[data['source'][i]]}{': ' + gesture if gesture else ''})")
+    else:
+        parts.append(f"{gesture} ({data['frames'][i]} frames)")
+    if not np.isnan(latency):
+        parts.append(f"{latency:.0f} ms")
+    if user:
+        parts.append(f"user={user}")
+    return "  ".join(parts)
+
+
+def tail(log, count=20):
+    """The last count events, formatted one per line."""
+    lines = []
+    for segment, *_ in reversed(log.segments):
+        rows = log._rows(segment)
+        take = min(rows, count - len(lines))
+        data = {name: log._column(segment, name, rows)[rows - take:] for name in COLUMNS}
+        lines = [format_event(log, data, i) for i in range(take)] + lines
+        if len(lines) >= count:
+            break
+    return lines
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def generate_year(path, events, seed=0, days=365):
+    """
+    Bulk-write a synthetic log of events spread over days, with a realistic mix.
+
+    Returns:
+        float: Seconds spent writing
+    """
+    rng = np.random.default_rng(seed)
+    writer = EventLogWriter(path)
+    gestures = ["thumb_up", "thumb_down", "index_up", "peace_sign", "three_fingers"]
+    devices = ["LED1", "LED2", "FAN1", "DOOR1", "TV1"]
+    users = ["alice", "bob", "carol"]
+    for field, names in (("gestures", gestures), ("devices", devices), ("users", users)):
+        for name in names:
+            writer._id(field, name)
+    writer._save_dictionary()
+    start = time.time() - days * 86400
+    t0 = time.perf_counter()
+    chunk = 1_000_000
+    for offset in range(0, events, chunk):
+        n = min(chunk, events - offset)
+        when = start + (offset + np.sort(rng.random(n)) * n) / events * days * 86400
+        kind = rng.choice(4, n, p=[0.4, 0.25, 0.15, 0.2]).astype(np.uint8)
+        is_device = kind == 3
+        writer.write_columns({
+            "time": when,
+            "kind": kind,
+            "gesture": np.where(is_device & (rng.random(n) < 0.2), NONE_ID, rng.integers(0, len(gestures), n)),
+            "device": np.where(is_device, rng.integers(0, len(devices), n), NONE_ID),
+            "state": np.where(is_device, rng.integers(0, 2, n), -1),
+            "value": np.full(n, -1),
+            "user": rng.integers(0, len(users), n),
+            "source": (is_device & (rng.random(n) < 0.2)).astype(np.uint8),
+            "latency_ms": np.where((kind == 1) | is_device, rng.gamma(4, 30, n), np.nan),
+            "frames": rng.integers(1, 10, n),
+        })
+    writer.close()
+    return time.perf_counter() - t0
+
+
+def bench(path, events):
+    """Write a synthetic year of events (if the log is empty) and time typical queries."""
+    if not segment_dirs(path):
+        print(f"🔧 Writing {events:,} synthetic events to {path}...")
+        seconds = generate_year(path, events)
+        print(f"   {events / seconds:,.0f} events/s")
+    log = EventLog(path)
+    now = time.time()
+    size = sum(os.path.getsize(os.path.join(seg, f)) for seg, *_ in log.segments for f in os.listdir(seg))
+    print(f"📂 {len(log):,} events in {len(log.segments)} segments ({size / 1024 ** 2:.0f} MB, "
+          f"{size / max(len(log), 1):.1f} bytes/event)")
+    queries = [
+        ("summary, whole year", lambda: summarize(log)),
+        ("summary, last 7 days", lambda: summarize(log, since=now - 7 * 86400)),
+        ("summary, one user, year", lambda: summarize(log, user="alice")),
+        ("device toggles per day, year", lambda: device_transitions_by_period(log, period=86400)),
+        ("device toggles per hour, last day", lambda: device_transitions_by_period(log, since=now - 86400)),
+    ]
+    for name, query in queries:
+        t0 = time.perf_counter()
+        query()
+        print(f"   {name:36} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the gesture event log")
+    parser.add_argument("--log", default="events", help="Event log directory (default: events)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("summary", "Counts, false-trigger rates and latency percentiles"),
+                            ("hourly", "Device transitions per hour (or day)")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--since", type=parse_time, help="Start: 7d / 24h ago, a date or a Unix time")
+        p.add_argument("--until", type=parse_time, help="End (exclusive), same formats")
+        p.add_argument("--user", help="Only this user's events")
+        p.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+        if name == "hourly":
+            p.add_argument("--by", choices=["hour", "day"], default="hour")
+    tail_parser = sub.add_parser("tail", help="Most recent events")
+    tail_parser.add_argument("-n", type=int, default=20)
+    bench_parser = sub.add_parser("bench", help="Time queries over a synthetic year of events")
+    bench_parser.add_argument("--events", type=int, default=20_000_000)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.log, args.events)
+        return
+    if not segment_dirs(args.log):
+        sys.exit(f"❌ No event log at {args.log} (run the controller with --events)")
+    log = EventLog(args.log)
+
+    if args.command == "summary":
+        summary = summarize(log, args.since, args.until, args.user)
+        print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    elif args.command == "hourly":
+        period = 86400 if args.by == "day" else 3600
+        rows = device_transitions_by_period(log, args.since, args.until, period, args.user)
+        if args.json:
+            print(json.dumps([{"start": start, "devices": devices} for start, devices in rows], indent=2))
+            return
+        fmt = "%Y-%m-%d" if args.by == "day" else "%Y-%m-%d %H:00"
+        for start, devices in rows:
+            total = sum(devices.values())
+            detail = ", ".join(f"{name} {count}" for name, count in sorted(devices.items()))
+            print(f"  {time.strftime(fmt, time.localtime(start)):16} {total:6d}  {detail}")
+    elif args.command == "tail":
+        for line in tail(log, args.n):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Frame Deadlines for Virtual LED Controller
+==========================================
+
+The frame loop takes whatever frame the camera hands out next. After a stall
+(a GC pause, a slow imshow, a busy machine) that frame waited in the
+driver's buffer, and with several buffers the loop then works through a
+backlog of old frames. Hand tracking, gestures and the webcam window all lag
+behind the real hand, and nothing shows why.
+
+Here every frame gets a capture time and must be on screen within
+FRAME_DEADLINE_MS of it:
+
+    capture time    A grab() that waits for the camera returns a fresh frame
+                    (captured now). A grab() that returns at once handed out a
+                    buffered frame, taken about one frame interval after the
+                    previous one. It can't be older than the driver's buffers
+                    reach back from the previous grab, or newer than now.
+    skip            Before decoding and again before inference, the frame's age
+                    plus the time the remaining stages usually take (moving
+                    averages) is checked against the deadline. A frame that
+                    can't make it is dropped, and the next one is read. Stale
+                    buffered frames are only grabbed, never decoded. Skipping
+                    stops after MAX_CONSECUTIVE_SKIPS frames, and never happens
+                    when even a fresh frame couldn't meet the deadline (then
+                    every frame counts as a miss instead).
+    misses          A processed frame that ends up past its deadline counts
+                    as a miss of the stage during which the deadline passed
+                    (capture, convert, inference, gesture, overlay, display).
+
+Skips and misses per stage are kept in telemetry and printed at shutdown.
+
+Usage: python virtual_led_controller.py --frame-deadline [MS]   (default budget FRAME_DEADLINE_DEFAULT_MS)
+       python frame_deadline.py                      (simulated camera with stalls, with and without deadlines)
+"""
+
+import argparse
+import time
+from collections import deque
+
+import cv2
+
+import virtual_led_controller as vlc
+
+# Frame-loop stages, in order ("gesture" = landmarks, detect, debounce and actuation)
+STAGES = ("capture", "convert", "inference", "gesture", "overlay", "display")
+
+BUFFERED_GRAB = 0.25  # A grab() faster than this fraction of a frame interval returned a buffered frame
+ESTIMATE_WEIGHT = 0.1  # Weight of the newest frame in the per-stage moving averages
+MAX_CONSECUTIVE_SKIPS = 8  # Process a frame at the latest after this many skips
+DEFAULT_BUFFERS = 4  # Driver buffers assumed when the camera doesn't report CAP_PROP_BUFFERSIZE
+
+
+class FrameDeadline:
+    """
+    Capture timestamps, deadline skips and per-stage misses (frame thread).
+    """
+
+    def __init__(self, budget_ms, fps=30.0, buffers=DEFAULT_BUFFERS, clock=time.perf_counter):
+        self.budget = budget_ms / 1000
+        self.interval = 1.0 / (fps or 30.0)
+        self.buffers = buffers
+        self.clock = clock
+        self.estimates = dict.fromkeys(STAGES[1:], 0.0)  # Usual seconds per stage
+        self.capture_ts = None  # Capture time of the current frame
+        self.marks = {}  # Stage → clock time it ended, for the current frame
+        self.frames = 0
+        self.skipped = dict.fromkeys(STAGES[:2], 0)  # Where skipped frames were dropped
+        self.misses = dict.fromkeys(STAGES, 0)  # Where processed frames passed their deadline
+        self._last_capture = None
+        self._last_grab = None
+        self._skips_in_row = 0
+
+    def read(self, cap, drain=True):
+        """
+        Read the next frame that can still meet its deadline (replaces cap.read()).
+
+        Args:
+            cap: Webcam capture
+            drain: Skip frames that are too old (off while power save idles;
+                   frames are then stamped as fresh)
+
+        Returns:
+            tuple: (ok, frame) as cap.read(); capture_ts holds the frame's capture time
+        """
+        while True:
+            start = self.clock()
+            if not cap.grab():
+                return False, None
+            end = self.clock()
+            if drain and end - start < BUFFERED_GRAB * self.interval and self._last_capture is not None:
+                oldest = self._last_grab - (self.buffers - 1) * self.interval
+                self.capture_ts = min(end, max(self._last_capture + self.interval, oldest))
+            else:
+                self.capture_ts = end
+            self._last_capture, self._last_grab = self.capture_ts, end
+            if not drain or self.admit("capture", end):
+                break
+        self.marks = {"capture": self.clock()}
+        return cap.retrieve()
+
+    def admit(self, stage, now=None):
+        """
+        Check whether the current frame can still finish within its deadline.
+
+        Args:
+            stage: Stage that just ended ("capture" or "convert")
+
+        Returns:
+            bool: True to process the frame, False to skip it (counted)
+        """
+        if now is None:
+            now = self.clock()
+            self.marks[stage] = now
+        later = STAGES[STAGES.index(stage) + 1:]
+        remaining = sum(self.estimates[s] for s in later)
+        late = now - self.capture_ts + remaining > self.budget
+        if not late or remaining > self.budget or self._skips_in_row >= MAX_CONSECUTIVE_SKIPS:
+            self._skips_in_row = 0
+            return True
+        self._skips_in_row += 1
+        self.skipped[stage] += 1
+        vlc.telemetry["deadline_skipped"] = sum(self.skipped.values())
+        return False
+
+    def mark(self, stage):
+        """Note the end of a stage of the current frame."""
+        self.marks[stage] = self.clock()
+
+    def finish(self):
+        """
+        End the current frame (after display): update the stage estimates and count a miss.
+
+        Returns:
+            str: Stage during which the deadline passed, or None if the frame made it
+        """
+        self.marks["display"] = self.clock()
+        self.frames += 1
+        deadline = self.capture_ts + self.budget
+        previous = self.capture_ts
+        missed = None
+        for stage in STAGES:
+            end = self.marks.get(stage)
+            if end is None:
+                continue
+            if stage in self.estimates:
+                self.estimates[stage] += ESTIMATE_WEIGHT * (end - previous - self.estimates[stage])
+            if missed is None and end > deadline:
+                missed = stage
+            previous = end
+        if missed:
+            self.misses[missed] += 1
+            vlc.telemetry["deadline_misses"] = {stage: n for stage, n in self.misses.items() if n}
+        vlc.telemetry["frame_latency_ms"] = round((previous - self.capture_ts) * 1000, 1)
+        return missed
+
+    def summary(self):
+        """
+        Frames processed, skipped and late so far.
+
+        Returns:
+            dict: frames, skipped (per stage), misses (per stage), miss_rate
+        """
+        missed = sum(self.misses.values())
+        return {
+            "frames": self.frames,
+            "skipped": dict(self.skipped),
+            "misses": dict(self.misses),
+            "miss_rate": round(missed / self.frames, 4) if self.frames else None,
+        }
+
+    def report(self):
+        """Print skipped frames and deadline misses per stage."""
+        summary = self.summary()
+        skipped = sum(summary["skipped"].values())
+        missed = {stage: n for stage, n in summary["misses"].items() if n}
+        line = (f"⏱ Frame deadline {self.budget * 1000:.0f} ms: {summary['frames']} frames, "
+                f"{skipped} skipped as too old")
+        if missed:
+            line += f", {sum(missed.values())} late (" + ", ".join(f"{s} {n}" for s, n in missed.items()) + ")"
+        print(line)
+
+
+def start_frame_deadline(budget_ms, cap):
+    """
+    Create frame deadlines for the frame loop.
+
+    Args:
+        budget_ms: Capture → display budget per frame
+        cap: Webcam capture (its frame rate sets the expected frame interval)
+
+    Returns:
+        FrameDeadline: Read frames with read(); mark() stages; finish() each frame
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    buffers = int(cap.get(cv2.CAP_PROP_BUFFERSIZE) or 0)
+    deadline = FrameDeadline(budget_ms, fps if 1 <= fps <= 240 else 30.0, buffers if buffers >= 1 else DEFAULT_BUFFERS)
+    vlc.telemetry.update(deadline_skipped=0, deadline_misses={})
+    print(f"✓ Frame deadline: {budget_ms:g} ms from capture to display (older frames are skipped)")
+    return deadline
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SimulatedCamera:
+    """
+    A camera delivering frames at a fixed rate into a driver queue of `buffers`
+    frames (new frames are dropped while it is full, as V4L2 does).
+    The retrieved "frame" is its true capture time.
+    """
+
+    def __init__(self, clock, fps=30.0, buffers=4):
+        self.clock = clock
+        self.interval = 1.0 / fps
+        self.buffers = buffers
+        self.next_capture = 0.0
+        self.queue = deque()
+        self.current = None
+
+    def _fill(self):
+        while self.next_capture <= self.clock.now:
+            if len(self.queue) < self.buffers:
+                self.queue.append(self.next_capture)
+            self.next_capture += self.interval
+
+    def grab(self):
+        self._fill()
+        if not self.queue:
+            self.clock.now = self.next_capture
+            self._fill()
+        self.current = self.queue.popleft()
+        return True
+
+    def retrieve(self):
+        return True, self.current
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+
+def simulate(budget_ms, seconds=20.0, fps=30.0, buffers=4, stage_ms=(1.0, 18.0, 1.0, 1.0, 4.0),
+             stall_every=2.0, stall_ms=300.0):
+    """
+    Run the frame loop's timing against a simulated camera with periodic stalls.
+
+    Args:
+        budget_ms: Frame deadline (None = read every frame as it comes)
+        stage_ms: Time of convert, inference, gesture, overlay and display
+        stall_every: Seconds between stalls (e.g. GC pauses)
+        stall_ms: Length of each stall
+
+    Returns:
+        dict: processed frames, skipped frames, latency p50 / p95 / max (ms),
+              misses per stage and the time to get back under the deadline after a stall
+    """
+    clock = SimulatedClock()
+    camera = SimulatedCamera(clock, fps, buffers)
+    deadline = FrameDeadline(budget_ms, fps, buffers, clock=clock) if budget_ms else None
+    latencies, recoveries = [], []
+    next_stall, stall_end = stall_every, None
+    while clock.now < seconds:
+        if deadline:
+            ok, captured = deadline.read(camera)
+        else:
+            ok, captured = camera.read()
+        clock.now += stage_ms[0] / 1000
+        if deadline and not deadline.admit("convert"):
+            continue
+        for stage, ms in zip(STAGES[2:], stage_ms[1:]):
+            clock.now += ms / 1000
+            if deadline and stage != "display":
+                deadline.mark(stage)
+        if clock.now >= next_stall:
+            clock.now += stall_ms / 1000
+            stall_end, next_stall = clock.now, next_stall + stall_every
+        if deadline:
+            deadline.finish()
+        latency = clock.now - captured
+        latencies.append(latency)
+        if stall_end is not None and latency <= (budget_ms or 100.0) / 1000 and clock.now > stall_end:
+            recoveries.append(clock.now - stall_end)
+            stall_end = None
+    latencies.sort()
+    summary = deadline.summary() if deadline else {"skipped": {}, "misses": {}}
+    return {
+        "frames": len(latencies),
+        "skipped": sum(summary["skipped"].values()),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "misses": {stage: n for stage, n in summary["misses"].items() if n},
+        "recovery_ms": max(recoveries) * 1000 if recoveries else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a stalling frame loop with and without frame deadlines")
+    parser.add_argument("--deadline", type=float, default=vlc.FRAME_DEADLINE_DEFAULT_MS, help="Deadline in ms")
+    parser.add_argument("--buffers", type=int, default=4, help="Frames the camera driver queues")
+    parser.add_argument("--stall", type=float, default=300.0, help="Stall length in ms (every 2 s)")
+    parser.add_argument("--inference", type=float, default=18.0, help="Inference time in ms")
+    args = parser.parse_args()
+
+    print(f"⏱ Simulated 30 fps camera, {args.buffers} driver buffers, {args.inference:g} ms inference, "
+          f"{args.stall:g} ms stall every 2 s")
+    for name, budget in (("every frame", None), (f"deadline {args.deadline:g} ms", args.deadline)):
+        r = simulate(budget, buffers=args.buffers, stage_ms=(1.0, args.inference, 1.0, 1.0, 4.0), stall_ms=args.stall)
+        recovery = "-" if r["recovery_ms"] is None else f"{r['recovery_ms']:.0f} ms"
+        misses = ", ".join(f"{s} {n}" for s, n in r["misses"].items()) or "-"
+        print(f"   {name:18} {r['frames']:4d} frames ({r['skipped']:3d} skipped)   latency p50 {r['p50_ms']:5.0f} ms  "
+              f"p95 {r['p95_ms']:5.0f} ms  max {r['max_ms']:5.0f} ms   back in budget after {recovery}   "
+              f"misses: {misses}")
+
+
+if __name__ == "__main__":
+    main()
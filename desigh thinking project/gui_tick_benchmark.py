@@ -0,0 +1,246 @@
+"""
+GUI Tick Benchmark for Virtual LED Controller
+==============================================
+
+Measures how long one LEDController.update_leds() tick spends in Tk
+(Python-side canvas calls plus the idle redraw) for a small and a large
+installation, how long the device grid takes to scroll and relayout, and
+how often the GUI wakes up while nothing changes.
+
+Usage: python gui_tick_benchmark.py [--ticks 200] [--devices 5 200 1000] [--scroll-steps 50] [--idle-seconds 3]
+       xvfb-run -a python gui_tick_benchmark.py    (on a machine without a display)
+
+Note: Needs a display (Tk window). The webcam is not used.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import tkinter as tk
+
+import virtual_led_controller as vlc
+
+DEVICE_TYPES = ["led", "fan", "door_lock", "tv", "led"]
+
+
+def configure_devices(count):
+    """Replace the controller's devices with `count` synthetic devices of mixed types."""
+    original = dict(vlc.DEVICE_CONFIG)
+    vlc.DEVICE_CONFIG.clear()
+    vlc.led_states.clear()
+    vlc.TV_CHANNEL_INDEX.clear()
+    vlc.device_levels.clear()
+    templates = list(original.values())
+    for i in range(count):
+        device_type = DEVICE_TYPES[i % len(DEVICE_TYPES)]
+        template = next((d for d in templates if d.get('type', 'led') == device_type), templates[0])
+        device_id = f"{device_type.upper()}{i}"
+        vlc.DEVICE_CONFIG[device_id] = dict(template, label=f"{template['label']} {i}")
+        vlc.led_states[device_id] = False
+        if device_type == 'tv':
+            vlc.TV_CHANNEL_INDEX[device_id] = 0
+        if device_type in vlc.LEVEL_DEVICE_TYPES:
+            vlc.device_levels[device_id] = 100
+
+
+def open_controller(count, running=False):
+    """
+    Build the controller GUI for `count` devices and draw it once.
+
+    With running=False (timed ticks) update_leds() never reschedules itself.
+    """
+    configure_devices(count)
+    vlc.startup_status["ready"] = True  # No camera here: skip the startup progress poll
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit(f"❌ No display for Tk ({e}). Run under a display or with: xvfb-run -a python gui_tick_benchmark.py")
+    vlc.running = running
+    app = vlc.LEDController(root)
+    root.update()
+    return root, app
+
+
+def close_controller(root, app):
+    vlc.remove_device_listener(app.on_device_change)
+    root.destroy()
+
+
+def timings(samples):
+    """Mean, p95 and max of millisecond samples."""
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)],
+        "max_ms": samples[-1],
+    }
+
+
+def measure(count, ticks, toggle_every):
+    """
+    Time update_leds() ticks for `count` devices.
+
+    Args:
+        count: Number of devices
+        ticks: Number of ticks to time
+        toggle_every: Toggle one device every N ticks (0 = never)
+
+    Returns:
+        dict: Tick timings in milliseconds
+    """
+    root, app = open_controller(count)
+    device_ids = list(vlc.DEVICE_CONFIG)
+    samples = []
+    for tick in range(ticks):
+        if toggle_every and tick % toggle_every == 0:
+            vlc.apply_device_changes({device_ids[tick % len(device_ids)]: "toggle"})
+        start = time.perf_counter()
+        app.update_leds()
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    close_controller(root, app)
+    return dict(timings(samples), devices=count)
+
+
+def measure_scroll(count, steps):
+    """
+    Time scrolling and relayout of the device grid for `count` devices.
+
+    Each sample runs until Tk is idle again, so it includes re-binding the
+    tile pool (layout_tiles) and redrawing the newly bound devices.
+
+    Returns:
+        dict: Timings in milliseconds for "wheel" (one mouse-wheel step),
+              "page" (one page, every tile re-bound) and "resize" (window
+              width change that alters the column count)
+    """
+    root, app = open_controller(count)
+    grid = app.grid_canvas
+
+    def timed(action):
+        start = time.perf_counter()
+        action()
+        root.update_idletasks()
+        return (time.perf_counter() - start) * 1000
+
+    def from_top_when_at_end():
+        if grid.yview()[1] >= 1.0:
+            grid.yview_moveto(0)
+            root.update()
+
+    results = {}
+    samples = []
+    for _ in range(steps):
+        from_top_when_at_end()
+        samples.append(timed(lambda: grid.event_generate("<Button-5>", x=10, y=10)))
+    results["wheel"] = timings(samples)
+
+    grid.yview_moveto(0)
+    root.update()
+    samples = []
+    for _ in range(steps):
+        from_top_when_at_end()
+        samples.append(timed(lambda: grid.yview_scroll(1, "pages")))
+    results["page"] = timings(samples)
+
+    samples = []
+    for step in range(steps):
+        width = vlc.WINDOW_WIDTH + (step % 2) * vlc.GRID_CELL_WIDTH
+        samples.append(timed(lambda: (root.geometry(f"{width}x{vlc.WINDOW_HEIGHT}"), root.update())))
+    results["resize"] = timings(samples)
+
+    close_controller(root, app)
+    return results
+
+
+def measure_idle(count, seconds, changes):
+    """
+    Count Tk-thread wakeups with every device off, in the running main loop.
+
+    A wakeup is one Python callback run by Tk (timer, binding or virtual
+    event). The first window has no device changes; in the second, another
+    thread toggles a static device `changes` times, as the webcam thread
+    does, and each change must reach the GUI as one redraw.
+
+    Returns:
+        dict: idle_per_s and changing_per_s wakeups, changes made and
+              redraws the GUI did for them
+    """
+    wakeups = []
+    original_call = tk.CallWrapper.__call__
+
+    def counting_call(wrapper, *args):
+        wakeups.append(1)
+        return original_call(wrapper, *args)
+
+    tk.CallWrapper.__call__ = counting_call
+    try:
+        root, app = open_controller(count, running=True)
+        redraws = []
+        refresh_now = app.refresh_now
+        app.refresh_now = lambda: (redraws.append(1), refresh_now())
+
+        def run_for(seconds):
+            wakeups.clear()
+            root.after(int(seconds * 1000), root.quit)
+            root.mainloop()
+            return (len(wakeups) - 1) / seconds  # Not counting the quit timer
+
+        idle = run_for(seconds)
+        static_id = next(d for d in vlc.DEVICE_CONFIG if not app.is_animated(d, True))
+
+        def toggle():
+            for _ in range(changes):
+                time.sleep(seconds / (changes + 1))
+                vlc.apply_device_changes({static_id: "toggle"})
+
+        toggler = threading.Thread(target=toggle)
+        toggler.start()
+        changing = run_for(seconds)
+        toggler.join()
+        vlc.running = False
+        close_controller(root, app)
+    finally:
+        tk.CallWrapper.__call__ = original_call
+    return {"idle_per_s": idle, "changing_per_s": changing, "changes": changes, "redraws": len(redraws)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Tk time per GUI tick")
+    parser.add_argument("--ticks", type=int, default=200, help="Ticks to time per run")
+    parser.add_argument("--devices", type=int, nargs="+", default=[5, 200, 1000], help="Device counts to measure")
+    parser.add_argument("--toggle-every", type=int, default=10, help="Toggle a device every N ticks (0 = never)")
+    parser.add_argument("--scroll-steps", type=int, default=50,
+                        help="Wheel steps, page scrolls and resizes to time per run (0 = skip)")
+    parser.add_argument("--idle-seconds", type=float, default=3.0,
+                        help="Seconds to count GUI wakeups with all devices off (0 = skip)")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("⏱  GUI TICK BENCHMARK (Tk time per update_leds tick)")
+    print("=" * 60)
+    for count in args.devices:
+        result = measure(count, args.ticks, args.toggle_every)
+        print(f"  {result['devices']:5} devices : mean {result['mean_ms']:7.3f} ms | "
+              f"p95 {result['p95_ms']:7.3f} ms | max {result['max_ms']:7.3f} ms")
+    if args.scroll_steps:
+        print("-" * 60)
+        print("🖱  Scroll and relayout (until Tk is idle again)")
+        for count in args.devices:
+            for action, result in measure_scroll(count, args.scroll_steps).items():
+                print(f"  {count:5} devices {action:>6} : mean {result['mean_ms']:7.3f} ms | "
+                      f"p95 {result['p95_ms']:7.3f} ms | max {result['max_ms']:7.3f} ms")
+    if args.idle_seconds:
+        print("-" * 60)
+        print("💤 GUI wakeups per second, all devices off")
+        for count in args.devices:
+            result = measure_idle(count, args.idle_seconds, 10)
+            print(f"  {count:5} devices : idle {result['idle_per_s']:5.1f}/s | with changes "
+                  f"{result['changing_per_s']:5.1f}/s | {result['redraws']}/{result['changes']} changes redrawn")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,835 @@
+"""
+Shared Hand-Inference Server for Virtual LED Controller
+=======================================================
+
+Runs hand tracking for many cameras in one place. Every room runs only the
+capture side of the controller. It reads the webcam, sends frames over a Unix
+socket, and acts on the gestures that come back. One server with a pool of
+worker threads does the MediaPipe work for all of them.
+
+Protocol (both directions): a struct "!II" (header length, payload length),
+a JSON header, then the payload.
+
+    → {"type": "hello", "name": "room-101", "slo_ms": 100,
+       "detection": {"finger_angle": 140, "thumb_offset": 0.05}, "debounce_frames": 3}
+    ← {"type": "welcome", "client": 3}
+    → {"type": "frame", "id": 17, "shape": [480, 640]} + raw BGR pixels (mirrored)
+    ← {"type": "result", "id": 17, "landmarks": [x0, y0, z0, ... x20, y20, z20] or null,
+       "score": 0.97, "handedness": "Right", "gesture": "peace_sign", "confirmed": "peace_sign",
+       "queue_ms": 1.2, "infer_ms": 14.8, "dropped": 0}
+    → {"type": "stats"}
+    ← {"type": "stats", "cpu_seconds": ..., "clients": [...]}
+
+Scheduling:
+
+    - Each camera has at most one waiting frame. A newer frame replaces an
+      older one that is still waiting (counted as dropped), so a slow server
+      never builds a backlog, and a camera that sends faster than it is
+      served cannot crowd out the others.
+    - Each camera has at most one frame in a worker at a time. Its Hands
+      instance keeps tracking state between frames, which is only valid
+      when frames are processed in order.
+    - Free workers take the waiting frame with the earliest deadline
+      (arrival + the camera's SLO), so tight-SLO cameras go first under load.
+    - Every camera gets its own Hands instance (video mode, so landmarks are
+      tracked rather than re-detected) and its own debounce queue. Any worker
+      may run it.
+    - Gestures are detected with the thresholds and debounce length the
+      camera sends in its hello (its user's calibration, see calibrate.py),
+      falling back to the server's own.
+
+Per-camera latency (arrival → result sent) is tracked against its SLO and
+reported by the stats request, by the server every STATS_INTERVAL seconds,
+and by the load generator.
+
+Usage: python inference_server.py serve [--socket /tmp/gesture-inference.sock] [--workers 4]
+       python virtual_led_controller.py --inference-server /tmp/gesture-inference.sock [--camera-name hall]
+       python inference_server.py loadgen --ramp [--video clip.mp4] [--fps 30]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import virtual_led_controller as vlc
+
+DEFAULT_SOCKET = "/tmp/gesture-inference.sock"
+DEFAULT_SLO_MS = 100.0
+STATS_INTERVAL = 30.0  # Seconds between server status lines
+LATENCY_WINDOW = 1000  # Latencies kept per camera for percentiles
+SERVED_FRACTION = 0.9  # Load generator: a camera is served if this share of its frames return within the SLO
+HEADER = struct.Struct("!II")
+
+
+# =============================================================================
+# PROTOCOL
+# =============================================================================
+
+def send_message(sock, header, payload=b""):
+    """Send one message (JSON header + optional binary payload)."""
+    data = json.dumps(header).encode()
+    sock.sendall(HEADER.pack(len(data), len(payload)) + data)
+    if len(payload):
+        sock.sendall(payload)
+
+
+def recv_exact(sock, size):
+    """Read exactly size bytes, or None if the peer closed the connection."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return buffer
+
+
+def recv_message(sock):
+    """
+    Read one message.
+
+    Returns:
+        tuple: (header dict, payload bytearray), or None when the peer closed
+    """
+    sizes = recv_exact(sock, HEADER.size)
+    if sizes is None:
+        return None
+    header_size, payload_size = HEADER.unpack(sizes)
+    header = recv_exact(sock, header_size)
+    payload = recv_exact(sock, payload_size) if payload_size else bytearray()
+    if header is None or payload is None:
+        return None
+    return json.loads(header), payload
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else None
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class CameraSession:
+    """One connected camera: its socket, waiting frame, Hands instance and counters."""
+
+    def __init__(self, session_id, sock, name, slo_ms, detection=None, debounce_frames=None):
+        self.id = session_id
+        self.sock = sock
+        self.name = name
+        self.slo = slo_ms / 1000
+        unknown = set(detection or {}) - set(vlc.DETECTION_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown detection parameters: {', '.join(sorted(unknown))}")
+        self.detection = dict(vlc.DETECTION_PARAMS, **{k: float(v) for k, v in (detection or {}).items()})
+        self.send_lock = threading.Lock()
+        self.pending = None  # (frame, header, arrival) waiting for a worker
+        self.busy = False  # A worker is processing one of its frames
+        self.closed = False
+        self.hands = None  # Created by the first worker that serves it
+        self.history = deque(maxlen=int(debounce_frames or vlc.DEBOUNCE_FRAMES))
+        self.received = self.processed = self.dropped = self.slo_misses = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def send(self, header):
+        with self.send_lock:
+            send_message(self.sock, header)
+
+    def stats(self):
+        latencies = list(self.latencies)
+        p50, p95 = percentile(latencies, 0.5), percentile(latencies, 0.95)
+        return {
+            "client": self.id, "name": self.name, "slo_ms": self.slo * 1000, "received": self.received,
+            "processed": self.processed, "dropped": self.dropped, "slo_misses": self.slo_misses,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+        }
+
+
+class FrameScheduler:
+    """
+    Earliest-deadline-first choice among cameras with a waiting frame.
+
+    One waiting frame and one frame in flight per camera; all methods are
+    called under one condition variable.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.sessions = {}
+        self.running = True
+
+    def add(self, session):
+        with self.cond:
+            self.sessions[session.id] = session
+
+    def remove(self, session):
+        """Forget a camera; returns True if no worker holds it (caller closes its Hands)."""
+        with self.cond:
+            session.closed = True
+            session.pending = None
+            self.sessions.pop(session.id, None)
+            return not session.busy
+
+    def submit(self, session, frame, header):
+        with self.cond:
+            session.received += 1
+            if session.pending is not None:
+                session.dropped += 1
+            session.pending = (frame, header, time.perf_counter())
+            if not session.busy:
+                self.cond.notify()
+
+    def next(self):
+        """
+        Block until a frame can be processed.
+
+        Returns:
+            tuple: (session, (frame, header, arrival)), or None when stopping
+        """
+        with self.cond:
+            while self.running:
+                ready = [s for s in self.sessions.values() if s.pending is not None and not s.busy]
+                if ready:
+                    session = min(ready, key=lambda s: s.pending[2] + s.slo)
+                    job, session.pending = session.pending, None
+                    session.busy = True
+                    return session, job
+                self.cond.wait()
+            return None
+
+    def done(self, session):
+        """
+        A worker finished a camera's frame.
+
+        Returns:
+            bool: True if the camera disconnected meanwhile (caller closes its Hands)
+        """
+        with self.cond:
+            session.busy = False
+            if session.pending is not None:
+                self.cond.notify()
+            return session.closed
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+
+class InferenceServer:
+    """Accepts cameras on a Unix socket and runs their frames on a pool of worker threads."""
+
+    def __init__(self, path=DEFAULT_SOCKET, workers=None, model_complexity=0, quiet=False):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.model_complexity = model_complexity
+        self.quiet = quiet
+        self.scheduler = FrameScheduler()
+        self.started = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self._ids = itertools.count(1)
+        self.sock = None
+        self.running = True
+
+    def start(self):
+        """Import MediaPipe, listen on the socket and start the workers."""
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                vlc.load_hand_tracking().close()  # Imports MediaPipe once, up front
+            finally:
+                sys.stdout = stdout
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        self.sock.listen()
+        threading.Thread(target=self._accept_loop, name="inference-accept", daemon=True).start()
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"inference-worker-{i}", daemon=True).start()
+        if not self.quiet:
+            threading.Thread(target=self._status_loop, name="inference-status", daemon=True).start()
+            print(f"✓ Inference server on {self.path} with {self.workers} workers "
+                  f"(model complexity {self.model_complexity})")
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_camera, args=(conn,), name="inference-camera", daemon=True).start()
+
+    def _serve_camera(self, conn):
+        """Read one camera's messages until it disconnects."""
+        session = None
+        try:
+            message = recv_message(conn)
+            if message is None or message[0].get("type") != "hello":
+                return
+            hello = message[0]
+            session_id = next(self._ids)
+            session = CameraSession(session_id, conn, hello.get("name") or f"camera-{session_id}",
+                                    float(hello.get("slo_ms") or DEFAULT_SLO_MS), hello.get("detection"),
+                                    hello.get("debounce_frames"))
+            self.scheduler.add(session)
+            session.send({"type": "welcome", "client": session.id})
+            if not self.quiet:
+                print(f"📷 {session.name} connected (SLO {session.slo * 1000:g} ms)")
+            while True:
+                message = recv_message(conn)
+                if message is None:
+                    break
+                header, payload = message
+                if header.get("type") == "frame":
+                    height, width = header["shape"]
+                    frame = np.frombuffer(payload, dtype=np.uint8).reshape(height, width, 3)
+                    self.scheduler.submit(session, frame, header)
+                elif header.get("type") == "stats":
+                    session.send(self.stats())
+        except (OSError, ValueError, KeyError) as e:
+            if not self.quiet:
+                print(f"⚠ Camera connection error: {e}")
+        finally:
+            conn.close()
+            if session:
+                if self.scheduler.remove(session) and session.hands:
+                    session.hands.close()
+                if not self.quiet:
+                    print(f"📷 {session.name} disconnected")
+
+    def _worker(self):
+        while True:
+            item = self.scheduler.next()
+            if item is None:
+                return
+            session, (frame, header, arrival) = item
+            try:
+                self._process(session, frame, header, arrival)
+            except Exception as e:
+                print(f"⚠ Inference failed for {session.name}: {e}")
+            if self.scheduler.done(session) and session.hands:
+                session.hands.close()
+
+    def _process(self, session, frame, header, arrival):
+        started = time.perf_counter()
+        if session.hands is None:
+            session.hands = vlc.build_hands(self.model_complexity)
+        results = session.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        landmarks = score = handedness = gesture = confirmed = None
+        if results.multi_hand_landmarks:
+            hand = results.multi_hand_landmarks[0]
+            landmarks = [round(v, 5) for p in hand.landmark for v in (p.x, p.y, p.z)]
+            classification = results.multi_handedness[0].classification[0]
+            score, handedness = round(classification.score, 3), classification.label
+            gesture = vlc.detect_gesture(hand, session.detection)
+            confirmed = vlc.debounce_gesture(gesture, session.history)
+        finished = time.perf_counter()
+        latency = finished - arrival
+        session.processed += 1
+        session.latencies.append(latency)
+        if latency > session.slo:
+            session.slo_misses += 1
+        try:
+            session.send({"type": "result", "id": header.get("id"), "landmarks": landmarks, "score": score,
+                          "handedness": handedness, "gesture": gesture, "confirmed": confirmed,
+                          "queue_ms": round((started - arrival) * 1000, 2),
+                          "infer_ms": round((finished - started) * 1000, 2), "dropped": session.dropped})
+        except OSError:
+            pass  # Camera went away; its reader thread cleans up
+
+    def stats(self):
+        """Server-wide and per-camera counters."""
+        with self.scheduler.cond:
+            sessions = list(self.scheduler.sessions.values())
+        return {
+            "type": "stats", "workers": self.workers, "uptime": time.perf_counter() - self.started,
+            "cpu_seconds": time.process_time() - self.cpu_start,
+            "clients": [session.stats() for session in sessions],
+        }
+
+    def _status_loop(self):
+        previous = {}
+        while self.running:
+            time.sleep(STATS_INTERVAL)
+            clients = self.stats()["clients"]
+            if not clients:
+                continue
+            processed = sum(c["processed"] - previous.get(c["client"], 0) for c in clients)
+            previous = {c["client"]: c["processed"] for c in clients}
+            met = [1 - c["slo_misses"] / c["processed"] for c in clients if c["processed"]]
+            worst = max((c["p95_ms"] or 0) for c in clients)
+            print(f"📊 {len(clients)} cameras, {processed / STATS_INTERVAL:.0f} frames/s, worst p95 {worst:.0f} ms, "
+                  f"SLO met {min(met, default=1) * 100:.0f}% (worst camera)")
+
+    def close(self):
+        self.running = False
+        self.scheduler.stop()
+        if self.sock:
+            self.sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+# =============================================================================
+# CLIENT (capture side)
+# =============================================================================
+
+class InferenceClient:
+    """Connection to an inference server; results arrive on a background thread."""
+
+    def __init__(self, path=DEFAULT_SOCKET, name=None, slo_ms=DEFAULT_SLO_MS, detection=None, debounce_frames=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        hello = {"type": "hello", "name": name or socket.gethostname(), "slo_ms": slo_ms}
+        if detection is not None:
+            hello.update(detection=detection, debounce_frames=debounce_frames)
+        send_message(self.sock, hello)
+        welcome = recv_message(self.sock)
+        if welcome is None or welcome[0].get("type") != "welcome":
+            raise OSError("inference server did not accept the connection")
+        self.client_id = welcome[0]["client"]
+        self.results = deque()  # Result headers, oldest first (drained by the frame loop)
+        self.stats_replies = deque()
+        self.connected = True
+        self._receiver = threading.Thread(target=self._receive_loop, name="inference-client", daemon=True)
+        self._receiver.start()
+
+    def _receive_loop(self):
+        while True:
+            try:
+                message = recv_message(self.sock)
+            except OSError:
+                message = None
+            if message is None:
+                self.connected = False
+                return
+            header = message[0]
+            (self.stats_replies if header.get("type") == "stats" else self.results).append(header)
+
+    def submit(self, frame, frame_id):
+        """Send a (mirrored, BGR) frame for inference."""
+        frame = np.ascontiguousarray(frame)
+        send_message(self.sock, {"type": "frame", "id": frame_id, "shape": frame.shape[:2]}, memoryview(frame).cast("B"))
+
+    def drain(self):
+        """Results received since the last call."""
+        results = []
+        while self.results:
+            results.append(self.results.popleft())
+        return results
+
+    def request_stats(self, timeout=5.0):
+        """Server statistics (blocks until the reply arrives)."""
+        send_message(self.sock, {"type": "stats"})
+        deadline = time.perf_counter() + timeout
+        while not self.stats_replies:
+            if time.perf_counter() > deadline or not self.connected:
+                raise OSError("no stats reply from the inference server")
+            time.sleep(0.01)
+        return self.stats_replies.popleft()
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def draw_landmarks(frame, landmarks):
+    """Draw returned landmarks as dots (the capture side doesn't load MediaPipe)."""
+    h, w = frame.shape[:2]
+    for x, y in zip(landmarks[0::3], landmarks[1::3]):
+        cv2.circle(frame, (int(x * w), int(y * h)), 4, (0, 255, 0), -1)
+
+
+def as_hands_results(result):
+    """A result message shaped like hands.process() output, for the landmark recorder."""
+    if not result["landmarks"]:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    hand = SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in
+                                     np.reshape(result["landmarks"], (21, 3)).tolist()])
+    classification = SimpleNamespace(label=result.get("handedness") or "", score=result["score"] or 0.0)
+    return SimpleNamespace(multi_hand_landmarks=[hand],
+                           multi_handedness=[SimpleNamespace(classification=[classification])])
+
+
+def capture_client_thread(path, name=None, slo_ms=DEFAULT_SLO_MS):
+    """
+    The webcam loop reduced to capture: frames go to the inference server and
+    confirmed gestures that come back drive the devices, as in webcam_processing_thread().
+
+    The hello carries this controller's detection thresholds and debounce
+    length (--user calibration). Metrics, landmark recording, the event log
+    and the profiler hook in as in the local loop; their capture time is the
+    time the result's frame was read, and the "inference" stage is the
+    round trip to the server.
+    """
+    vlc.set_startup_status(f"🔄 Connecting to inference server at {path}...")
+    cap = vlc.open_webcam()
+    if cap is None:
+        vlc.set_startup_status("❌ ERROR: Cannot open webcam!", error=True)
+        vlc.running = False
+        return
+    try:
+        client = InferenceClient(path, name, slo_ms, dict(vlc.DETECTION_PARAMS), vlc.DEBOUNCE_FRAMES)
+    except OSError as e:
+        vlc.set_startup_status(f"❌ Cannot reach inference server at {path}: {e}", error=True)
+        cap.release()
+        vlc.running = False
+        return
+    window_name = 'Virtual LED Controller - Webcam Feed'
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    vlc.set_startup_status("✓ Connected to inference server! Show your hand", ready=True)
+    continuous = None
+    if vlc.CONTINUOUS_CONTROL_ENABLED:
+        import continuous_control
+        from landmark_recorder import ReplayedHand
+        continuous = continuous_control.start_continuous_control(
+            vlc.CONTINUOUS_CONTROLS, vlc.CONTINUOUS_ENGAGE_FRAMES, vlc.CONTINUOUS_SMOOTHING,
+            vlc.CONTINUOUS_LEVEL_STEP, vlc.CONTINUOUS_MIN_LEVEL, vlc.CONTINUOUS_MAX_UPDATES_PER_SEC)
+    speculative = None
+    if vlc.SPECULATIVE_ENABLED:
+        import speculative as speculative_module
+        speculative = speculative_module.start_speculative(vlc.SPECULATIVE_DEVICE_TYPES, vlc.SPECULATIVE_FRAMES,
+                                                           vlc.SPECULATIVE_MIN_CONFIDENCE)
+    metrics = vlc.stage_metrics
+    actuations = metrics.actuations if metrics else None
+    recorder = vlc.landmark_recorder
+    events = vlc.event_log
+    profiler = vlc.runtime_profiler
+    if profiler:
+        profiler.register_thread("webcam", vlc.frame_thread_calls.append)
+    clock = time.perf_counter
+
+    frame_id = 0
+    in_flight = deque()  # (frame id, capture time) of frames without a result yet, oldest first
+    latest = None
+    overlay_version = -1
+    overlay_lines = []
+    fps_start, fps_frames = time.monotonic(), 0
+    while vlc.running and client.connected:
+        try:
+            # Swap in a reloaded gesture_config.json between frames
+            if vlc.pending_config is not None:
+                vlc.apply_pending_config()
+            while vlc.frame_thread_calls:
+                vlc.frame_thread_calls.popleft()()
+
+            frame_start = t = clock()
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                continue
+            capture_ts = clock()
+            if metrics:
+                t = metrics.lap("capture", t)
+            frame = cv2.flip(frame, 1)
+            frame_id += 1
+            client.submit(frame, frame_id)
+            in_flight.append((frame_id, capture_ts))
+            if metrics:
+                t = metrics.lap("convert", t)
+
+            for result in client.drain():
+                # Frames the server dropped (replaced by newer ones) never get a result
+                while in_flight and in_flight[0][0] < result["id"]:
+                    in_flight.popleft()
+                if not in_flight or in_flight[0][0] != result["id"]:
+                    continue
+                _, result_ts = in_flight.popleft()
+                latest = result
+                gesture, confirmed = result["gesture"], result["confirmed"]
+                if metrics:
+                    metrics.lap("inference", result_ts)
+                    actuations.observe(gesture, result_ts)
+                if recorder:
+                    recorder.add(result_ts, as_hands_results(result))
+                if events:
+                    events.observe(gesture, confirmed, result_ts)
+                vlc.telemetry["hand_detected"] = result["landmarks"] is not None
+                if speculative:
+                    speculative.observe(gesture, confirmed, result["score"])
+                if confirmed:
+                    if metrics:
+                        actuations.dispatch(confirmed, result_ts, clock())
+                    vlc.process_gesture_action(confirmed)
+                    if metrics:
+                        actuations.finish()
+                    if events:
+                        events.dispatched()
+                    vlc.telemetry["last_gesture"] = confirmed
+                if continuous:
+                    landmarks = result["landmarks"]
+                    continuous.update(ReplayedHand(np.reshape(landmarks, (21, 3)), 1, 1.0) if landmarks else None)
+            if metrics:
+                t = metrics.lap("actuate", t)
+            fps_frames += 1
+            now = time.monotonic()
+            if now - fps_start >= 1.0:
+                vlc.telemetry["fps"] = round(fps_frames / (now - fps_start), 1)
+                vlc.telemetry["frames"] = frame_id
+                fps_start, fps_frames = now, 0
+
+            if latest and latest["landmarks"] and frame_id - latest["id"] <= 5:
+                draw_landmarks(frame, latest["landmarks"])
+                if latest["confirmed"]:
+                    cv2.putText(frame, f"Gesture: {latest['confirmed'].replace('_', ' ').title()}",
+                                (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            if overlay_version != vlc.state_version:
+                overlay_version, states = vlc.get_device_states()
+                overlay_lines = vlc.build_overlay_lines(states, max_y=frame.shape[0] - 30)
+            vlc.draw_overlay(frame, overlay_lines)
+            level_text = continuous and continuous.overlay_text()
+            if level_text:
+                cv2.putText(frame, level_text, (10, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                            (0, 200, 255), 2)
+            if metrics:
+                t = metrics.lap("overlay", t)
+            cv2.imshow(window_name, frame)
+            key = cv2.waitKey(1) & 0xFF
+            if metrics:
+                metrics.lap("display", t)
+                metrics.end_frame(frame_start)
+            if key == ord('q') or key == 27:
+                break
+            if key == ord('p') and profiler:
+                profiler.toggle()
+        except KeyboardInterrupt:
+            break
+        except OSError as e:
+            print(f"⚠ Lost the inference server: {e}")
+            break
+    if not client.connected:
+        print("⚠ Inference server closed the connection")
+    vlc.running = False
+    if profiler:
+        profiler.unregister_thread("webcam")
+    client.close()
+    cap.release()
+    cv2.destroyAllWindows()
+    if continuous:
+        continuous.report()
+    if speculative:
+        speculative.report()
+    print("✓ Webcam closed")
+
+
+# =============================================================================
+# LOAD GENERATOR
+# =============================================================================
+
+def load_frames(video=None, size=(640, 480), limit=300):
+    """
+    Frames for simulated cameras: from a recorded video, or the benchmark
+    sample frame (a rendered hand showing a peace sign) shifted a little each frame.
+
+    Returns:
+        tuple: (frames, description of where they came from, for the report)
+    """
+    frames = []
+    if video:
+        cap = cv2.VideoCapture(video)
+        while len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.flip(cv2.resize(frame, size), 1))
+        cap.release()
+        if not frames:
+            raise ValueError(f"no frames in {video}")
+        return frames, f"{len(frames)} frames of {video}"
+    image = cv2.resize(cv2.imread(os.path.join(HERE, "benchmarks", "fixtures", "sample_frame.jpg")), size)
+    frames = [np.roll(image, shift, axis=1) for shift in range(0, 60, 2)]
+    return frames, "benchmarks/fixtures/sample_frame.jpg (rendered peace-sign hand), shifted per frame"
+
+
+def simulate_camera(path, frames, fps, duration, slo_ms, name, results):
+    """Send frames at a camera's rate for duration seconds and record result latencies and hands found."""
+    client = InferenceClient(path, name, slo_ms)
+    sent_at = {}
+    latencies = []
+    hands = 0
+    start = next_frame = time.perf_counter()
+    frame_id = 0
+    while time.perf_counter() - start < duration:
+        client.submit(frames[frame_id % len(frames)], frame_id)
+        sent_at[frame_id] = time.perf_counter()
+        frame_id += 1
+        for result in client.drain():
+            latencies.append(time.perf_counter() - sent_at.pop(result["id"]))
+            hands += result["landmarks"] is not None
+        next_frame += 1 / fps
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    end = time.perf_counter() + 2 * slo_ms / 1000
+    while sent_at and time.perf_counter() < end:
+        for result in client.drain():
+            latencies.append(time.perf_counter() - sent_at.pop(result["id"]))
+            hands += result["landmarks"] is not None
+        time.sleep(0.005)
+    client.close()
+    results.append({"name": name, "sent": frame_id, "latencies": latencies, "hands": hands})
+
+
+def run_load(path, clients, frames, fps, duration, slo_ms):
+    """
+    Run simulated cameras against a server.
+
+    Returns:
+        dict: Per-step summary (result rate, latency, SLO attainment, share of results
+              with a hand, server cores used)
+    """
+    probe = InferenceClient(path, "loadgen-probe", slo_ms)
+    before = probe.request_stats()
+    results = []
+    threads = [threading.Thread(target=simulate_camera, args=(path, frames, fps, duration, slo_ms,
+                                                               f"sim-{i}", results), daemon=True)
+               for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    after = probe.request_stats()
+    probe.close()
+
+    slo = slo_ms / 1000
+    on_time_rates = [sum(lat <= slo for lat in r["latencies"]) / r["sent"] for r in results if r["sent"]]
+    latencies = [lat for r in results for lat in r["latencies"]]
+    return {
+        "clients": clients,
+        "results_per_client": len(latencies) / clients / duration,
+        "p50_ms": (percentile(latencies, 0.5) or 0) * 1000,
+        "p95_ms": (percentile(latencies, 0.95) or 0) * 1000,
+        "worst_on_time": min(on_time_rates, default=0.0),
+        "hand_rate": sum(r["hands"] for r in results) / len(latencies) if latencies else 0.0,
+        "served": bool(on_time_rates) and min(on_time_rates) >= SERVED_FRACTION,
+        "server_cores": (after["cpu_seconds"] - before["cpu_seconds"]) / wall,
+        "workers": after["workers"],
+    }
+
+
+def start_server_process(path, workers, model_complexity, timeout=300):
+    """Launch `serve` in a subprocess and wait until it accepts connections."""
+    command = [sys.executable, os.path.abspath(__file__), "serve", "--socket", path, "--quiet",
+               "--model-complexity", str(model_complexity)]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("inference server exited during startup")
+        try:
+            InferenceClient(path, "loadgen-ready").close()
+            return process
+        except OSError:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError("inference server did not start in time")
+
+
+def loadgen(args):
+    frames, source = load_frames(args.video, tuple(int(v) for v in args.size.split("x")))
+    process = None
+    if not os.path.exists(args.socket) or args.spawn:
+        path = args.socket if args.spawn else f"/tmp/gesture-inference-loadgen-{os.getpid()}.sock"
+        print(f"🚀 Starting an inference server ({args.workers or os.cpu_count()} workers)...")
+        process = start_server_process(path, args.workers, args.model_complexity)
+    else:
+        path = args.socket
+    steps = [args.clients]
+    if args.ramp:
+        steps = [1 << i for i in range(args.clients.bit_length())]
+        steps += [] if steps[-1] == args.clients else [args.clients]
+    print(f"📷 Simulated cameras at {args.fps:g} fps, {frames[0].shape[1]}x{frames[0].shape[0]}, "
+          f"SLO {args.slo:g} ms, {args.duration:g}s per step")
+    print(f"   Frames: {source}")
+    print(f"   {'cameras':>7} {'results/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'worst on-time':>14} "
+          f"{'hand found':>11} {'server cores':>13}  served")
+    best = None
+    try:
+        for clients in steps:
+            step = run_load(path, clients, frames, args.fps, args.duration, args.slo)
+            print(f"   {clients:7d} {step['results_per_client']:10.1f} {step['p50_ms']:8.1f} {step['p95_ms']:8.1f} "
+                  f"{step['worst_on_time'] * 100:13.0f}% {step['hand_rate'] * 100:10.0f}% "
+                  f"{step['server_cores']:13.2f}  "
+                  f"{'✓' if step['served'] else '✗'}")
+            if step["served"]:
+                best = step
+            elif args.ramp:
+                break
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    if best:
+        print(f"✓ Served {best['clients']} cameras within the SLO using {best['server_cores']:.2f} cores "
+              f"→ {best['clients'] / max(best['server_cores'], 1e-9):.1f} cameras per core "
+              f"({best['workers']} workers on {os.cpu_count()} CPUs)")
+    else:
+        print("⚠ Not even one camera was served within the SLO")
+    if best and not best["hand_rate"]:
+        print("⚠ No hand was found in any frame - the timings leave out landmark and gesture work")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared hand-inference server for many cameras")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the server")
+    serve.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    serve.add_argument("--workers", type=int, help="Worker threads (default: all cores)")
+    serve.add_argument("--model-complexity", type=int, default=0, choices=[0, 1])
+    serve.add_argument("--quiet", action="store_true", help="No connection or status messages")
+    load = sub.add_parser("loadgen", help="Measure how many cameras a server handles")
+    load.add_argument("--socket", default=DEFAULT_SOCKET,
+                      help="Server to load (one is started if nothing listens there)")
+    load.add_argument("--spawn", action="store_true", help="Always start a fresh server at --socket")
+    load.add_argument("--workers", type=int, help="Workers for a started server")
+    load.add_argument("--model-complexity", type=int, default=0, choices=[0, 1])
+    load.add_argument("--clients", type=int, default=4, help="Simulated cameras (maximum with --ramp)")
+    load.add_argument("--ramp", action="store_true", help="Step 1, 2, 4 ... cameras until the SLO breaks")
+    load.add_argument("--fps", type=float, default=30.0, help="Frames per second per camera")
+    load.add_argument("--slo", type=float, default=DEFAULT_SLO_MS, help="Latency SLO in ms")
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds per step")
+    load.add_argument("--video", help="Recorded video to send (default: the benchmark sample frame)")
+    load.add_argument("--size", default="640x480", help="Frame size sent")
+    args = parser.parse_args()
+
+    if args.command == "loadgen":
+        loadgen(args)
+        return
+    server = InferenceServer(args.socket, args.workers, args.model_complexity, args.quiet)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        print("\n✓ Inference server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Landmark Recorder and Replayer for Virtual LED Controller
+=========================================================
+
+Captures what MediaPipe saw so field issues can be reproduced offline.
+
+A recording is a directory of flat little-endian column files plus a small
+JSON header, so every column can be memory-mapped straight into numpy:
+
+    meta.json            Format version, start time, gesture config in use
+                         (plus the frame of every hot-reloaded config change)
+    frame_time.f8        float64  Capture time of each frame (s since start)
+    frame_hands.u1       uint8    Hands detected in each frame
+    hand_frame.u4        uint32   Frame index of each detected hand
+    hand_side.u1         uint8    Handedness: 0 = Left, 1 = Right, 255 = unknown
+    hand_score.f4        float32  Handedness score
+    hand_landmarks.f4    float32  21 x 3 normalized landmarks per hand
+
+MediaPipe reports landmarks as float32, so storing them as float32 is
+lossless: replayed landmarks are exactly the values the live classifier saw.
+
+Recording: the frame thread only copies the landmarks into a small array
+and hands them to a writer thread, which appends to the column files.
+If the controller is killed, columns are cut to the last complete frame
+on read.
+
+Replaying resets the controller's gesture and device state, then feeds
+each hand through detect_gesture → debounce_gesture →
+process_gesture_action, the same calls the live frame loop makes. The
+gesture config stored with the recording is used. Replay runs unlimited
+or at a multiple of real time. Each run ends with a SHA-256 digest of
+every raw gesture, confirmation and device change, so two runs can be
+checked for bit-identical results.
+
+Usage: python virtual_led_controller.py --record session.lmrec
+       python landmark_recorder.py info session.lmrec
+       python landmark_recorder.py replay session.lmrec [--speed 1.0] [--current-config]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+NUM_LANDMARKS = 21
+SIDES = {"Left": 0, "Right": 1}
+SIDE_NAMES = {0: "Left", 1: "Right", 255: None}
+
+# Column name → (dtype, values per row)
+FRAME_COLUMNS = {"frame_time": ("<f8", 1), "frame_hands": ("u1", 1)}
+HAND_COLUMNS = {"hand_frame": ("<u4", 1), "hand_side": ("u1", 1), "hand_score": ("<f4", 1),
+                "hand_landmarks": ("<f4", NUM_LANDMARKS * 3)}
+SUFFIXES = {"<f8": "f8", "u1": "u1", "<u4": "u4", "<f4": "f4"}
+
+Landmark = namedtuple("Landmark", "x y z")
+
+
+def column_path(path, name, dtype):
+    return os.path.join(path, f"{name}.{SUFFIXES[dtype]}")
+
+
+# =============================================================================
+# RECORDER
+# =============================================================================
+
+class LandmarkRecorder:
+    """
+    Appends MediaPipe results to a recording from the live frame loop.
+
+    add() runs on the frame thread and only copies landmarks into arrays;
+    file writes happen on a background writer thread.
+    """
+
+    def __init__(self, path, gestures=None, scenes=None, debounce_frames=None, device_ids=None, detection=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.start = time.perf_counter()
+        self.frames = 0
+        self.hands = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._files = {name: open(column_path(path, name, dtype), 'wb')
+                       for name, (dtype, _) in {**FRAME_COLUMNS, **HAND_COLUMNS}.items()}
+        self.meta = {
+            "format": FORMAT_VERSION,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "gestures": dict(gestures or {}),
+            "scenes": dict(scenes or {}),
+            "debounce_frames": debounce_frames,
+            "detection": dict(detection or {}),  # DETECTION_PARAMS (per-user calibration)
+            "device_ids": device_ids or [],
+            "config_changes": [],  # [frame index, gestures, scenes] for configs swapped in mid-recording
+        }
+        self._last_config = (self.meta["gestures"], self.meta["scenes"])
+        self._write_meta()
+        self._writer = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+        self._writer.start()
+
+    def add(self, capture_time, results):
+        """
+        Record one frame's MediaPipe results.
+
+        Args:
+            capture_time: perf_counter() time the frame was captured
+            results: Return value of hands.process()
+        """
+        if self._closed:
+            return
+        hands = []
+        if results.multi_hand_landmarks:
+            handedness = results.multi_handedness or []
+            for i, landmarks in enumerate(results.multi_hand_landmarks):
+                points = np.array([(p.x, p.y, p.z) for p in landmarks.landmark], dtype=np.float32)
+                side, score = 255, 0.0
+                if i < len(handedness):
+                    classification = handedness[i].classification[0]
+                    side, score = SIDES.get(classification.label, 255), classification.score
+                hands.append((side, score, points))
+        self._queue.put((capture_time - self.start, hands))
+
+    def on_config_change(self, gestures, scenes):
+        """Config listener: note a hot-reloaded config so replay switches at the same frame."""
+        if not self._closed:
+            self._queue.put({"gestures": dict(gestures), "scenes": dict(scenes)})
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, "meta.json"), 'w') as f:
+            json.dump(self.meta, f, indent=2)
+
+    def _write_loop(self):
+        files = self._files
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, dict):
+                config = (item["gestures"], item["scenes"])
+                if config != self._last_config:  # Rejected reloads re-announce the current config
+                    self._last_config = config
+                    self.meta["config_changes"].append([self.frames, *config])
+                    self._write_meta()
+                continue
+            frame_time, hands = item
+            # Hand rows first: a frame row only exists once all of its hands are written
+            for side, score, points in hands:
+                files["hand_frame"].write(struct.pack("<I", self.frames))
+                files["hand_side"].write(struct.pack("<B", side))
+                files["hand_score"].write(struct.pack("<f", score))
+                files["hand_landmarks"].write(points.astype("<f4", copy=False).tobytes())
+            files["frame_hands"].write(struct.pack("<B", len(hands)))
+            files["frame_time"].write(struct.pack("<d", frame_time))
+            self.frames += 1
+            self.hands += len(hands)
+        for f in files.values():
+            f.close()
+
+    def close(self):
+        """Flush queued frames and close the recording (safe to call twice)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        print(f"✓ Recorded {self.frames} frames ({self.hands} hands) to {self.path}")
+
+
+def start_recording(path):
+    """
+    Start recording the live pipeline, with the current gesture config.
+
+    Returns:
+        LandmarkRecorder: Pass to the frame loop; close() at shutdown
+    """
+    import virtual_led_controller as vlc
+
+    recorder = LandmarkRecorder(path, gestures=vlc.GESTURE_TO_LED, scenes=vlc.SCENES,
+                                debounce_frames=vlc.DEBOUNCE_FRAMES, device_ids=list(vlc.DEVICE_CONFIG),
+                                detection=vlc.DETECTION_PARAMS)
+    vlc.add_config_listener(recorder.on_config_change)
+    print(f"✓ Recording landmarks to {path}")
+    return recorder
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+class ReplayedHand:
+    """One recorded hand, shaped like a MediaPipe NormalizedLandmarkList."""
+
+    __slots__ = ("landmark", "side", "score")
+
+    def __init__(self, points, side, score):
+        self.landmark = [Landmark(*p) for p in points.tolist()]
+        self.side = SIDE_NAMES.get(side)
+        self.score = score
+
+
+class LandmarkRecording:
+    """Memory-mapped, read-only view of a recording."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording format: {self.meta.get('format')}")
+        columns = {}
+        for name, (dtype, width) in {**FRAME_COLUMNS, **HAND_COLUMNS}.items():
+            file = column_path(path, name, dtype)
+            rows = os.path.getsize(file) // (np.dtype(dtype).itemsize * width)
+            data = np.memmap(file, dtype=dtype, mode='r', shape=(rows * width,)) if rows else np.zeros(0, dtype)
+            columns[name] = data.reshape(rows, NUM_LANDMARKS, 3) if width > 1 else data
+
+        # Cut to the last complete frame (the controller may have been killed mid-write,
+        # and each column file is flushed on its own)
+        frames = min(len(columns[name]) for name in FRAME_COLUMNS)
+        hands_written = min(len(columns[name]) for name in HAND_COLUMNS)
+        hands_needed = np.cumsum(columns["frame_hands"][:frames], dtype=np.int64)
+        frames = int(np.searchsorted(hands_needed, hands_written, side='right'))
+        hands = int(hands_needed[frames - 1]) if frames else 0
+        self.frame_time = columns["frame_time"][:frames]
+        self.frame_hands = columns["frame_hands"][:frames]
+        self.hand_frame = columns["hand_frame"][:hands]
+        self.hand_side = columns["hand_side"][:hands]
+        self.hand_score = columns["hand_score"][:hands]
+        self.hand_landmarks = columns["hand_landmarks"][:hands]
+        self.hand_start = np.concatenate(([0], np.cumsum(self.frame_hands, dtype=np.int64)))
+
+    def __len__(self):
+        return len(self.frame_time)
+
+    @property
+    def duration(self):
+        return float(self.frame_time[-1]) if len(self) else 0.0
+
+    def frame(self, index):
+        """
+        Hands recorded for one frame.
+
+        Returns:
+            list: ReplayedHand objects (empty when no hand was visible)
+        """
+        start, end = self.hand_start[index], self.hand_start[index + 1]
+        return [ReplayedHand(self.hand_landmarks[i], int(self.hand_side[i]), float(self.hand_score[i]))
+                for i in range(start, end)]
+
+
+# =============================================================================
+# REPLAYER
+# =============================================================================
+
+def replay(path, speed=None, use_recorded_config=True, quiet=True, on_frame=None):
+    """
+    Feed a recording through the classifier, debounce and dispatch path.
+
+    Args:
+        path: Recording directory
+        speed: None for unlimited, or a multiple of real time (1.0 = as recorded)
+        use_recorded_config: Use the gesture mappings, scenes and debounce
+                             length stored with the recording
+        quiet: Hide the controller's per-toggle console output
+        on_frame: Optional callback(index, events) after each frame
+
+    Returns:
+        dict: Frames, hands, gestures, actuations, elapsed seconds and the digest
+    """
+    import virtual_led_controller as vlc
+
+    recording = LandmarkRecording(path)
+    meta = recording.meta
+    config_changes = {}
+    if use_recorded_config:
+        if meta["gestures"]:
+            vlc.GESTURE_TO_LED = dict(meta["gestures"])
+            vlc.SCENES = {name: dict(changes) for name, changes in meta["scenes"].items()}
+        if meta["debounce_frames"]:
+            vlc.DEBOUNCE_FRAMES = meta["debounce_frames"]
+        vlc.DETECTION_PARAMS.update(meta.get("detection", {}))
+        config_changes = {frame: (gestures, scenes) for frame, gestures, scenes in meta.get("config_changes", [])}
+    missing = [device_id for device_id in meta["device_ids"] if device_id not in vlc.DEVICE_CONFIG]
+    if missing:
+        print(f"⚠ Devices in the recording but not configured here: {', '.join(missing)}")
+    vlc.reset_pipeline_state()
+
+    changes_seen = []
+
+    def on_change(version, changes):
+        changes_seen.append(changes)
+
+    digest = hashlib.sha256()
+    stats = {"frames": len(recording), "hands": 0, "gestures": 0, "actuations": 0}
+    vlc.add_device_listener(on_change)
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    start = time.perf_counter()
+    try:
+        with output:
+            for index in range(len(recording)):
+                if speed:
+                    delay = start + float(recording.frame_time[index]) / speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                if index in config_changes:
+                    gestures, scenes = config_changes[index]
+                    vlc.GESTURE_TO_LED, vlc.SCENES = dict(gestures), dict(scenes)
+                events = []
+                for hand in recording.frame(index):
+                    stats["hands"] += 1
+                    gesture = vlc.detect_gesture(hand)
+                    confirmed = vlc.debounce_gesture(gesture)
+                    if confirmed:
+                        vlc.process_gesture_action(confirmed)
+                    if gesture:
+                        stats["gestures"] += 1
+                    events.append((gesture, confirmed, changes_seen[:]))
+                    stats["actuations"] += len(changes_seen)
+                    changes_seen.clear()
+                digest.update(json.dumps([index, events], sort_keys=True).encode('utf-8'))
+                if on_frame:
+                    on_frame(index, events)
+    finally:
+        vlc.remove_device_listener(on_change)
+    stats["elapsed"] = time.perf_counter() - start
+    stats["digest"] = digest.hexdigest()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay landmark recordings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info_parser = sub.add_parser("info", help="Summarize a recording")
+    info_parser.add_argument("path")
+    replay_parser = sub.add_parser("replay", help="Replay a recording through the gesture pipeline")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--speed", type=float, help="Multiple of real time (default: unlimited)")
+    replay_parser.add_argument("--current-config", action="store_true",
+                               help="Use gesture_config.json instead of the config stored with the recording")
+    replay_parser.add_argument("--verbose", action="store_true", help="Show every device change")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        recording = LandmarkRecording(args.path)
+        print(f"📼 {args.path} (started {recording.meta['started']})")
+        print(f"   {len(recording)} frames over {recording.duration:.1f}s, "
+              f"{len(recording.hand_frame)} hands, debounce {recording.meta['debounce_frames']} frames, "
+              f"{len(recording.meta.get('config_changes', []))} config changes")
+        return
+
+    if args.current_config:
+        import virtual_led_controller as vlc
+        vlc.load_custom_gestures()
+    stats = replay(args.path, speed=args.speed, use_recorded_config=not args.current_config,
+                   quiet=not args.verbose)
+    print(f"▶ Replayed {stats['frames']} frames ({stats['hands']} hands) in {stats['elapsed']:.2f}s "
+          f"({stats['frames'] / max(stats['elapsed'], 1e-9):.0f} frames/s)")
+    print(f"   {stats['gestures']} gesture frames, {stats['actuations']} actuations")
+    print(f"   Digest: {stats['digest']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""
+Memory Monitor for Virtual LED Controller
+=========================================
+
+Opt-in memory tracking for sessions that run for days or weeks. Every
+MEMORY_INTERVAL seconds the monitor records:
+
+    RSS                 Resident set size of the whole process
+    traced:<subsystem>  Python heap from tracemalloc, grouped by where the
+                        allocation happened (controller, mediapipe, tkinter,
+                        opencv_numpy, dashboard, tooling, other)
+    native              RSS minus the traced Python heap: MediaPipe's graph,
+                        OpenCV buffers, Tcl/Tk - memory tracemalloc can't see
+    gauge:<name>        Object counts that should stay flat (Tk images and
+                        canvas items, sprite cache entries, listeners, ...)
+
+A series is flagged as leaking when it rose in at least 90% of the steps
+over the last window of samples (10 by default) and grew by more than noise (1 MB for
+memory, 5% for counts). Each flag prints a warning and dumps a tracemalloc
+snapshot so the allocation sites can be compared later.
+
+Output (in MEMORY_DIR):
+
+    memory_log.csv          One row per series per sample
+    top_sites.jsonl         Top allocation sites per sample, plus the sites
+                            that grew most since the first post-warm-up sample
+    snapshot-<time>-<n>.tracemalloc
+                            Periodic, on each leak flag and at shutdown
+                            (n counts snapshots, so two in one second differ)
+
+tracemalloc slows allocation-heavy Python code and each sample pauses the
+process briefly while the snapshot is taken, so the monitor is off unless
+asked for. RSS uses psutil when installed, else /proc (Linux).
+
+Usage: python virtual_led_controller.py --memory
+       python memory_monitor.py soak session.lmrec --duration 8h [--inference]
+       python memory_monitor.py diff memory/snapshot-A.tracemalloc memory/snapshot-B.tracemalloc
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Allocation sites → subsystem, first match wins (paths use forward slashes)
+SUBSYSTEMS = (
+    ("mediapipe", ("/mediapipe/", "/google/protobuf/")),
+    ("tkinter", ("/tkinter/",)),
+    ("opencv_numpy", ("/cv2/", "/numpy/")),
+    ("controller", ("virtual_led_controller.py",)),
+    ("dashboard", ("web_dashboard.py", "/http/", "/socketserver.py")),
+    ("tooling", ("pipeline_metrics.py", "landmark_recorder.py", "runtime_profiler.py",
+                 "memory_monitor.py", "synthetic_hands.py")),
+)
+
+CSV_FIELDS = ["timestamp", "elapsed_s", "series", "value"]
+MB = 1024 * 1024
+RISING_FRACTION = 0.9  # Share of steps in the window that must rise to flag growth
+MIN_GROWTH_BYTES = 1 * MB  # Growth over the window below this is noise
+MIN_GROWTH_FRACTION = 0.05  # Same for counts: at least 5% (and at least 1)
+
+
+def current_rss():
+    """Resident set size of this process in bytes (None if it can't be read here)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def subsystem_of(filename):
+    """Map an allocation site's file to a subsystem name."""
+    path = filename.replace("\\", "/")
+    for name, patterns in SUBSYSTEMS:
+        if any(pattern in path for pattern in patterns):
+            return name
+    return "other"
+
+
+def is_growing(values, min_growth):
+    """
+    Check a window of samples for steady growth.
+
+    Args:
+        values: Samples, oldest first
+        min_growth: Smallest total rise (last - first) that counts
+
+    Returns:
+        bool: True if nearly every step rose and the total rise is real
+    """
+    steps = [b - a for a, b in zip(values, values[1:])]
+    if not steps:
+        return False
+    rising = sum(1 for step in steps if step > 0)
+    return values[-1] - values[0] >= min_growth and rising >= RISING_FRACTION * len(steps)
+
+
+def site_label(trace_stat):
+    """file:line for a tracemalloc Statistic/StatisticDiff."""
+    frame = trace_stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+# =============================================================================
+# MONITOR
+# =============================================================================
+
+class MemoryMonitor:
+    """
+    Periodic RSS + tracemalloc sampler with per-series growth detection.
+
+    Gauges are callables returning a number; register them with add_gauge().
+    A gauge that raises (e.g. the GUI has closed) is skipped for that sample.
+    """
+
+    def __init__(self, output_dir="memory", interval=60.0, top_n=15, trace_frames=1, window=10, warmup=3,
+                 snapshot_every=30):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_n = top_n
+        self.trace_frames = trace_frames
+        self.window = window
+        self.warmup = warmup
+        self.snapshot_every = snapshot_every
+        self.gauges = {}
+        self.history = {}  # Series → recent values (after warm-up), at most window long
+        self.first = {}  # Series → first post-warm-up value
+        self.last = {}
+        self.flagged = {}  # Series → growth per hour when it was flagged (cleared when it levels off)
+        self.alerts = []  # Every flag raised: (elapsed seconds, series, growth per hour)
+        self.samples = 0
+        self.snapshots = 0
+        self.baseline = None  # First post-warm-up tracemalloc snapshot
+        self.started = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+
+    def add_gauge(self, name, fn):
+        """Track a count that should stay flat, e.g. Tk canvas items."""
+        with self._lock:
+            self.gauges[name] = fn
+
+    def start(self, background=True):
+        """Start tracemalloc and, if background, the sampling thread."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        self.started = time.monotonic()
+        if background:
+            self._thread = threading.Thread(target=self._sample_loop, name="memory-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠ Memory monitor: sample failed: {e}")
+
+    def sample(self):
+        """
+        Take one measurement of every series, log it and check for growth.
+
+        Returns:
+            dict: Series → value for this sample
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        traced = {name: 0 for name, _ in SUBSYSTEMS}
+        traced["other"] = 0
+        for stat in snapshot.statistics("filename"):
+            traced[subsystem_of(stat.traceback[0].filename)] += stat.size
+
+        values = {}
+        rss = current_rss()
+        if rss is not None:
+            values["rss_mb"] = rss / MB
+            untraced = rss - tracemalloc.get_traced_memory()[0] - tracemalloc.get_tracemalloc_memory()
+            values["native_mb"] = untraced / MB
+        values["traced_mb"] = sum(traced.values()) / MB
+        for name, size in traced.items():
+            values[f"traced:{name}_mb"] = size / MB
+        values["gauge:python_objects"] = len(gc.get_objects())
+        with self._lock:
+            gauges = list(self.gauges.items())
+        for name, fn in gauges:
+            try:
+                values[f"gauge:{name}"] = fn()
+            except Exception:
+                pass
+
+        with self._lock:
+            self.samples += 1
+            elapsed = time.monotonic() - self.started
+            self.last = values
+            warm = self.samples > self.warmup
+            if warm and self.baseline is None:
+                self.baseline = snapshot
+            new_flags = self._check_growth(values, elapsed) if warm else []
+
+        self._write_log(elapsed, values)
+        self._write_sites(elapsed, snapshot)
+        for series, per_hour in new_flags:
+            unit = "MB" if series.endswith("_mb") else "objects"
+            print(f"⚠ Memory: {series} has grown steadily for {self.window} samples "
+                  f"(+{per_hour:.2f} {unit}/hour)")
+        if new_flags or (self.snapshot_every and self.samples % self.snapshot_every == 0):
+            self.dump_snapshot(snapshot)
+        return values
+
+    def _check_growth(self, values, elapsed):
+        new_flags = []
+        for series, value in values.items():
+            self.first.setdefault(series, (elapsed, value))
+            history = self.history.setdefault(series, [])
+            history.append((elapsed, value))
+            del history[:-self.window]
+            if len(history) < self.window:
+                continue
+            samples = [v for _, v in history]
+            min_growth = (MIN_GROWTH_BYTES / MB if series.endswith("_mb")
+                          else max(1, MIN_GROWTH_FRACTION * abs(samples[0])))
+            if is_growing(samples, min_growth):
+                if series not in self.flagged:
+                    span = history[-1][0] - history[0][0]
+                    per_hour = (samples[-1] - samples[0]) / span * 3600 if span > 0 else 0.0
+                    self.flagged[series] = per_hour
+                    self.alerts.append((elapsed, series, per_hour))
+                    new_flags.append((series, per_hour))
+            else:
+                self.flagged.pop(series, None)  # Levelled off; flag again if it resumes
+        return new_flags
+
+    def _write_log(self, elapsed, values):
+        path = os.path.join(self.output_dir, "memory_log.csv")
+        new_file = not os.path.exists(path)
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(CSV_FIELDS)
+            for series, value in values.items():
+                writer.writerow([timestamp, round(elapsed, 1), series, round(value, 3)])
+
+    def _write_sites(self, elapsed, snapshot):
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_s": round(elapsed, 1),
+            "top": [{"site": site_label(stat), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:self.top_n]],
+        }
+        if self.baseline is not None and self.baseline is not snapshot:
+            record["growth"] = [
+                {"site": site_label(stat), "size_diff_kb": round(stat.size_diff / 1024, 1),
+                 "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(self.baseline, "lineno")[:self.top_n] if stat.size_diff > 0
+            ]
+        with open(os.path.join(self.output_dir, "top_sites.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def dump_snapshot(self, snapshot=None):
+        """Write a tracemalloc snapshot to disk; returns its path."""
+        snapshot = snapshot or tracemalloc.take_snapshot().filter_traces(self._filters)
+        with self._lock:
+            self.snapshots += 1
+            number = self.snapshots
+        path = os.path.join(self.output_dir, f"snapshot-{time.strftime('%Y%m%d-%H%M%S')}-{number:03d}.tracemalloc")
+        snapshot.dump(path)
+        return path
+
+    def report(self):
+        """Summary of every series: first and last value, and any growth flags."""
+        with self._lock:
+            first, last, alerts, samples = dict(self.first), dict(self.last), list(self.alerts), self.samples
+        elapsed = time.monotonic() - self.started
+        lines = ["\n" + "=" * 70, "🧠 MEMORY MONITOR", "=" * 70,
+                 f"  {samples} samples over {elapsed / 3600:.2f} h → {self.output_dir}"]
+        if first:
+            lines.append(f"  {'series':32} {'first':>10} {'last':>10} {'change':>10}")
+            for series, value in last.items():
+                start = first.get(series, (0, value))[1]
+                mark = "  ⚠" if any(series == s for _, s, _ in alerts) else ""
+                lines.append(f"  {series:32} {start:10.2f} {value:10.2f} {value - start:+10.2f}{mark}")
+        if alerts:
+            lines.append("-" * 70)
+            for at, series, per_hour in alerts:
+                lines.append(f"  ⚠ {series} growing at {at / 60:.1f} min (+{per_hour:.2f}/hour)")
+        else:
+            lines.append("  ✓ No steady growth detected")
+        lines.append("=" * 70)
+        return "\n".join(lines)
+
+    def stop(self):
+        """Stop sampling, take a final sample and snapshot, and print the report."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.sample()
+        path = self.dump_snapshot()
+        print(self.report())
+        print(f"✓ Final tracemalloc snapshot: {path}")
+
+
+def start_monitor(output_dir, interval, top_n, trace_frames=1):
+    """
+    Create and start the controller's memory monitor with its standard gauges.
+
+    Returns:
+        MemoryMonitor: Running monitor; the GUI adds its own gauges; stop() at shutdown
+    """
+    import virtual_led_controller as vlc
+
+    monitor = MemoryMonitor(output_dir, interval, top_n, trace_frames)
+    monitor.add_gauge("device_listeners", lambda: len(vlc.device_listeners))
+    monitor.add_gauge("config_listeners", lambda: len(vlc.config_listeners))
+    monitor.add_gauge("frame_thread_calls", lambda: len(vlc.frame_thread_calls))
+    monitor.start()
+    rss = "RSS via psutil" if psutil else ("RSS via /proc" if current_rss() is not None
+                                            else "no RSS here (pip install psutil)")
+    print(f"✓ Memory monitor every {interval:g}s ({rss}) → {output_dir}")
+    return monitor
+
+
+# =============================================================================
+# SOAK TEST
+# =============================================================================
+
+def parse_duration(text):
+    """Parse "90", "30m", "8h" or "2d" into seconds."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if text[-1:] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def soak(recording, duration, interval, output_dir, speed=None, inference=False, top_n=15):
+    """
+    Replay a landmark recording in a loop under the memory monitor.
+
+    Every replayed frame runs detection, debounce and device actuation, and
+    redraws the overlay on a copy of the benchmark sample frame. With
+    inference, the MediaPipe model also processes that frame once per
+    replayed frame, so its result objects churn as in the live loop.
+
+    Returns:
+        MemoryMonitor: The stopped monitor (its alerts list is empty if nothing grew)
+    """
+    import cv2
+    import numpy as np
+    import landmark_recorder
+    import virtual_led_controller as vlc
+
+    sample_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures",
+                               "sample_frame.jpg")
+    base_frame = cv2.imread(sample_path)
+    if base_frame is None:
+        base_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    rgb = cv2.cvtColor(base_frame, cv2.COLOR_BGR2RGB)
+    hands = vlc.load_hand_tracking() if inference else None
+    state = {"version": -1, "lines": []}
+
+    def on_frame(index, events):
+        if hands is not None:
+            hands.process(rgb)
+        if state["version"] != vlc.state_version:
+            state["version"], states = vlc.get_device_states()
+            state["lines"] = vlc.build_overlay_lines(states, max_y=base_frame.shape[0] - 30)
+        vlc.draw_overlay(base_frame.copy(), state["lines"])
+
+    monitor = MemoryMonitor(output_dir, interval, top_n)
+    monitor.add_gauge("device_listeners", lambda: len(vlc.device_listeners))
+    monitor.add_gauge("config_listeners", lambda: len(vlc.config_listeners))
+    monitor.start()
+    print(f"🧪 Soaking {recording} for {duration / 3600:.2f} h "
+          f"({'with' if inference else 'without'} inference, sample every {interval:g}s)")
+    end = time.monotonic() + duration
+    passes = frames = 0
+    try:
+        while time.monotonic() < end:
+            stats = landmark_recorder.replay(recording, speed=speed, on_frame=on_frame)
+            passes += 1
+            frames += stats["frames"]
+    except KeyboardInterrupt:
+        print("\n⏹  Soak interrupted")
+    finally:
+        if hands is not None:
+            hands.close()
+    print(f"✓ {passes} replays, {frames} frames")
+    monitor.stop()
+    return monitor
+
+
+def diff_snapshots(old_path, new_path, limit=20):
+    """Top allocation sites that grew between two snapshot files."""
+    old = tracemalloc.Snapshot.load(old_path)
+    new = tracemalloc.Snapshot.load(new_path)
+    lines = [f"{'size diff':>12} {'count diff':>11}  site"]
+    for stat in new.compare_to(old, "lineno")[:limit]:
+        lines.append(f"{stat.size_diff / 1024:+10.1f} KB {stat.count_diff:+11d}  {site_label(stat)}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory soak tests and snapshot comparison")
+    sub = parser.add_subparsers(dest="command", required=True)
+    soak_parser = sub.add_parser("soak", help="Replay a recording in a loop under the memory monitor")
+    soak_parser.add_argument("recording", help="Landmark recording directory (landmark_recorder.py)")
+    soak_parser.add_argument("--duration", default="1h", help="How long to run: seconds or 30m / 8h / 2d")
+    soak_parser.add_argument("--interval", type=float, default=30.0, help="Seconds between memory samples")
+    soak_parser.add_argument("--speed", type=float, help="Replay speed (default: as fast as possible)")
+    soak_parser.add_argument("--inference", action="store_true",
+                             help="Also run the MediaPipe model on the sample frame every replayed frame")
+    soak_parser.add_argument("--output", default="memory_soak", help="Directory for logs and snapshots")
+    diff_parser = sub.add_parser("diff", help="Compare two tracemalloc snapshots")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    diff_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        print(diff_snapshots(args.old, args.new, args.limit))
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    monitor = soak(args.recording, parse_duration(args.duration), args.interval, args.output,
+                   speed=args.speed, inference=args.inference)
+    if monitor.alerts:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
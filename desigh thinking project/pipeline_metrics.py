@@ -0,0 +1,522 @@
+"""
+Pipeline Latency Metrics for Virtual LED Controller
+===================================================
+
+Per-stage timing for webcam_processing_thread. Each stage of the frame loop
+(capture, colour conversion, hand inference, gesture detection, debounce,
+device actuation, overlay drawing, display) is timed with the monotonic
+perf_counter clock and recorded into a fixed-memory HDR-style histogram.
+
+Every METRICS_INTERVAL seconds the current window is closed and exported:
+
+    CSV log       One row per stage: p50 / p95 / p99 / max in ms, plus fps
+    GET /metrics  Prometheus text format on localhost (summary per stage
+                  plus a pipeline fps gauge)
+
+End-to-end gesture latency is tracked per actuation: every frame is stamped
+when capture returns it, and the first frame of a gesture (onset), debounce
+confirmation, dispatch and the device state commit are correlated into one
+record. End-to-end time is split into:
+
+    debounce wait   onset frame captured → confirming frame captured
+    frame compute   confirming frame captured → gesture confirmed
+    actuation       confirmed → device state committed
+
+Records are appended to a CSV log and summarised in the /metrics output and
+at shutdown.
+
+Recording a sample is one clock read, a few integer operations and a list
+increment (well under a microsecond), so a full frame costs a few
+microseconds - far below 1% of a 33 ms frame. When metrics are disabled the
+frame loop only checks a local None per stage.
+
+Usage: python virtual_led_controller.py --metrics
+       python pipeline_metrics.py          (measure instrumentation overhead)
+       python pipeline_metrics.py --actuations actuation_latency.csv
+                                           (latency report from a recorded log)
+"""
+
+import argparse
+import csv
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Frame-loop stages, in pipeline order ("frame" is the whole iteration)
+STAGES = ("capture", "convert", "inference", "landmarks", "detect",
+          "debounce", "actuate", "overlay", "display", "frame")
+
+CSV_FIELDS = ["timestamp", "stage", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "fps"]
+QUANTILES = (0.5, 0.95, 0.99)
+
+# End-to-end latency split, in report order (end_to_end = the sum of the rest)
+ACTUATION_COMPONENTS = ("end_to_end", "debounce_wait", "frame_compute", "actuation")
+ACTUATION_FIELDS = ["timestamp", "gesture", "devices", "frames"] + [f"{c}_ms" for c in ACTUATION_COMPONENTS]
+
+
+# =============================================================================
+# HISTOGRAM
+# =============================================================================
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear histogram of durations (HDR histogram layout).
+
+    Values are stored in whole microseconds. Values below 2**SUB_BITS get
+    exact buckets; above that each power of two is split into
+    2**(SUB_BITS - 1) linear buckets, so every reported value is within
+    1/2**(SUB_BITS - 1) (under 1.6%) of the true value. Memory is fixed at
+    BUCKETS counters no matter how many samples are recorded. Durations above
+    about 67 s are clamped to the top bucket.
+    """
+
+    SUB_BITS = 7
+    MAX_BITS = 26  # 2**26 µs ≈ 67 s
+    HALF_BITS = SUB_BITS - 1
+    BUCKETS = (MAX_BITS - SUB_BITS + 2) << HALF_BITS
+    HIGHEST = (1 << MAX_BITS) - 1
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0
+
+    def record(self, seconds):
+        """Add one duration, in seconds."""
+        value = int(seconds * 1000000)
+        if value > self.HIGHEST:
+            value = self.HIGHEST
+        elif value < 0:
+            value = 0
+        shift = value.bit_length() - self.SUB_BITS
+        if shift <= 0:
+            self.counts[value] += 1
+        else:
+            self.counts[(shift << self.HALF_BITS) + (value >> shift)] += 1
+        self.count += 1
+        self.total += seconds
+        if value > self.max:
+            self.max = value
+
+    @classmethod
+    def bucket_upper(cls, index):
+        """Highest microsecond value that falls into bucket `index`."""
+        if index < (1 << cls.SUB_BITS):
+            return index
+        shift = (index >> cls.HALF_BITS) - 1
+        top = index - (shift << cls.HALF_BITS)
+        return ((top + 1) << shift) - 1
+
+    def percentile(self, fraction):
+        """
+        Value at the given quantile, in microseconds.
+
+        Args:
+            fraction: Quantile between 0 and 1 (0.99 = p99)
+
+        Returns:
+            int: Upper edge of the bucket holding that sample (capped at the max seen)
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(fraction * self.count + 0.999999))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, quantiles and max in milliseconds."""
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(0.5) / 1000,
+            "p95_ms": self.percentile(0.95) / 1000,
+            "p99_ms": self.percentile(0.99) / 1000,
+            "max_ms": self.max / 1000,
+        }
+
+
+# =============================================================================
+# END-TO-END ACTUATION LATENCY
+# =============================================================================
+
+class ActuationTracker:
+    """
+    Correlates gesture onset, confirmation, dispatch and state commit.
+
+    The frame thread calls observe() with every raw gesture and the capture
+    time of its frame, then dispatch() / finish() around
+    process_gesture_action(). on_device_change() is registered as a device
+    listener; a state change published on the dispatching thread between
+    dispatch() and finish() is the commit for that actuation. Repeated
+    gestures and actions that change nothing produce no record.
+    """
+
+    def __init__(self, csv_path=None):
+        self.csv_path = csv_path
+        self.histograms = {component: LatencyHistogram() for component in ACTUATION_COMPONENTS}
+        self.records = 0
+        self._gesture = None  # Gesture of the current unbroken run of frames
+        self._onset = 0.0  # Capture time of the run's first frame
+        self._run_frames = 0
+        self._pending = None  # [gesture, confirm frame capture time, confirm time, thread, devices, commit time]
+
+    def observe(self, gesture, capture_ts):
+        """Track the raw gesture of one frame (None when no hand is visible)."""
+        if gesture != self._gesture or not self._run_frames:
+            self._gesture = gesture
+            self._onset = capture_ts
+            self._run_frames = 0
+        self._run_frames += 1
+
+    def dispatch(self, gesture, capture_ts, confirm_ts):
+        """Mark that `gesture`, confirmed on the frame captured at `capture_ts`, is being dispatched."""
+        self._pending = [gesture, capture_ts, confirm_ts, threading.get_ident(), [], None]
+
+    def on_device_change(self, version, changes):
+        """Device listener: timestamp the commit of a pending actuation."""
+        pending = self._pending
+        if pending is not None and pending[3] == threading.get_ident():
+            if pending[5] is None:
+                pending[5] = time.perf_counter()
+            pending[4].extend(changes)
+
+    def finish(self):
+        """
+        Close the pending dispatch.
+
+        Returns:
+            dict: Latency record in ms, or None if no device state changed
+        """
+        pending, self._pending = self._pending, None
+        if pending is None or pending[5] is None:
+            return None
+        gesture, capture_ts, confirm_ts, _, devices, commit_ts = pending
+        onset = self._onset if gesture == self._gesture else capture_ts
+        seconds = {
+            "end_to_end": commit_ts - onset,
+            "debounce_wait": capture_ts - onset,
+            "frame_compute": confirm_ts - capture_ts,
+            "actuation": commit_ts - confirm_ts,
+        }
+        for component, value in seconds.items():
+            self.histograms[component].record(value)
+        self.records += 1
+        record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "gesture": gesture,
+                  "devices": " ".join(devices), "frames": self._run_frames,
+                  **{f"{c}_ms": round(v * 1000, 3) for c, v in seconds.items()}}
+        if self.csv_path:
+            self.write_csv(record)
+        return record
+
+    def write_csv(self, record):
+        """Append one actuation record to the CSV log."""
+        is_new = not os.path.exists(self.csv_path)
+        try:
+            with open(self.csv_path, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=ACTUATION_FIELDS)
+                if is_new:
+                    writer.writeheader()
+                writer.writerow(record)
+        except OSError as e:
+            print(f"⚠ Could not write actuation log: {e}")
+
+    def report(self):
+        """Text report of end-to-end latency split into debounce wait and compute."""
+        return format_actuation_report({c: h.summary() for c, h in self.histograms.items()})
+
+
+def format_actuation_report(summaries):
+    """
+    Format actuation latency summaries as a table.
+
+    Args:
+        summaries: component -> LatencyHistogram.summary()-style dict
+
+    Returns:
+        str: Report lines
+    """
+    count = summaries["end_to_end"]["count"]
+    lines = [f"🎯 Gesture → device latency ({count} actuations)"]
+    labels = {"end_to_end": "End to end", "debounce_wait": "  Debounce wait",
+              "frame_compute": "  Frame compute", "actuation": "  Actuation"}
+    for component in ACTUATION_COMPONENTS:
+        summary = summaries[component]
+        lines.append(f"  {labels[component]:16} p50 {summary['p50_ms']:8.2f} ms | p95 {summary['p95_ms']:8.2f} ms"
+                     f" | p99 {summary['p99_ms']:8.2f} ms | max {summary['max_ms']:8.2f} ms")
+    return "\n".join(lines)
+
+
+def report_actuation_log(path):
+    """Build the latency report from an actuation CSV log."""
+    histograms = {component: LatencyHistogram() for component in ACTUATION_COMPONENTS}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            for component in ACTUATION_COMPONENTS:
+                histograms[component].record(float(row[f"{component}_ms"]) / 1000)
+    return format_actuation_report({c: h.summary() for c, h in histograms.items()})
+
+
+# =============================================================================
+# PIPELINE METRICS
+# =============================================================================
+
+class PipelineMetrics:
+    """
+    Per-stage latency histograms for the frame loop, exported in windows.
+
+    The frame thread calls lap() after each stage and end_frame() at the end
+    of an iteration. An exporter thread closes the window every `interval`
+    seconds by swapping in fresh histograms, so the frame thread never waits
+    on export.
+    """
+
+    def __init__(self, stages=STAGES, interval=10.0, csv_path=None, host="127.0.0.1", port=None,
+                 actuation_csv=None):
+        self.stages = tuple(stages)
+        self.interval = interval
+        self.csv_path = csv_path
+        self.host = host
+        self.port = port
+        self.clock = time.perf_counter
+        self._active = {stage: LatencyHistogram() for stage in self.stages}
+        self._frames = 0
+        self._window_start = self.clock()
+        self.latest = {}  # stage -> summary of the last closed window
+        self.totals = {stage: [0, 0.0] for stage in self.stages}  # stage -> [count, seconds] since start
+        self.fps = 0.0
+        self.actuations = ActuationTracker(actuation_csv)
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def lap(self, stage, start):
+        """
+        Record the time since `start` for `stage`.
+
+        Returns:
+            float: The current clock reading, to use as the next stage's start
+        """
+        now = self.clock()
+        self._active[stage].record(now - start)
+        return now
+
+    def end_frame(self, start):
+        """Record a whole frame-loop iteration that began at `start`."""
+        now = self.clock()
+        self._active["frame"].record(now - start)
+        self._frames += 1
+        return now
+
+    def rotate(self):
+        """
+        Close the current window and export it.
+
+        Returns:
+            dict: stage -> summary for the closed window (stages with samples only)
+        """
+        now = self.clock()
+        closed, self._active = self._active, {stage: LatencyHistogram() for stage in self.stages}
+        frames, self._frames = self._frames, 0
+        elapsed, self._window_start = now - self._window_start, now
+        self.fps = round(frames / elapsed, 1) if elapsed > 0 else 0.0
+
+        latest = {}
+        for stage, histogram in closed.items():
+            if not histogram.count:
+                continue
+            latest[stage] = histogram.summary()
+            totals = self.totals[stage]
+            totals[0] += histogram.count
+            totals[1] += histogram.total
+        self.latest = latest
+        if self.csv_path:
+            self.write_csv(latest)
+        return latest
+
+    def write_csv(self, latest):
+        """Append one row per stage for the last window to the CSV log."""
+        is_new = not os.path.exists(self.csv_path)
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        try:
+            with open(self.csv_path, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                if is_new:
+                    writer.writeheader()
+                for stage, summary in latest.items():
+                    writer.writerow({"timestamp": timestamp, "stage": stage, "fps": self.fps,
+                                     **{k: (round(v, 3) if k != "count" else v) for k, v in summary.items()}})
+        except OSError as e:
+            print(f"⚠ Could not write metrics log: {e}")
+
+    def prometheus_text(self):
+        """Render the last window in Prometheus text exposition format."""
+        lines = [
+            "# HELP gesture_stage_latency_seconds Frame-loop stage latency (last window)",
+            "# TYPE gesture_stage_latency_seconds summary",
+        ]
+        latest = self.latest
+        for stage in self.stages:
+            summary = latest.get(stage)
+            if summary:
+                for quantile in QUANTILES:
+                    value = summary[f"p{int(quantile * 100)}_ms"] / 1000
+                    lines.append(f'gesture_stage_latency_seconds{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+            count, total = self.totals[stage]
+            lines.append(f'gesture_stage_latency_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'gesture_stage_latency_seconds_count{{stage="{stage}"}} {count}')
+        lines += [
+            "# HELP gesture_pipeline_fps Frames processed per second (last window)",
+            "# TYPE gesture_pipeline_fps gauge",
+            f"gesture_pipeline_fps {self.fps}",
+            "# HELP gesture_actuation_latency_seconds Gesture onset to device state commit, by component",
+            "# TYPE gesture_actuation_latency_seconds summary",
+        ]
+        for component, histogram in self.actuations.histograms.items():
+            if histogram.count:
+                for quantile in QUANTILES:
+                    value = histogram.percentile(quantile) / 1e6
+                    lines.append(f'gesture_actuation_latency_seconds{{component="{component}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'gesture_actuation_latency_seconds_sum{{component="{component}"}} {histogram.total:.6f}')
+            lines.append(f'gesture_actuation_latency_seconds_count{{component="{component}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    # -------------------------------------------------------------------------
+    # Exporter thread and HTTP endpoint
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the window exporter and, if a port is set, the /metrics endpoint."""
+        self._thread = threading.Thread(target=self._export_loop, name="metrics", daemon=True)
+        self._thread.start()
+        if self.port is not None:
+            metrics = self
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus_text().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self
+
+    def _export_loop(self):
+        while not self._stop.wait(self.interval):
+            self.rotate()
+
+    def stop(self):
+        """Stop exporting and flush the final partial window."""
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread:
+            self._thread.join(1.0)
+        self.rotate()
+        if self.actuations.records:
+            print(self.actuations.report())
+
+
+def start_metrics(csv_path, host, port, interval, actuation_csv=None):
+    """
+    Create and start pipeline metrics for the controller.
+
+    Args:
+        csv_path: CSV log file (None to skip the log)
+        host: Interface for the /metrics endpoint
+        port: Port for the /metrics endpoint (None to skip it)
+        interval: Seconds per export window
+        actuation_csv: CSV log of per-actuation latency records (None to skip)
+
+    Returns:
+        PipelineMetrics: Running metrics; pass to the frame loop
+    """
+    import virtual_led_controller as vlc
+
+    metrics = PipelineMetrics(interval=interval, csv_path=csv_path, host=host, port=port,
+                              actuation_csv=actuation_csv).start()
+    vlc.add_device_listener(metrics.actuations.on_device_change)
+    where = [path for path in (csv_path, actuation_csv) if path]
+    if metrics.port is not None:
+        where.append(f"http://{host}:{metrics.port}/metrics")
+    print(f"✓ Pipeline metrics every {interval:g}s → {', '.join(where) or 'memory only'}")
+    return metrics
+
+
+# =============================================================================
+# OVERHEAD CHECK
+# =============================================================================
+
+def measure_overhead(frames=200000):
+    """
+    Time the instrumentation of one frame (one lap per stage plus end_frame).
+
+    Returns:
+        tuple: (µs per instrumented frame, µs per frame for the disabled None checks)
+    """
+    metrics = PipelineMetrics()
+    stages = [stage for stage in STAGES if stage != "frame"]
+    clock = time.perf_counter
+
+    start = clock()
+    for _ in range(frames):
+        t0 = t = clock()
+        for stage in stages:
+            t = metrics.lap(stage, t)
+        metrics.end_frame(t0)
+    enabled = (clock() - start) / frames * 1e6
+
+    disabled_metrics = None
+    start = clock()
+    for _ in range(frames):
+        if disabled_metrics:
+            pass
+        for stage in stages:
+            if disabled_metrics:
+                pass
+        if disabled_metrics:
+            pass
+    disabled = (clock() - start) / frames * 1e6
+    return enabled, disabled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline metrics tools")
+    parser.add_argument("--actuations", metavar="CSV",
+                        help="Print the gesture latency report from an actuation log instead")
+    args = parser.parse_args()
+
+    if args.actuations:
+        print(report_actuation_log(args.actuations))
+        return
+
+    enabled, disabled = measure_overhead()
+    print("\n" + "=" * 60)
+    print("⏱  PIPELINE METRICS OVERHEAD")
+    print("=" * 60)
+    print(f"  Enabled : {enabled:6.2f} µs/frame ({enabled / 33333 * 100:.3f}% of a 30 fps frame)")
+    print(f"  Disabled: {disabled:6.2f} µs/frame (None checks only, includes loop cost)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Idle Power Save for Virtual LED Controller
+==========================================
+
+When nobody is at the camera, the frame loop runs hand tracking 30 times a
+second for nothing. This module is a small state machine that avoids that:
+
+    active   Full pipeline at the camera's rate. When no hand has been seen
+             for IDLE_AFTER_SECONDS the capture switches to IDLE_CAPTURE_SIZE,
+             the camera is asked for IDLE_FPS frames a second (CAP_PROP_FPS)
+             and the state goes to idle.
+    idle     IDLE_FPS frames a second; each frame is only compared with the
+             previous one (80x60 grayscale difference, well under a millisecond).
+             Hand tracking, gesture detection and overlays are skipped.
+             When enough pixels change, the capture size and frame rate are
+             restored and the state goes back to active. The waking frame
+             itself goes through hand tracking, so a gesture that starts the
+             movement is not lost.
+
+Many cameras only offer a few frame rates and ignore others. If the camera
+doesn't report the lower rate back, the loop keeps reading at the camera's
+rate and waits between motion checks instead.
+
+Wake-up latency is measured from the moment motion is seen to the first
+frame tracked at full resolution (this includes the camera changing size).
+The worst case, one idle frame interval plus the wake-up, must stay within
+IDLE_WAKE_BUDGET_MS. If it doesn't, power save first keeps the full capture
+settings while idle (some cameras take long to switch size or rate), and then
+raises the idle check rate.
+
+Time and process CPU (MediaPipe runs its own threads) are accounted per state. The summary at shutdown
+(and in telemetry) shows the CPU seconds saved compared with staying active.
+
+Usage: python virtual_led_controller.py --power-save
+       python power_save.py                          (cost of an idle frame vs. an active one)
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+import virtual_led_controller as vlc
+
+MOTION_SIZE = (80, 60)  # Frames are compared at this size
+MOTION_PIXEL_DELTA = 25  # Grey-level change that counts a pixel as changed
+SETTLE_FRAMES = 2  # Frames ignored after switching capture size (exposure settles)
+
+
+class PowerSave:
+    """
+    Active / idle state machine for the frame loop (all methods run on the frame thread).
+    """
+
+    def __init__(self, idle_after, idle_fps, idle_size, motion_fraction, wake_budget_ms, clock=time.perf_counter):
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.idle_size = idle_size
+        self.motion_fraction = motion_fraction
+        self.wake_budget = wake_budget_ms / 1000
+        self.clock = clock
+        self.idle = False
+        self.resize_when_idle = idle_size is not None
+        self.slow_when_idle = True  # Ask the camera for the idle frame rate
+        self.active_size = None  # Capture size to restore on wake-up
+        self.active_fps = None  # Capture frame rate to restore on wake-up
+        self.camera_paced = False  # The camera delivers frames at the idle rate itself
+        self.last_hand = clock()
+        self.wake_latencies = []
+        self._previous = None
+        self._settle = 0
+        self._waking_since = None  # Motion time while waiting for a full-resolution frame
+        self._restore_pending = False
+        # Per state: [wall seconds, process CPU seconds, entries]
+        self.totals = {"active": [0.0, 0.0, 1], "idle": [0.0, 0.0, 0]}
+        self._state_start = (clock(), time.process_time())
+
+    @property
+    def state(self):
+        return "idle" if self.idle else "active"
+
+    def _switch(self, idle):
+        """Close the current state's time and CPU and enter the other state."""
+        now, cpu = self.clock(), time.process_time()
+        totals = self.totals[self.state]
+        totals[0] += now - self._state_start[0]
+        totals[1] += cpu - self._state_start[1]
+        self._state_start = (now, cpu)
+        self.idle = idle
+        self.totals[self.state][2] += 1
+        vlc.telemetry["power_state"] = self.state
+
+    def observe(self, hand_seen, cap):
+        """
+        After each tracked frame: note hands, finish a wake-up, or go idle.
+
+        Args:
+            hand_seen: Whether the frame had a hand
+            cap: Webcam capture (resized when going idle)
+        """
+        now = self.clock()
+        if hand_seen:
+            self.last_hand = now
+        if self._waking_since is not None:
+            if self._restore_pending:
+                # The waking frame was captured with idle settings: switch back for the next one
+                self._restore_pending = False
+                if self.active_size:
+                    self._set_size(cap, self.active_size)
+                if self.active_fps:
+                    cap.set(cv2.CAP_PROP_FPS, self.active_fps)
+                self.active_size = self.active_fps = None
+                self.camera_paced = False
+                return
+            self._finish_wake(now - self._waking_since)
+        elif now - self.last_hand >= self.idle_after:
+            self._switch(True)
+            self._previous = None
+            self._settle = 0
+            if self.resize_when_idle:
+                self.active_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                self._set_size(cap, self.idle_size)
+                self._settle = SETTLE_FRAMES
+            if self.slow_when_idle:
+                self._slow_down(cap)
+
+    def wake_on_motion(self, frame):
+        """
+        While idle: check a frame for motion.
+
+        Returns:
+            bool: True to wake (run this frame through the full pipeline),
+                  False to stay idle
+        """
+        small = cv2.cvtColor(cv2.resize(frame, MOTION_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        previous, self._previous = self._previous, small
+        if self._settle:
+            self._settle -= 1
+            return False
+        if previous is None:
+            return False
+        changed = np.count_nonzero(cv2.absdiff(small, previous) > MOTION_PIXEL_DELTA)
+        if changed < self.motion_fraction * small.size:
+            return False
+        self._switch(False)
+        self.last_hand = self.clock()  # Give the newcomer a full IDLE_AFTER_SECONDS
+        self._waking_since = self.clock()
+        self._restore_pending = bool(self.active_size or self.active_fps)
+        return True
+
+    def _finish_wake(self, latency):
+        self._waking_since = None
+        self.wake_latencies.append(latency)
+        worst = self.idle_interval + latency
+        vlc.telemetry["power_wake_ms"] = round(latency * 1000, 1)
+        if worst <= self.wake_budget:
+            return
+        if self.resize_when_idle or self.slow_when_idle:
+            self.resize_when_idle = self.slow_when_idle = False
+            print(f"ℹ Power save: waking took {latency * 1000:.0f} ms, over the "
+                  f"{self.wake_budget * 1000:.0f} ms budget - keeping full capture settings while idle")
+        elif self.idle_interval > 1 / 30:
+            self.idle_interval = max(1 / 30, self.idle_interval / 2)
+            print(f"ℹ Power save: waking took {latency * 1000:.0f} ms - idle checks now "
+                  f"{1 / self.idle_interval:.0f} per second")
+
+    def _set_size(self, cap, size):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+
+    def _slow_down(self, cap):
+        """Ask the camera for the idle frame rate; remember the rate to restore."""
+        active_fps = cap.get(cv2.CAP_PROP_FPS)
+        idle_fps = 1.0 / self.idle_interval
+        if active_fps <= idle_fps:
+            return  # Unknown (0) or already slow enough
+        self.active_fps = active_fps
+        cap.set(cv2.CAP_PROP_FPS, idle_fps)
+        self.camera_paced = 0 < cap.get(cv2.CAP_PROP_FPS) <= idle_fps + 0.5
+
+    def idle_wait_ms(self):
+        """How long the idle loop waits for a key before the next motion check."""
+        if self.camera_paced:
+            return 1  # Reading the next frame already waits one idle interval
+        return max(1, round(self.idle_interval * 1000))
+
+    def idle_view(self, frame):
+        """The idle frame (mirrored like the live view) with a power-save notice."""
+        frame = cv2.flip(frame, 1)
+        cv2.putText(frame, "Power save - move to wake", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2)
+        return frame
+
+    def summary(self):
+        """
+        Time, CPU and wake-ups per state so far.
+
+        Returns:
+            dict: Per-state wall/CPU seconds and CPU share, wake-up latencies,
+                  and CPU seconds saved versus staying active
+        """
+        now, cpu = self.clock(), time.process_time()
+        totals = {state: list(values) for state, values in self.totals.items()}
+        totals[self.state][0] += now - self._state_start[0]
+        totals[self.state][1] += cpu - self._state_start[1]
+        states = {state: {"seconds": wall, "cpu_seconds": used, "cpu_share": used / wall if wall else None,
+                          "entries": entries}
+                  for state, (wall, used, entries) in totals.items()}
+        active, idle = states["active"], states["idle"]
+        saved = None
+        if active["cpu_share"] is not None and idle["seconds"]:
+            saved = max(0.0, idle["seconds"] * active["cpu_share"] - idle["cpu_seconds"])
+        wakes = sorted(self.wake_latencies)
+        summary = {
+            "states": states,
+            "wake_ups": len(wakes),
+            "wake_p50_ms": wakes[len(wakes) // 2] * 1000 if wakes else None,
+            "wake_max_ms": wakes[-1] * 1000 if wakes else None,
+            "cpu_seconds_saved": saved,
+        }
+        vlc.telemetry["power_cpu_saved_s"] = None if saved is None else round(saved, 1)
+        return summary
+
+    def report(self):
+        """Print the time and CPU spent per state."""
+        summary = self.summary()
+        parts = []
+        for state, values in summary["states"].items():
+            share = "-" if values["cpu_share"] is None else f"{values['cpu_share'] * 100:.0f}% CPU"
+            parts.append(f"{state} {format_seconds(values['seconds'])} ({share})")
+        line = f"💤 Power save: {', '.join(parts)}"
+        if summary["wake_ups"]:
+            line += (f"; {summary['wake_ups']} wake-ups (p50 {summary['wake_p50_ms']:.0f} ms, "
+                     f"max {summary['wake_max_ms']:.0f} ms)")
+        if summary["cpu_seconds_saved"] is not None:
+            line += f"; ~{summary['cpu_seconds_saved']:.0f} CPU-seconds saved"
+        print(line)
+
+
+def format_seconds(seconds):
+    """'1h 02m', '3m 20s' or '12s'."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def start_power_save(idle_after, idle_fps, idle_size, motion_fraction, wake_budget_ms):
+    """
+    Create the idle state machine for the frame loop.
+
+    Returns:
+        PowerSave: Pass to the frame loop; report() at shutdown
+    """
+    power = PowerSave(idle_after, idle_fps, idle_size, motion_fraction, wake_budget_ms)
+    vlc.telemetry["power_state"] = power.state
+    size = f"{idle_size[0]}x{idle_size[1]}, " if idle_size else ""
+    print(f"✓ Power save after {idle_after:g}s without a hand ({size}{idle_fps:g} fps motion checks)")
+    return power
+
+
+def measure_costs(frames=50):
+    """
+    CPU cost of an active frame (tracking) and an idle one (motion check).
+
+    Returns:
+        tuple: (active seconds per frame, idle seconds per frame)
+    """
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "sample_frame.jpg")
+    frame = cv2.imread(sample)
+    hands = vlc.load_hand_tracking()
+    vlc.run_warmup(hands, frame.shape[1], frame.shape[0])
+    start = time.process_time()
+    for _ in range(frames):
+        hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    active = (time.process_time() - start) / frames
+    hands.close()
+
+    power = PowerSave(0, 5, None, 1.0, 1000)
+    power.idle = True
+    small = cv2.resize(frame, (320, 240))
+    start = time.process_time()
+    for _ in range(frames * 20):
+        power.wake_on_motion(small)
+    idle = (time.process_time() - start) / (frames * 20)
+    return active, idle
+
+
+def main():
+    argparse.ArgumentParser(description="Compare the CPU cost of active and idle frames").parse_args()
+    active, idle = measure_costs()
+    print(f"   Active frame (hand tracking): {active * 1000:8.2f} ms CPU")
+    print(f"   Idle frame (motion check):    {idle * 1000:8.3f} ms CPU")
+    print(f"   Idle at {vlc.IDLE_FPS:g} fps uses ~{idle * vlc.IDLE_FPS * 100:.2f}% of a core "
+          f"vs ~{active * 30 * 100:.0f}% when tracking at 30 fps")
+
+
+if __name__ == "__main__":
+    main()
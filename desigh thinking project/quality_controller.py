@@ -0,0 +1,260 @@
+"""
+Adaptive Quality Control for Virtual LED Controller
+===================================================
+
+Picks MediaPipe's model complexity and the capture resolution while the
+controller runs (QUALITY_LEVELS, cheapest first), based on what the frame
+loop measures:
+
+    inference latency   p90 of hands.process() over the last QUALITY_WINDOW frames
+    hand confidence     mean handedness score of the frames with a hand
+
+At the end of each window one decision is made on the frame thread (sorting
+QUALITY_WINDOW floats):
+
+    p90 above QUALITY_MAX_INFERENCE_MS       step down one level
+    p90 below STEP_UP_HEADROOM x budget      step up one level
+                                             (LOW_CONFIDENCE_HEADROOM when hands
+                                             are seen with low confidence; a
+                                             bigger model helps most there)
+
+The next level's Hands instance is built and warmed up at its resolution on a
+background thread, while the frame loop keeps using the current one. Once the
+new instance is ready, the loop calls swap() between frames. That changes the
+capture size and a reference, and the old instance is closed in the background.
+A faster machine therefore ends up with the accurate model, and a slower one
+keeps its frame rate.
+
+Some levels turn out too slow: the loop steps down from them, or they miss the
+budget during warm-up. Such a level is not tried again for BACKOFF_SECONDS, and
+the wait doubles each time, so the controller settles instead of oscillating.
+If the camera ignores a smaller capture size, frames are shrunk before inference
+instead.
+
+Usage: python virtual_led_controller.py --adaptive-quality
+       python quality_controller.py          (time every level on this machine)
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import cv2
+
+import virtual_led_controller as vlc
+
+STEP_UP_HEADROOM = 0.5  # Step up only if p90 inference uses under half the budget...
+LOW_CONFIDENCE_HEADROOM = 0.75  # ...or under 75% of it while hand confidence is low
+MIN_HAND_FRAMES = 0.2  # Fraction of a window that needs a hand before confidence counts
+BACKOFF_SECONDS = 60.0  # First wait before retrying a level that was too slow (doubles)
+
+
+def describe_level(level):
+    """'complexity 1, 640x480' for a (model_complexity, width, height) level."""
+    complexity, width, height = level
+    return f"complexity {complexity}, {width}x{height}"
+
+
+class QualityController:
+    """
+    Steps between quality levels from per-frame inference latency and hand confidence.
+
+    observe() and swap() run on the frame thread; building and warming up
+    Hands instances runs on a background thread.
+    """
+
+    def __init__(self, levels, level, max_inference_ms, min_confidence, window):
+        self.levels = list(levels)
+        self.level = level
+        self.max_inference = max_inference_ms / 1000
+        self.min_confidence = min_confidence
+        self.window = window
+        self.latencies = []
+        self.confidences = []
+        self.pending = None  # (level, Hands, reason) ready for swap()
+        self.resize = None  # (width, height) to shrink frames to when the camera ignores the capture size
+        self.switches = 0
+        self._building = False
+        self._blocked = {}  # Level → (monotonic time it may be retried, last backoff)
+        self._closed = False
+        self._update_telemetry()
+
+    def observe(self, seconds, results):
+        """
+        Record one inference (frame thread).
+
+        Args:
+            seconds: Time hands.process() took
+            results: Its results (handedness scores give the confidence)
+        """
+        self.latencies.append(seconds)
+        if results.multi_handedness:
+            self.confidences.append(results.multi_handedness[0].classification[0].score)
+        if len(self.latencies) >= self.window:
+            self._decide()
+
+    def _decide(self):
+        latencies = sorted(self.latencies)
+        p90 = latencies[int(len(latencies) * 0.9)]
+        confidence = (sum(self.confidences) / len(self.confidences)
+                      if self.confidences and len(self.confidences) >= MIN_HAND_FRAMES * len(latencies) else None)
+        self.latencies, self.confidences = [], []
+        vlc.telemetry["quality_inference_p90_ms"] = round(p90 * 1000, 1)
+        vlc.telemetry["quality_confidence"] = None if confidence is None else round(confidence, 3)
+        if self._building or self.pending:
+            return
+
+        if p90 > self.max_inference and self.level > 0:
+            self._block(self.level)
+            self._start_build(self.level - 1, f"inference p90 {p90 * 1000:.0f} ms > {self.max_inference * 1000:.0f} ms")
+            return
+        up = self.level + 1
+        if up >= len(self.levels) or self._blocked.get(up, (0, 0))[0] > time.monotonic():
+            return
+        low_confidence = confidence is not None and confidence < self.min_confidence
+        headroom = LOW_CONFIDENCE_HEADROOM if low_confidence else STEP_UP_HEADROOM
+        if p90 < headroom * self.max_inference:
+            reason = f"inference p90 {p90 * 1000:.0f} ms"
+            if low_confidence:
+                reason += f", hand confidence {confidence:.2f}"
+            self._start_build(up, reason)
+
+    def _block(self, level):
+        """Don't step up to a level for a while (doubling each time it is blocked)."""
+        backoff = self._blocked.get(level, (0, BACKOFF_SECONDS / 2))[1] * 2
+        self._blocked[level] = (time.monotonic() + backoff, backoff)
+
+    def _start_build(self, level, reason):
+        self._building = True
+        threading.Thread(target=self._build, args=(level, reason), name="quality-build", daemon=True).start()
+
+    def _build(self, level, reason):
+        """Create and warm up the Hands instance for a level (background thread)."""
+        complexity, width, height = self.levels[level]
+        try:
+            hands = vlc.build_hands(complexity)
+            steady = vlc.run_warmup(hands, width, height)[-1]
+        except Exception as e:
+            print(f"⚠ Could not build quality level ({describe_level(self.levels[level])}): {e}")
+            self._block(level)
+            self._building = False
+            return
+        if level > self.level and steady > self.max_inference:
+            hands.close()
+            self._block(level)
+            print(f"ℹ Staying at {describe_level(self.levels[self.level])}: "
+                  f"{describe_level(self.levels[level])} needs {steady * 1000:.0f} ms per frame")
+        elif self._closed:
+            hands.close()
+        else:
+            self.pending = (level, hands, reason)
+        self._building = False
+
+    def swap(self, hands, cap):
+        """
+        Switch to the pending level between frames (frame thread).
+
+        Args:
+            hands: Hands instance in use (closed in the background)
+            cap: Webcam capture, resized to the new level
+
+        Returns:
+            mp_hands.Hands: Instance to use from now on
+        """
+        level, new_hands, reason = self.pending
+        self.pending = None
+        _, width, height = self.levels[level]
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        actual = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.resize = (width, height) if actual[0] > width else None
+        threading.Thread(target=hands.close, name="quality-close", daemon=True).start()
+
+        arrow = "↑" if level > self.level else "↓"
+        self.level = level
+        self.switches += 1
+        self.latencies, self.confidences = [], []
+        self._update_telemetry(self.resize or actual)
+        note = f", camera gives {actual[0]}x{actual[1]}" if actual != (width, height) and not self.resize else ""
+        print(f"⚙ Quality {arrow} {describe_level(self.levels[level])} ({reason}{note})")
+        return new_hands
+
+    def _update_telemetry(self, size=None):
+        complexity, width, height = self.levels[self.level]
+        width, height = size or (width, height)
+        vlc.telemetry.update(quality_level=self.level, model_complexity=complexity,
+                             inference_size=f"{width}x{height}", quality_switches=self.switches)
+
+    def close(self):
+        """Release a built but not yet swapped-in Hands instance."""
+        self._closed = True
+        pending, self.pending = self.pending, None
+        if pending:
+            pending[1].close()
+
+
+def start_quality_controller(levels, width, height, max_inference_ms, min_confidence, window):
+    """
+    Start adapting quality from the level matching the current pipeline.
+
+    Args:
+        levels: (model_complexity, width, height) levels, cheapest first
+        width: Current capture width (model complexity 0 assumed)
+        height: Current capture height
+
+    Returns:
+        QualityController: Pass to the frame loop
+    """
+    current = (0, width, height)
+    if current in levels:
+        level = levels.index(current)
+    else:
+        level = min(range(len(levels)), key=lambda i: (levels[i][0], abs(levels[i][1] * levels[i][2] - width * height)))
+    controller = QualityController(levels, level, max_inference_ms, min_confidence, window)
+    print(f"✓ Adaptive quality: starting at {describe_level(levels[level])}, "
+          f"inference budget {max_inference_ms:g} ms")
+    return controller
+
+
+def time_levels(levels, frames=30):
+    """
+    Measure steady inference latency of every level on this machine.
+
+    Returns:
+        list: (level, p50 seconds, p90 seconds) per level
+    """
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "sample_frame.jpg")
+    image = cv2.imread(sample)
+    vlc.load_hand_tracking().close()
+    timings = []
+    for level in levels:
+        complexity, width, height = level
+        rgb = cv2.cvtColor(cv2.resize(image, (width, height)), cv2.COLOR_BGR2RGB)
+        hands = vlc.build_hands(complexity)
+        vlc.run_warmup(hands, width, height)
+        latencies = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            hands.process(rgb)
+            latencies.append(time.perf_counter() - start)
+        hands.close()
+        latencies.sort()
+        timings.append((level, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.9)]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every quality level on this machine")
+    parser.add_argument("--frames", type=int, default=30, help="Timed inferences per level")
+    args = parser.parse_args()
+
+    budget = vlc.QUALITY_MAX_INFERENCE_MS / 1000
+    print(f"⏱ Timing {len(vlc.QUALITY_LEVELS)} quality levels (budget {vlc.QUALITY_MAX_INFERENCE_MS:g} ms)...")
+    for level, p50, p90 in time_levels(vlc.QUALITY_LEVELS, args.frames):
+        verdict = "✓ fits" if p90 <= budget else "✗ over budget"
+        print(f"   {describe_level(level):24} p50 {p50 * 1000:6.1f} ms   p90 {p90 * 1000:6.1f} ms   {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+"""
+On-Demand Profiler for Virtual LED Controller
+=============================================
+
+Look inside a running controller without restarting it. A profiling session
+is started and stopped at runtime by any of:
+
+    'p' key       In the webcam window (toggles the default mode)
+    SIGUSR1       kill -USR1 <pid> (toggles the default mode; not on Windows)
+    Control port  python runtime_profiler.py start|stop|status [--mode M]
+                  (line commands on 127.0.0.1:PROFILER_PORT)
+
+Two modes:
+
+    sample    A background thread snapshots every thread's stack with
+              sys._current_frames() every few milliseconds. Low overhead,
+              covers all threads (webcam, GUI, config watcher, dashboard...).
+              Written as collapsed stacks ("thread;outer;...;leaf count"),
+              ready for flamegraph.pl, speedscope or inferno.
+    cprofile  Deterministic cProfile in the webcam and GUI threads (cProfile
+              only sees the thread that enabled it, so each thread is asked
+              to enable its own profiler between frames / Tk events). Exact
+              call counts, but slows the profiled threads while it runs.
+              Written as .pstats files: one per thread plus a combined one.
+
+Output goes to PROFILER_DIR as profile-<YYYYmmdd-HHMMSS>-<mode>.<ext>.
+
+When no session is running nothing is hooked: no sampler thread, no profile
+function, no tracing. The frame loop checks one empty deque per frame for
+work handed to it, and the control port waits in accept().
+
+Usage: python virtual_led_controller.py --profile
+       python runtime_profiler.py start --mode cprofile
+       python runtime_profiler.py stop
+       python runtime_profiler.py report profiles/profile-...-sample.collapsed
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter
+
+MODES = ("sample", "cprofile")
+DEFAULT_PORT = 9109
+STOP_TIMEOUT = 2.0  # Seconds to wait for each thread to hand back its cProfile data
+
+
+def timestamped_path(output_dir, mode):
+    """Build the output prefix profile-<time>-<mode> in output_dir."""
+    return os.path.join(output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{mode}")
+
+
+def frame_label(code):
+    """Collapsed-stack label for one code object: function (file:line)."""
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+# =============================================================================
+# SAMPLING PROFILER
+# =============================================================================
+
+class SamplingSession:
+    """Samples every thread's Python stack at a fixed interval."""
+
+    mode = "sample"
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()  # (thread ident, code objects outermost → leaf) -> samples
+        self.names = {}  # Thread ident -> name, refreshed when a new thread shows up
+        self.samples = 0
+        self.started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        stacks = self.stacks
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident not in self.names:
+                    self.names = {t.ident: t.name for t in threading.enumerate()}
+                if ident == own or self.names.get(ident, "").startswith("profiler-"):
+                    continue  # The profiler's own threads (control port, writer) are just noise
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                stacks[ident, tuple(codes)] += 1
+            self.samples += 1
+
+    def stop(self):
+        """Ask the sampler to stop; returns the profiled duration in seconds."""
+        self._stop.set()
+        return time.perf_counter() - self.started
+
+    def join(self):
+        """Wait for the sampler thread to exit."""
+        self._thread.join()
+
+    def write(self, path):
+        """
+        Write collapsed stacks, one "thread;outer;...;leaf count" line per stack.
+
+        Returns:
+            list: Paths written
+        """
+        labels = {}
+        lines = Counter()
+        for (ident, codes), count in self.stacks.items():
+            thread = self.names.get(ident, f"thread-{ident}").replace(";", ":")
+            frames = [labels.get(code) or labels.setdefault(code, frame_label(code)) for code in codes]
+            lines[";".join([thread] + frames)] += count
+        path += ".collapsed"
+        with open(path, "w") as f:
+            for stack, count in sorted(lines.items()):
+                f.write(f"{stack} {count}\n")
+        return [path]
+
+
+# =============================================================================
+# CPROFILE (PER THREAD)
+# =============================================================================
+
+class ProfiledThread:
+    """A thread that can be asked to run a callable (e.g. enable cProfile) on itself."""
+
+    def __init__(self, name, schedule):
+        self.name = name
+        self.ident = threading.get_ident()
+        self.schedule = schedule
+
+    def call(self, fn):
+        """Run fn on this thread: now if we are on it, else via its scheduler."""
+        if threading.get_ident() == self.ident:
+            fn()
+            return
+        try:
+            self.schedule(fn)
+        except Exception:
+            pass  # Thread is shutting down (e.g. Tk window destroyed); join() reports it
+
+
+class CProfileSession:
+    """One cProfile.Profile per registered thread, enabled and disabled in that thread."""
+
+    mode = "cprofile"
+
+    def __init__(self, threads):
+        self.threads = list(threads)
+        self.profiles = {}  # Thread name -> cProfile.Profile, once enabled in its thread
+        self.stopped = set()  # Threads asked to stop (a late enable is then skipped)
+        self.done = {t.name: threading.Event() for t in self.threads}  # Set once stats are snapshotted
+        self.started = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started = time.perf_counter()
+        for thread in self.threads:
+            thread.call(lambda thread=thread: self._enable(thread.name))
+
+    def _enable(self, name):
+        profile = cProfile.Profile()
+        with self._lock:
+            if name in self.stopped:
+                return  # Stopped before this thread got round to starting
+            self.profiles[name] = profile
+        profile.enable()
+
+    def _disable(self, name):
+        with self._lock:
+            if name in self.stopped:
+                return
+            self.stopped.add(name)
+            profile = self.profiles.get(name)
+        if profile:
+            profile.create_stats()  # Disables, then snapshots the stats
+        self.done[name].set()
+
+    def stop(self):
+        """Ask every thread to disable its profiler; returns the profiled duration in seconds."""
+        seconds = time.perf_counter() - self.started
+        for thread in self.threads:
+            thread.call(lambda thread=thread: self._disable(thread.name))
+        return seconds
+
+    def join(self, timeout=STOP_TIMEOUT):
+        """Wait up to timeout for the threads to hand back their profiles."""
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            if not self.done[thread.name].wait(max(0.0, deadline - time.monotonic())):
+                print(f"⚠ Profiler: thread '{thread.name}' did not respond; its data is skipped")
+
+    def write(self, path):
+        """
+        Write <path>-<thread>.pstats per thread and <path>.pstats with all threads combined.
+
+        Returns:
+            list: Paths written (combined first)
+        """
+        with self._lock:
+            profiles = {name: p for name, p in self.profiles.items() if self.done[name].is_set()}
+        written = []
+        combined = None
+        for name, profile in profiles.items():
+            if not profile.stats:
+                continue  # Nothing ran in this thread while profiling
+            stats = pstats.Stats(profile)
+            thread_path = f"{path}-{name}.pstats"
+            stats.dump_stats(thread_path)
+            written.append(thread_path)
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(stats)
+        if combined is not None:
+            combined.dump_stats(path + ".pstats")
+            written.insert(0, path + ".pstats")
+        return written
+
+
+# =============================================================================
+# CONTROLLER
+# =============================================================================
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    """Control port server; rebinds right away after a restart (TIME_WAIT)."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class RuntimeProfiler:
+    """
+    Starts and stops profiling sessions for the running controller.
+
+    Threads that should be covered by cprofile mode register themselves with
+    register_thread(); sample mode covers every thread regardless.
+    """
+
+    def __init__(self, output_dir="profiles", mode="sample", interval=0.005, host="127.0.0.1", port=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.output_dir = output_dir
+        self.mode = mode
+        self.interval = interval
+        self.host = host
+        self.port = port
+        self.session = None
+        self.threads = {}  # Name -> ProfiledThread
+        self.last_output = []
+        self._lock = threading.Lock()
+        self._writers = []
+        self._server = None
+
+    def register_thread(self, name, schedule):
+        """
+        Make the calling thread available to cprofile mode.
+
+        Args:
+            name: Thread label used in output file names (e.g. "webcam")
+            schedule: Callable that runs a function on this thread soon
+                      (e.g. lambda fn: root.after(0, fn) for Tk)
+        """
+        with self._lock:
+            self.threads[name] = ProfiledThread(name, schedule)
+
+    def unregister_thread(self, name):
+        """Remove a thread that is exiting; a running cProfile in it is finished first."""
+        with self._lock:
+            self.threads.pop(name, None)
+            session = self.session
+        if isinstance(session, CProfileSession) and name in session.done:
+            session._disable(name)
+
+    @property
+    def running(self):
+        return self.session is not None
+
+    def start(self, mode=None):
+        """
+        Start a profiling session (no-op if one is already running).
+
+        Returns:
+            str: The mode that is running
+        """
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        with self._lock:
+            if self.session:
+                return self.session.mode
+            if mode == "cprofile":
+                session = CProfileSession(self.threads.values())
+            else:
+                session = SamplingSession(self.interval)
+            self.session = session
+        session.start()
+        print(f"🔬 Profiling started ({mode})")
+        return mode
+
+    def stop(self, wait=False):
+        """
+        Stop the running session and write its results in the background.
+
+        Args:
+            wait: Block until the files are written
+
+        Returns:
+            str: Output path prefix, or None if nothing was running
+        """
+        with self._lock:
+            session, self.session = self.session, None
+        if session is None:
+            return None
+        seconds = session.stop()  # From the calling thread, so a profiled caller disables its own profiler
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = timestamped_path(self.output_dir, session.mode)
+        writer = threading.Thread(target=self._finish, args=(session, path, seconds), name="profiler-writer",
+                                  daemon=True)
+        self._writers = [w for w in self._writers if w.is_alive()] + [writer]
+        writer.start()
+        if wait:
+            writer.join()
+        return path
+
+    def _finish(self, session, path, seconds):
+        try:
+            session.join()
+            written = session.write(path)
+        except Exception as e:
+            print(f"⚠ Profiler: could not write {path}: {e}")
+            return
+        self.last_output = written
+        if written:
+            print(f"🔬 Profiled {seconds:.1f}s ({session.mode}) → {', '.join(written)}")
+        else:
+            print(f"⚠ Profiler: no samples collected in {seconds:.1f}s ({session.mode})")
+
+    def toggle(self, mode=None):
+        """Start if idle, stop if running."""
+        if self.session:
+            self.stop()
+        else:
+            self.start(mode)
+
+    def status(self):
+        session = self.session
+        if session is None:
+            return "idle"
+        return f"running {session.mode} for {time.perf_counter() - session.started:.1f}s"
+
+    # -------------------------------------------------------------------------
+    # Triggers
+    # -------------------------------------------------------------------------
+
+    def install_signal(self):
+        """Toggle profiling on SIGUSR1 (POSIX only; main thread only)."""
+        if not hasattr(signal, "SIGUSR1") or threading.current_thread() is not threading.main_thread():
+            return False
+        # Handlers run between bytecodes of the main (Tk) thread: hand the work to a
+        # short-lived thread so the handler never waits on the GUI it interrupted
+        signal.signal(signal.SIGUSR1, lambda signum, frame: threading.Thread(
+            target=self.toggle, name="profiler-signal", daemon=True).start())
+        return True
+
+    def handle_command(self, line):
+        """
+        Run one control command: start [mode], stop, toggle [mode], status.
+
+        Returns:
+            str: One-line reply
+        """
+        parts = line.split()
+        command, arg = (parts + [None, None])[:2]
+        try:
+            if command == "start":
+                return "running " + self.start(arg)
+            if command == "stop":
+                if self.stop(wait=True) is None:
+                    return "error: not running"
+                return "wrote " + " ".join(self.last_output)
+            if command == "toggle":
+                if self.session:
+                    self.stop(wait=True)
+                    return "wrote " + " ".join(self.last_output)
+                return "running " + self.start(arg)
+            if command == "status":
+                return self.status()
+        except ValueError as e:
+            return f"error: {e}"
+        return f"error: unknown command {command!r} (start [mode] | stop | toggle [mode] | status)"
+
+    def start_server(self):
+        """Listen for control commands on host:port (one command per line)."""
+        profiler = self
+
+        class ControlHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    line = raw.decode("utf-8", "replace").strip()
+                    if line:
+                        self.wfile.write((profiler.handle_command(line) + "\n").encode("utf-8"))
+
+        self._server = ControlServer((self.host, self.port), ControlHandler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="profiler-control", daemon=True).start()
+
+    def close(self):
+        """Finish a running session and stop listening (call at shutdown)."""
+        self.stop(wait=True)
+        for writer in self._writers:
+            writer.join()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def start_profiler(output_dir, mode, interval, host, port):
+    """
+    Create the controller's profiler: SIGUSR1 handler and, if a port is set, the control port.
+
+    Sessions only start when asked; until then nothing is hooked.
+
+    Returns:
+        RuntimeProfiler: Register threads with it; close() at shutdown
+    """
+    profiler = RuntimeProfiler(output_dir, mode, interval, host, port)
+    triggers = ["'p' key"]
+    if profiler.install_signal():
+        triggers.append(f"kill -USR1 {os.getpid()}")
+    if port is not None:
+        try:
+            profiler.start_server()
+            triggers.append(f"{host}:{profiler.port}")
+        except OSError as e:
+            print(f"⚠ Profiler control port {host}:{port} unavailable: {e}")
+    print(f"✓ On-demand profiler ({mode}) ready: {', '.join(triggers)}")
+    return profiler
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def send_command(command, host="127.0.0.1", port=DEFAULT_PORT, timeout=STOP_TIMEOUT + 10):
+    """Send one command to a running controller's control port and return its reply."""
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        conn.sendall((command + "\n").encode("utf-8"))
+        conn.shutdown(socket.SHUT_WR)
+        return conn.makefile("r", encoding="utf-8").readline().strip()
+
+
+def report(path, limit=25):
+    """
+    Summarise a profile file: pstats sorted by cumulative time, or the
+    hottest functions (self and total samples) from collapsed stacks.
+
+    Returns:
+        str: Printable report
+    """
+    if not path.endswith(".collapsed"):
+        import io
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    own, total, threads = Counter(), Counter(), Counter()
+    samples = 0
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            count = int(count)
+            thread, *frames = stack.split(";")
+            samples += count
+            threads[thread] += count
+            if frames:
+                own[frames[-1]] += count
+                for name in set(frames):
+                    total[name] += count
+    lines = [f"{samples} samples"]
+    for title, counts in (("Threads", threads), ("Self (leaf) samples", own), ("Total (inclusive) samples", total)):
+        lines.append(f"\n{title}:")
+        for name, count in counts.most_common(limit):
+            lines.append(f"  {count / samples * 100:6.1f}%  {count:7d}  {name}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control the running controller's profiler")
+    parser.add_argument("command", choices=["start", "stop", "toggle", "status", "report"])
+    parser.add_argument("file", nargs="?", help="Profile file (report only)")
+    parser.add_argument("--mode", choices=MODES, help="Profiler for start/toggle (default: controller's PROFILER_MODE)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--limit", type=int, default=25, help="Rows per table (report only)")
+    args = parser.parse_args()
+
+    if args.command == "report":
+        if not args.file:
+            parser.error("report needs a profile file")
+        print(report(args.file, args.limit))
+        return
+
+    command = " ".join(filter(None, [args.command, args.mode]))
+    try:
+        reply = send_command(command, args.host, args.port)
+    except OSError as e:
+        sys.exit(f"❌ No controller profiler at {args.host}:{args.port}: {e}")
+    print(reply)
+    if reply.startswith("error"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
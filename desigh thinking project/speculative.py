@@ -0,0 +1,289 @@
+"""
+Speculative Actuation for Virtual LED Controller
+================================================
+
+A gesture only acts once DEBOUNCE_FRAMES frames in a row agree, so every
+action waits about 100 ms at 30 fps before anything visibly happens. For
+devices where a wrong action is harmless and easy to undo
+(SPECULATIVE_DEVICE_TYPES: LEDs, TV) this module acts earlier:
+
+    speculate   After SPECULATIVE_FRAMES matching frames with a hand
+                confidence of at least SPECULATIVE_MIN_CONFIDENCE, the
+                gesture's action runs at once. The GUI, dashboard and other
+                device listeners see the change straight away, as for any
+                other device change. The state the devices had before is kept.
+    commit      When debounce confirms the same gesture, nothing else
+                happens; process_gesture_action() sees the gesture as
+                already handled.
+    roll back   When the run ends without confirmation (another gesture, or
+                the hand is lost), the devices go back to the kept state,
+                unless something else changed them in the meantime.
+
+Gestures that target any other device type (door_lock, fan) or a scene that
+includes one keep strict confirmation.
+
+The perceived latency gain (confirmation time minus speculation time) and
+how often speculations are rolled back are kept in telemetry and printed
+at shutdown.
+
+Usage: python virtual_led_controller.py --speculative
+       python speculative.py [session.lmrec ...]    (gain vs. rollbacks for each SPECULATIVE_FRAMES)
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import virtual_led_controller as vlc
+
+
+def speculative_targets(target, device_types):
+    """
+    Devices a gesture target would change, if all of them may be actuated early.
+
+    Args:
+        target: Device ID or scene name from GESTURE_TO_LED
+        device_types: Device types that may be actuated early
+
+    Returns:
+        list: Device IDs, or None if the target needs strict confirmation
+    """
+    if target in vlc.SCENES:
+        devices = list(vlc.SCENES[target])
+    elif target in vlc.DEVICE_CONFIG:
+        devices = [target]
+    else:
+        return None
+    for device_id in devices:
+        if device_id not in vlc.DEVICE_CONFIG or vlc.DEVICE_CONFIG[device_id].get('type', 'led') not in device_types:
+            return None
+    return devices
+
+
+def snapshot(devices):
+    """
+    Current state of devices, as apply_device_changes() targets that restore it.
+
+    Returns:
+        tuple: (restore changes, {device_id: device_status()})
+    """
+    _, states = vlc.get_device_states(devices)
+    restore = {}
+    for device_id, status in states.items():
+        if "channel" in status:
+            restore[device_id] = {"on": status["on"], "channel": vlc.TV_CHANNELS.index(status["channel"])}
+        else:
+            restore[device_id] = status["on"]
+    return restore, states
+
+
+class SpeculativeActuator:
+    """
+    Early actions for reversible devices, committed or rolled back by debounce (frame thread).
+    """
+
+    def __init__(self, device_types, min_frames, min_confidence, clock=time.perf_counter):
+        self.device_types = tuple(device_types)
+        self.min_frames = min_frames
+        self.min_confidence = min_confidence
+        self.clock = clock
+        self.run_gesture = None
+        self.run_frames = 0
+        self.pending = None  # [gesture, speculation time, restore changes, applied statuses, last_gesture before]
+        self.gains = []  # Seconds each committed action was shown ahead of confirmation
+        self.wrong_seconds = []  # Seconds each rolled back action was shown
+        self.speculations = 0
+        self.rollbacks = 0
+        self.skipped = 0  # Rollbacks left out because something else changed the device
+
+    def observe(self, gesture, confirmed, confidence):
+        """
+        Process one frame's raw and debounced gesture, before the confirmed action runs.
+
+        Args:
+            gesture: detect_gesture() result (None when no gesture or no hand)
+            confirmed: debounce_gesture() result
+            confidence: Hand confidence (handedness score) of the frame
+        """
+        if gesture != self.run_gesture:
+            if self.pending:
+                self._roll_back()
+            self.run_gesture, self.run_frames = gesture, 0
+        if gesture is None:
+            return
+        self.run_frames += 1
+
+        if self.pending:
+            if confirmed == gesture:
+                self._commit()
+            return
+        if (confirmed or self.run_frames < self.min_frames or confidence is None
+                or confidence < self.min_confidence or gesture == vlc.last_gesture
+                or gesture not in vlc.GESTURE_TO_LED):
+            return
+        devices = speculative_targets(vlc.GESTURE_TO_LED[gesture], self.device_types)
+        if devices:
+            self._speculate(gesture, devices)
+
+    def _speculate(self, gesture, devices):
+        restore, _ = snapshot(devices)
+        previous = vlc.last_gesture
+        vlc.process_gesture_action(gesture)
+        _, applied = snapshot(devices)
+        self.pending = [gesture, self.clock(), restore, applied, previous]
+        self.speculations += 1
+        vlc.telemetry["speculative_pending"] = gesture
+
+    def _commit(self):
+        gesture, started = self.pending[:2]
+        self.pending = None
+        self.gains.append(self.clock() - started)
+        self._update_telemetry()
+
+    def _roll_back(self):
+        gesture, started, restore, applied, previous = self.pending
+        self.pending = None
+        _, current = vlc.get_device_states(list(restore))
+        undo = {device_id: target for device_id, target in restore.items() if current[device_id] == applied[device_id]}
+        self.skipped += len(restore) - len(undo)
+        vlc.apply_device_changes(undo)
+        if vlc.last_gesture == gesture:
+            vlc.last_gesture = previous
+        self.rollbacks += 1
+        self.wrong_seconds.append(self.clock() - started)
+        print(f"↩ {gesture.replace('_', ' ').title()} not confirmed - undone")
+        self._update_telemetry()
+
+    def _update_telemetry(self):
+        summary = self.summary()
+        vlc.telemetry.update(speculative_pending=None, speculative_actions=summary["speculations"],
+                             speculative_rollback_rate=summary["rollback_rate"],
+                             speculative_gain_ms=summary["gain_p50_ms"])
+
+    def summary(self):
+        """
+        Speculations so far.
+
+        Returns:
+            dict: speculations, commits, rollbacks, rollback_rate, gain_p50_ms,
+                  gain_max_ms and wrong_p50_ms (how long an undone action was shown)
+        """
+        gains, wrong = sorted(self.gains), sorted(self.wrong_seconds)
+        decided = len(gains) + len(wrong)
+        return {
+            "speculations": self.speculations,
+            "commits": len(gains),
+            "rollbacks": self.rollbacks,
+            "rollback_rate": round(len(wrong) / decided, 3) if decided else None,
+            "gain_p50_ms": round(gains[len(gains) // 2] * 1000, 1) if gains else None,
+            "gain_max_ms": round(gains[-1] * 1000, 1) if gains else None,
+            "wrong_p50_ms": round(wrong[len(wrong) // 2] * 1000, 1) if wrong else None,
+        }
+
+    def report(self):
+        """Print the latency gained and the rollbacks it cost."""
+        summary = self.summary()
+        if not summary["speculations"]:
+            return
+        line = (f"⚡ Speculative actions: {summary['speculations']}, {summary['commits']} confirmed "
+                f"(~{summary['gain_p50_ms'] or 0:.0f} ms earlier), {summary['rollbacks']} undone")
+        if summary["rollback_rate"] is not None:
+            line += f" ({summary['rollback_rate'] * 100:.0f}%)"
+        if self.skipped:
+            line += f"; {self.skipped} undo skipped (device changed meanwhile)"
+        print(line)
+
+
+def start_speculative(device_types, min_frames, min_confidence):
+    """
+    Create the speculative actuator for the frame loop.
+
+    Returns:
+        SpeculativeActuator: Call observe() each frame before the confirmed action runs
+    """
+    actuator = SpeculativeActuator(device_types, min_frames, min_confidence)
+    vlc.telemetry.update(speculative_pending=None, speculative_actions=0)
+    strict = sorted({config.get('type', 'led') for config in vlc.DEVICE_CONFIG.values()} - set(device_types))
+    print(f"✓ Speculative actions for {', '.join(device_types)} after {min_frames} frame(s) "
+          f"(strict confirmation: {', '.join(strict) or 'none'})")
+    return actuator
+
+
+# =============================================================================
+# OFFLINE COMPARISON
+# =============================================================================
+
+def load_sequences(paths, synthetic, seed=0):
+    """
+    Frames to replay: (time, hand or None, hand confidence) per frame, per sequence.
+
+    Recorded sessions (.lmrec) keep their hand confidence; synthetic sequences
+    (synthetic_hands.py) have none, so every hand counts as confident.
+    """
+    sequences = []
+    for path in paths:
+        import landmark_recorder
+        recording = landmark_recorder.LandmarkRecording(path)
+        frames = []
+        for i in range(len(recording)):
+            hands = recording.frame(i)
+            hand = hands[0] if hands else None
+            frames.append((float(recording.frame_time[i]), hand, hand.score if hand else None))
+        sequences.append(frames)
+    if synthetic:
+        import synthetic_hands
+        for i in range(synthetic):
+            sequence = synthetic_hands.generate_sequence(seed + i, holds=30, jitter=0.004, tremor=0.002,
+                                                         occlusion=0.1, dropout=0.03)
+            hands = synthetic_hands.to_hands(sequence)
+            sequences.append([(n / 30, hand, 1.0 if hand else None) for n, hand in enumerate(hands)])
+    return sequences
+
+
+def replay(sequences, min_frames, min_confidence, device_types):
+    """
+    Run sequences through detect → debounce → speculation → action on their own clock.
+
+    Returns:
+        dict: SpeculativeActuator.summary() over all sequences
+    """
+    clock = {"now": 0.0}
+    actuator = SpeculativeActuator(device_types, min_frames, min_confidence, clock=lambda: clock["now"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frames in sequences:
+            vlc.reset_pipeline_state()
+            for t, hand, confidence in frames:
+                clock["now"] = t
+                gesture = confirmed = None
+                if hand is not None:
+                    gesture = vlc.detect_gesture(hand)
+                    confirmed = vlc.debounce_gesture(gesture)
+                actuator.observe(gesture, confirmed, confidence)
+                if confirmed:
+                    vlc.process_gesture_action(confirmed)
+            actuator.observe(None, None, None)
+    return actuator.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare latency gain and rollbacks of speculative actions")
+    parser.add_argument("recordings", nargs="*", help="Landmark recordings (.lmrec) to replay")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Also replay N generated sequences (default: 5 when no recordings are given)")
+    parser.add_argument("--min-confidence", type=float, default=vlc.SPECULATIVE_MIN_CONFIDENCE)
+    args = parser.parse_args()
+
+    sequences = load_sequences(args.recordings, args.synthetic or (0 if args.recordings else 5))
+    print(f"⏱ {sum(len(s) for s in sequences)} frames, debounce {vlc.DEBOUNCE_FRAMES} frames, "
+          f"speculative devices: {', '.join(vlc.SPECULATIVE_DEVICE_TYPES)}")
+    for min_frames in range(1, vlc.DEBOUNCE_FRAMES):
+        s = replay(sequences, min_frames, args.min_confidence, vlc.SPECULATIVE_DEVICE_TYPES)
+        rate = "-" if s["rollback_rate"] is None else f"{s['rollback_rate'] * 100:.0f}%"
+        print(f"   after {min_frames} frame(s): {s['speculations']:4d} early actions, "
+              f"{s['commits']:4d} confirmed (p50 {s['gain_p50_ms'] or 0:5.0f} ms earlier), "
+              f"{s['rollbacks']:4d} undone ({rate}, shown p50 {s['wrong_p50_ms'] or 0:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
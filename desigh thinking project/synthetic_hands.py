@@ -0,0 +1,518 @@
+"""
+Synthetic Hand Generator for Virtual LED Controller
+===================================================
+
+Generates realistic MediaPipe-style hand landmarks (21 x 3, normalized image
+coordinates) without a camera, for load testing and fuzzing the real gesture
+pipeline (detect_gesture → debounce_gesture → process_gesture_action).
+
+The hand is a small skeleton: finger bones with per-joint flexion driven by
+a curl amount (0 = straight, 1 = fully curled), a thumb with a direction and
+bend, and a placement in the image (position, size, roll, left/right hand).
+Sequences hold gestures for a number of frames and blend the skeleton
+parameters between them, so transitions pass through the in-between poses a
+real hand does. On top of that:
+
+    jitter     Per-landmark noise (tracker noise)
+    tremor     Slow oscillation of the whole hand (hand tremor)
+    occlusion  One finger hidden for a stretch of frames: its landmarks are
+               guesses (random curl plus noise), or the hand is cut by the
+               image edge
+    dropout    Frames where the hand is lost entirely
+
+Usage: python synthetic_hands.py stress --rate 10000 --duration 10
+       python synthetic_hands.py corpus corpus.npz [--per-gesture 500]
+       python synthetic_hands.py check corpus.npz
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import time
+
+import numpy as np
+
+from landmark_recorder import ReplayedHand
+
+# Gestures detect_gesture() recognizes, plus poses that must not trigger anything
+GESTURES = ("thumb_up", "thumb_down", "index_up", "peace_sign", "three_fingers")
+NEGATIVE_POSES = ("open_palm", "fist")
+
+# Skeleton in hand units (wrist at the origin, fingers pointing up, thumb on the -x side)
+FINGER_MCPS = [(-0.12, -0.40), (0.0, -0.42), (0.10, -0.40), (0.19, -0.35)]  # Index, middle, ring, pinky
+FINGER_BONES = [(0.20, 0.12, 0.09), (0.22, 0.14, 0.10), (0.20, 0.13, 0.09), (0.16, 0.10, 0.08)]
+FINGER_FAN = [-8.0, 0.0, 7.0, 15.0]  # Degrees from vertical
+JOINT_FLEX = (75.0, 105.0, 65.0)  # Degrees of flexion at MCP, PIP, DIP when fully curled
+THUMB_CMC = (-0.10, -0.08)
+THUMB_BONES = (0.14, 0.11, 0.09)
+
+# Thumb (direction in degrees, 0 = +x, -90 = up; bend per joint in degrees)
+THUMB_POSES = {"up": (-125.0, 0.0), "down": (95.0, 0.0), "tucked": (-90.0, 25.0), "out": (-150.0, 0.0)}
+
+# Pose → (thumb, curl of index/middle/ring/pinky)
+POSES = {
+    "thumb_up": ("up", (1, 1, 1, 1)),
+    "thumb_down": ("down", (1, 1, 1, 1)),
+    "index_up": ("tucked", (0, 1, 1, 1)),
+    "peace_sign": ("tucked", (0, 0, 1, 1)),
+    "three_fingers": ("tucked", (0, 0, 0, 1)),
+    "open_palm": ("out", (0, 0, 0, 0)),
+    "fist": ("tucked", (1, 1, 1, 1)),
+}
+
+
+# =============================================================================
+# SKELETON
+# =============================================================================
+
+def pose_params(name, rng=None):
+    """
+    Skeleton parameters for a named pose, with natural variation if rng is given.
+
+    Returns:
+        np.ndarray: [thumb angle, thumb bend, curl index, middle, ring, pinky]
+    """
+    thumb, curls = POSES[name]
+    angle, bend = THUMB_POSES[thumb]
+    params = np.array([angle, bend, *curls], dtype=np.float64)
+    if rng is not None:
+        params[0] += rng.uniform(-8, 8)
+        params[1] += rng.uniform(-4, 4)
+        params[2:] = np.where(params[2:] > 0.5, [rng.uniform(0.8, 1.0) for _ in range(4)],
+                              [rng.uniform(0.0, 0.12) for _ in range(4)])
+    return params
+
+
+def skeleton(params):
+    """
+    21 landmarks in hand units for skeleton parameters.
+
+    Returns:
+        np.ndarray: (21, 3) points; x right, y down, z toward the camera negative
+    """
+    points = np.zeros((21, 3))
+    angle, bend = math.radians(params[0]), math.radians(params[1])
+    x, y = THUMB_CMC
+    points[1] = (x, y, -0.02)
+    for k, length in enumerate(THUMB_BONES):
+        direction = angle + bend * k
+        x, y = x + length * math.cos(direction), y + length * math.sin(direction)
+        points[2 + k] = (x, y, -0.03 - 0.015 * k)
+
+    for f, ((mx, my), bones, fan) in enumerate(zip(FINGER_MCPS, FINGER_BONES, FINGER_FAN)):
+        base = 5 + 4 * f
+        points[base] = (mx, my, 0.0)
+        ux, uy = math.sin(math.radians(fan)), -math.cos(math.radians(fan))
+        flex = 0.0
+        px, py, pz = mx, my, 0.0
+        for k, length in enumerate(bones):
+            flex += math.radians(JOINT_FLEX[k] * params[2 + f])
+            along, depth = math.cos(flex) * length, math.sin(flex) * length
+            px, py, pz = px + ux * along, py + uy * along, pz - depth
+            points[base + 1 + k] = (px, py, pz)
+    return points
+
+
+def place(points, x, y, scale, roll, left=False):
+    """
+    Map hand-unit points into normalized image coordinates.
+
+    Args:
+        points: (21, 3) skeleton points
+        x, y: Wrist position in the image (0-1)
+        scale: Hand size as a fraction of the image
+        roll: In-plane rotation in degrees
+        left: Mirror into a left hand
+
+    Returns:
+        np.ndarray: (21, 3) normalized landmarks
+    """
+    hx = -points[:, 0] if left else points[:, 0]
+    c, s = math.cos(math.radians(roll)), math.sin(math.radians(roll))
+    out = np.empty_like(points)
+    out[:, 0] = x + scale * (hx * c - points[:, 1] * s)
+    out[:, 1] = y + scale * (hx * s + points[:, 1] * c)
+    out[:, 2] = scale * points[:, 2]
+    return out
+
+
+def random_placement(rng):
+    """A plausible wrist position, size, roll and handedness."""
+    return (rng.uniform(0.3, 0.7), rng.uniform(0.7, 0.9), rng.uniform(0.3, 0.5),
+            rng.uniform(-15, 15), rng.random() < 0.3)
+
+
+# =============================================================================
+# RENDERED FRAMES
+# =============================================================================
+
+HAND_FINGER_WIDTHS = (0.085, 0.08, 0.082, 0.075, 0.065)  # Thumb, index, middle, ring, pinky (hand units)
+
+
+def render_hand_frame(pose="peace_sign", width=640, height=480, x=0.5, y=0.85, scale=0.5, roll=0.0,
+                      skin=(140, 170, 215), seed=0):
+    """
+    Draw a webcam-like frame with a shaded hand that MediaPipe's palm detector finds.
+
+    The hand is painted around the pose's skeleton: palm and forearm as one
+    filled shape, fingers as rounded capsules, lit brighter towards the
+    middle, on a room-like gradient with sensor noise.
+
+    Args:
+        pose: Name from POSES
+        width, height: Frame size in pixels
+        x, y, scale, roll: Placement as in place() (scale is relative to the height)
+        skin: BGR skin colour
+        seed: Noise seed (frames are reproducible)
+
+    Returns:
+        np.ndarray: (height, width, 3) BGR uint8 frame
+    """
+    import cv2
+
+    gradient = np.linspace(60, 170, width, dtype=np.float32)
+    frame = np.dstack([np.tile(gradient * f, (height, 1)) for f in (0.8, 0.9, 1.0)])
+    points = place(skeleton(pose_params(pose)), x, y, scale * height / width, roll)
+    hand = [(int(px * width), int(py * height)) for px, py, _ in points]
+    size = scale * height
+
+    mask = np.zeros((height, width), np.uint8)
+    wx, wy = hand[0]
+    palm = np.array([(wx - int(0.16 * size), wy), hand[1], hand[2], hand[5], hand[9], hand[13], hand[17],
+                     (wx + int(0.14 * size), wy)], np.int32)
+    cv2.fillConvexPoly(mask, cv2.convexHull(palm), 255)
+    cv2.rectangle(mask, (wx - int(0.15 * size), wy), (wx + int(0.14 * size), height), 255, -1)  # Forearm
+    chains = [(1, 2, 3, 4)] + [(5 + 4 * f, 6 + 4 * f, 7 + 4 * f, 8 + 4 * f) for f in range(4)]
+    for chain, finger_width in zip(chains, HAND_FINGER_WIDTHS):
+        thickness = max(2, int(finger_width * size))
+        for start, end in zip(chain[:-1], chain[1:]):
+            cv2.line(mask, hand[start], hand[end], 255, thickness, cv2.LINE_AA)
+            cv2.circle(mask, hand[end], thickness // 2, 255, -1, cv2.LINE_AA)
+
+    depth = cv2.distanceTransform(mask, cv2.DIST_L2, 5)
+    light = 0.7 + 0.4 * np.sqrt(depth / (depth.max() + 1e-6))
+    skin_layer = np.empty_like(frame)
+    skin_layer[:] = skin
+    skin_layer *= light[..., None]
+    for chain in chains[1:]:
+        for joint in chain[1:3]:  # Knuckle creases
+            cv2.circle(skin_layer, hand[joint], 2, tuple(c * 0.75 for c in skin), -1)
+    alpha = cv2.GaussianBlur(mask.astype(np.float32) / 255, (0, 0), 1.5)[..., None]
+    frame = frame * (1 - alpha) + skin_layer * alpha
+    frame = cv2.GaussianBlur(frame, (3, 3), 0) + np.random.default_rng(seed).normal(0, 3, frame.shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+# =============================================================================
+# SEQUENCES
+# =============================================================================
+
+def generate_sequence(seed=0, holds=20, poses=GESTURES + NEGATIVE_POSES, hold_frames=(15, 40),
+                      transition_frames=(3, 8), jitter=0.003, tremor=0.0, occlusion=0.0,
+                      dropout=0.0, fps=30):
+    """
+    Generate a landmark sequence of gesture holds joined by transitions.
+
+    Args:
+        seed: Random seed (same seed → same sequence)
+        holds: Number of poses held
+        poses: Pose names to draw from
+        hold_frames: (min, max) frames per hold
+        transition_frames: (min, max) frames blending into the next pose
+        jitter: Std-dev of per-landmark noise (normalized units)
+        tremor: Amplitude of whole-hand tremor (normalized units, ~5 Hz)
+        occlusion: Probability that a hold has one finger occluded (or is cut by the image edge)
+        dropout: Probability that a frame loses the hand
+        fps: Frame rate used for tremor timing
+
+    Returns:
+        dict: "landmarks" (N, 21, 3) float32, "present" (N,) bool,
+              "labels" list of expected gestures (None for transitions,
+              negative poses and lost frames)
+    """
+    rng = random.Random(seed)
+    noise = np.random.default_rng(seed)
+    frames, present, labels = [], [], []
+    current = None
+
+    def emit(params, placement, label, occluded=None, cut=False):
+        if rng.random() < dropout:
+            frames.append(np.zeros((21, 3)))
+            present.append(False)
+            labels.append(None)
+            return
+        if occluded is not None:
+            params = params.copy()
+            params[2 + occluded] = rng.random()
+        x, y, scale, roll, left = placement
+        t = len(frames) / fps
+        x += tremor * math.sin(2 * math.pi * 5.0 * t)
+        y += tremor * math.cos(2 * math.pi * 4.3 * t)
+        points = place(skeleton(params), x, y, scale, roll, left)
+        points += noise.normal(0, jitter, points.shape) * (1, 1, 0.5)
+        if occluded is not None:
+            finger = slice(5 + 4 * occluded, 9 + 4 * occluded)
+            points[finger] += noise.normal(0, jitter * 5 + 0.01, points[finger].shape)
+        if cut:
+            np.clip(points[:, :2], 0.0, 1.0, out=points[:, :2])
+        frames.append(points)
+        present.append(True)
+        labels.append(label)
+
+    for _ in range(holds):
+        name = rng.choice([p for p in poses if current is None or p != current[0]])
+        target = (name, pose_params(name, rng), random_placement(rng))
+        if current is not None:
+            steps = rng.randint(*transition_frames)
+            for step in range(1, steps + 1):
+                t = step / (steps + 1)
+                params = current[1] + (target[1] - current[1]) * t
+                placement = tuple(a + (b - a) * t for a, b in zip(current[2][:4], target[2][:4])) + (target[2][4],)
+                emit(params, placement, None)
+
+        occluded, cut = None, False
+        if rng.random() < occlusion:
+            if rng.random() < 0.25:
+                cut = True
+                x, y, scale, roll, left = target[2]
+                target = (name, target[1], (x, rng.uniform(0.95, 1.05), scale, roll, left))  # Wrist near the bottom edge
+            else:
+                occluded = rng.randrange(4)
+        label = name if name in GESTURES else None
+        for _ in range(rng.randint(*hold_frames)):
+            emit(target[1], target[2], label, occluded, cut)
+        current = target
+
+    return {
+        "landmarks": np.array(frames, dtype=np.float32),
+        "present": np.array(present, dtype=bool),
+        "labels": labels,
+    }
+
+
+def to_hands(sequence):
+    """Turn a generated sequence into MediaPipe-shaped hand objects (None where the hand is lost)."""
+    return [ReplayedHand(points, 1, 1.0) if present else None
+            for points, present in zip(sequence["landmarks"], sequence["present"])]
+
+
+# =============================================================================
+# STRESS DRIVER
+# =============================================================================
+
+def stress(rate=10000, duration=10.0, seed=0, jitter=0.003, tremor=0.0, occlusion=0.0, pool_frames=20000):
+    """
+    Drive the real gesture pipeline with synthetic hands at a fixed rate.
+
+    Hands are generated up front (generation cost is not measured) and fed
+    through detect_gesture → debounce_gesture → process_gesture_action, as
+    the frame loop does. Each hand has a scheduled time (start + i / rate).
+    Lag is how late it finished relative to that schedule, so a pipeline
+    that cannot keep up shows growing lag.
+
+    Args:
+        rate: Hands per second (0 = as fast as possible)
+        duration: Seconds to run
+        seed, jitter, tremor, occlusion: Passed to generate_sequence()
+        pool_frames: Approximate size of the generated hand pool (reused cyclically)
+
+    Returns:
+        dict: Throughput, per-hand compute and lag percentiles, agreement with labels
+    """
+    import virtual_led_controller as vlc
+
+    sequence = generate_sequence(seed, holds=max(1, pool_frames // 30), jitter=jitter, tremor=tremor,
+                                 occlusion=occlusion)
+    pool = [(hand, label) for hand, label in zip(to_hands(sequence), sequence["labels"]) if hand is not None]
+    vlc.reset_pipeline_state()
+    detect, debounce, dispatch = vlc.detect_gesture, vlc.debounce_gesture, vlc.process_gesture_action
+    clock = time.perf_counter
+
+    compute, lag = [], []
+    agree = labelled = confirmations = 0
+    changes_before = vlc.state_version
+    with contextlib.redirect_stdout(io.StringIO()):  # toggle_led prints every change
+        start = clock()
+        end = start + duration
+        i = 0
+        while True:
+            now = clock()
+            if now >= end:
+                break
+            due = int((now - start) * rate) if rate else i + 1
+            while i < due:
+                hand, label = pool[i % len(pool)]
+                t0 = clock()
+                gesture = detect(hand)
+                confirmed = debounce(gesture)
+                if confirmed:
+                    dispatch(confirmed)
+                    confirmations += 1
+                t1 = clock()
+                compute.append(t1 - t0)
+                if rate:
+                    lag.append(t1 - (start + i / rate))
+                if label is not None:
+                    labelled += 1
+                    agree += gesture == label
+                i += 1
+            if rate:
+                time.sleep(0.0005)
+        elapsed = clock() - start
+    vlc.reset_pipeline_state()
+
+    def pct(values, p):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p))] * 1e6 if values else 0.0
+
+    return {
+        "target_rate": rate,
+        "hands": i,
+        "achieved_rate": i / elapsed,
+        "compute_p50_us": pct(compute, 0.5),
+        "compute_p99_us": pct(compute, 0.99),
+        "lag_p99_us": pct(lag, 0.99),
+        "lag_max_us": max(lag) * 1e6 if lag else 0.0,
+        "agreement": agree / labelled if labelled else 0.0,
+        "confirmations": confirmations,
+        "state_changes": vlc.state_version - changes_before,
+    }
+
+
+# =============================================================================
+# REGRESSION CORPUS
+# =============================================================================
+
+CONDITIONS = {
+    # name: (jitter, occluded finger?, scale range)
+    "clean": (0.0, False, (0.3, 0.5)),
+    "jitter": (0.006, False, (0.3, 0.5)),
+    "far": (0.003, False, (0.15, 0.25)),
+    "occluded": (0.003, True, (0.3, 0.5)),
+}
+
+
+def build_corpus(seed=1, per_gesture=500):
+    """
+    Independent labelled hands for every pose under every condition.
+
+    Returns:
+        dict: "landmarks" (N, 21, 3) float32, "labels", "poses" and "conditions" (N,) str arrays
+    """
+    rng = random.Random(seed)
+    noise = np.random.default_rng(seed)
+    landmarks, labels, poses, conditions = [], [], [], []
+    for condition, (jitter, occlude, scale_range) in CONDITIONS.items():
+        for name in GESTURES + NEGATIVE_POSES:
+            for _ in range(per_gesture):
+                params = pose_params(name, rng)
+                if occlude:
+                    params[2 + rng.randrange(4)] = rng.random()
+                x, y, _, roll, left = random_placement(rng)
+                points = place(skeleton(params), x, y, rng.uniform(*scale_range), roll, left)
+                landmarks.append(points + noise.normal(0, jitter, points.shape) * (1, 1, 0.5))
+                labels.append(name if name in GESTURES else "none")
+                poses.append(name)
+                conditions.append(condition)
+    return {
+        "landmarks": np.array(landmarks, dtype=np.float32),
+        "labels": np.array(labels),
+        "poses": np.array(poses),
+        "conditions": np.array(conditions),
+    }
+
+
+def classify(landmarks):
+    """Run detect_gesture() over an (N, 21, 3) array ("none" where it returns None)."""
+    import virtual_led_controller as vlc
+
+    return np.array([vlc.detect_gesture(ReplayedHand(points, 1, 1.0)) or "none" for points in landmarks])
+
+
+def save_corpus(path, corpus):
+    """Save a corpus with the current classifier's predictions as the expected output."""
+    np.savez_compressed(path, predictions=classify(corpus["landmarks"]), **corpus)
+
+
+def check_corpus(path):
+    """
+    Re-run the classifier over a saved corpus.
+
+    Returns:
+        dict: Accuracy per condition, confusion matrix, and predictions that
+              changed since the corpus was saved
+    """
+    data = np.load(path)
+    predictions = classify(data["landmarks"])
+    labels = data["labels"]
+    names = list(GESTURES) + ["none"]
+    confusion = {truth: {predicted: int(np.sum((labels == truth) & (predictions == predicted))) for predicted in names}
+                 for truth in names}
+    changed = predictions != data["predictions"]
+    changes = {}
+    for old, new in zip(data["predictions"][changed], predictions[changed]):
+        changes[f"{old} → {new}"] = changes.get(f"{old} → {new}", 0) + 1
+    return {
+        "samples": len(labels),
+        "accuracy": float(np.mean(predictions == labels)),
+        "by_condition": {c: float(np.mean(predictions[data["conditions"] == c] == labels[data["conditions"] == c]))
+                         for c in np.unique(data["conditions"])},
+        "confusion": confusion,
+        "changed": int(changed.sum()),
+        "changes": changes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic hands for stress and regression testing")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stress_parser = sub.add_parser("stress", help="Drive the real pipeline at a fixed hand rate")
+    stress_parser.add_argument("--rate", type=int, default=10000, help="Hands per second (0 = unlimited)")
+    stress_parser.add_argument("--duration", type=float, default=10.0)
+    stress_parser.add_argument("--seed", type=int, default=0)
+    stress_parser.add_argument("--jitter", type=float, default=0.003)
+    stress_parser.add_argument("--tremor", type=float, default=0.0)
+    stress_parser.add_argument("--occlusion", type=float, default=0.1)
+    corpus_parser = sub.add_parser("corpus", help="Build a labelled regression corpus")
+    corpus_parser.add_argument("path")
+    corpus_parser.add_argument("--seed", type=int, default=1)
+    corpus_parser.add_argument("--per-gesture", type=int, default=500, help="Hands per pose per condition")
+    check_parser = sub.add_parser("check", help="Check the classifier against a saved corpus")
+    check_parser.add_argument("path")
+    check_parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    if args.command == "stress":
+        result = stress(args.rate, args.duration, args.seed, args.jitter, args.tremor, args.occlusion)
+        print(f"🔥 {result['hands']} hands in {args.duration:g}s → {result['achieved_rate']:.0f} hands/s "
+              f"(target {args.rate or 'unlimited'})")
+        print(f"   Compute per hand: p50 {result['compute_p50_us']:.1f} µs | p99 {result['compute_p99_us']:.1f} µs")
+        if args.rate:
+            print(f"   Lag behind schedule: p99 {result['lag_p99_us']:.0f} µs | max {result['lag_max_us']:.0f} µs")
+        print(f"   Agreement with labels: {result['agreement']:.1%} | {result['confirmations']} confirmations, "
+              f"{result['state_changes']} device state changes")
+    elif args.command == "corpus":
+        corpus = build_corpus(args.seed, args.per_gesture)
+        save_corpus(args.path, corpus)
+        print(f"✓ Saved {len(corpus['labels'])} hands to {args.path}")
+    else:
+        result = check_corpus(args.path)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+            return
+        print(f"🎯 {result['samples']} hands, accuracy {result['accuracy']:.1%}")
+        for condition, accuracy in result["by_condition"].items():
+            print(f"   {condition:10} {accuracy:.1%}")
+        if result["changed"]:
+            print(f"⚠ {result['changed']} predictions changed since the corpus was saved:")
+            for change, count in sorted(result["changes"].items(), key=lambda item: -item[1]):
+                print(f"   {change}: {count}")
+        else:
+            print("✓ No prediction changes since the corpus was saved")
+
+
+if __name__ == "__main__":
+    main()
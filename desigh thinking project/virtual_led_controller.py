@@ -20,6 +20,7 @@ INSTALLATION INSTRUCTIONS:
 
 2. Run the project:
    python virtual_led_controller.py
+   (add --startup-profile to see how long each startup phase takes)
 
 3. Exit:
    Press 'q' in the webcam window to quit safely
@@ -52,32 +53,119 @@ warnings.filterwarnings('ignore', category=DeprecationWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
 warnings.filterwarnings('ignore')
 
-print("=" * 70)
-print("🚀 VIRTUAL GESTURE CONTROLLER - STARTING UP")
-print("=" * 70)
-print("⚠️  FIRST TIME LOADING: This may take 1-3 minutes")
-print("⚠️  Please be patient while libraries load...")
-print("=" * 70)
-print()
+import time
+_IMPORT_START = time.perf_counter()
 
+# OpenCV is needed right away (GUI sprites); MediaPipe is loaded in the
+# background by load_hand_tracking() so the GUI can come up first
 import cv2
-# Import only vision components from mediapipe to avoid audio dependencies
-print("🔄 Loading MediaPipe (this is the slow part)...")
-from mediapipe.python.solutions import hands as mp_hands
-from mediapipe.python.solutions import drawing_utils as mp_drawing
-from mediapipe.python.solutions import drawing_styles as mp_drawing_styles
-print("✓ MediaPipe loaded!")
+import numpy as np
 
 import tkinter as tk
 from tkinter import ttk
 import threading
-import time
-from collections import deque
+from collections import deque, OrderedDict
 import math
+import random
+import base64
+import argparse
+
+# MediaPipe modules, set by load_hand_tracking()
+mp_hands = None
+mp_drawing = None
+mp_drawing_styles = None
+
+_CORE_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+if __name__ == "__main__":
+    # Helper modules (web dashboard, benchmarks, ...) import this file by name;
+    # register the running script under that name so they share its state
+    sys.modules.setdefault("virtual_led_controller", sys.modules[__name__])
 
 # Optional: Voice feedback (comment out if not needed)
 VOICE_ENABLED = False  # Disabled for stability
 
+# Optional: Web dashboard for watching/controlling this controller from a browser on the LAN
+DASHBOARD_ENABLED = False
+DASHBOARD_HOST = "127.0.0.1"  # "0.0.0.0" lets other PCs on the LAN connect
+DASHBOARD_PORT = 8080
+DASHBOARD_PROTECTED_TYPES = ("door_lock",)  # Device types the web may watch but not change
+
+# Optional: Per-stage frame-loop latency metrics (see pipeline_metrics.py)
+METRICS_ENABLED = False  # Also enabled by --metrics
+METRICS_CSV = "pipeline_metrics.csv"  # None to skip the CSV log
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9108  # Prometheus text endpoint at /metrics (None to disable)
+METRICS_INTERVAL = 10.0  # Seconds per export window
+METRICS_ACTUATION_CSV = "actuation_latency.csv"  # Gesture → device latency per actuation (None to skip)
+
+# Optional: Record what MediaPipe sees for offline replay (see landmark_recorder.py)
+RECORD_LANDMARKS = None  # Recording directory, e.g. "session.lmrec" (also set by --record)
+
+# Optional: On-demand profiling of the running controller: 'p' key, SIGUSR1 or control port (see runtime_profiler.py)
+PROFILER_ENABLED = False  # Also enabled by --profile or --profile-mode
+PROFILER_MODE = "sample"  # "sample" (all threads, low overhead) or "cprofile" (webcam + GUI threads, exact)
+PROFILER_DIR = "profiles"  # Timestamped .collapsed / .pstats files go here
+PROFILER_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+PROFILER_HOST = "127.0.0.1"
+PROFILER_PORT = 9109  # Local control port (None to disable)
+
+# Optional: Memory growth / leak tracking for long sessions (see memory_monitor.py)
+MEMORY_MONITOR_ENABLED = False  # Also enabled by --memory (tracemalloc slows Python allocations)
+MEMORY_DIR = "memory"  # memory_log.csv, top_sites.jsonl and tracemalloc snapshots
+MEMORY_INTERVAL = 60.0  # Seconds between samples
+MEMORY_TOP_N = 15  # Allocation sites logged per sample
+
+# Optional: Append-only log of every gesture and device change for usage analytics (see event_log.py)
+EVENT_LOG_ENABLED = False  # Also enabled by --events
+EVENT_LOG_DIR = "events"
+EVENT_LOG_USER = None  # Who is using the controller: per-user statistics and calibration (also set by --user)
+
+# Optional: Adapt model complexity and capture resolution to the machine at runtime (see quality_controller.py)
+QUALITY_CONTROL_ENABLED = False  # Also enabled by --adaptive-quality
+QUALITY_LEVELS = [  # (model_complexity, capture width, capture height), cheapest first
+    (0, 320, 240),
+    (0, 480, 360),
+    (0, 640, 480),  # What the pipeline starts with
+    (1, 640, 480),
+    (1, 960, 720),
+]
+QUALITY_MAX_INFERENCE_MS = 40.0  # Step down when p90 inference latency goes above this
+QUALITY_MIN_CONFIDENCE = 0.85  # Hand confidence below this makes stepping up more eager
+QUALITY_WINDOW = 90  # Frames measured per decision
+
+# Optional: Low-rate motion checks instead of hand tracking while nobody is there (see power_save.py)
+POWER_SAVE_ENABLED = False  # Also enabled by --power-save
+IDLE_AFTER_SECONDS = 10.0  # Seconds without a hand before going idle
+IDLE_FPS = 5  # Motion checks per second while idle (also asked of the camera)
+IDLE_CAPTURE_SIZE = (320, 240)  # Capture size while idle (None keeps the full size)
+IDLE_MOTION_FRACTION = 0.01  # Share of changed pixels that wakes the pipeline
+IDLE_WAKE_BUDGET_MS = 400  # Max. time from motion to full-rate tracking (idle interval + wake-up)
+
+# Optional: Capture only, with hand tracking done by a shared inference_server.py (building-wide setups)
+INFERENCE_SERVER = None  # Unix socket of the server, e.g. "/tmp/gesture-inference.sock" (also --inference-server)
+INFERENCE_CAMERA_NAME = None  # How this camera appears in the server's statistics (default: host name)
+INFERENCE_SLO_MS = 100.0  # Latency this camera asks the server for
+
+# Continuous control: pinch to dim, hand height for fan speed (see continuous_control.py)
+CONTINUOUS_CONTROL_ENABLED = False  # Also enabled by --continuous
+CONTINUOUS_CONTROLS = {"pinch": "LED1", "hand_height": "FAN1"}  # Control pose → device with a level
+CONTINUOUS_ENGAGE_FRAMES = 6  # Frames a control pose must be held before the level follows the hand
+CONTINUOUS_SMOOTHING = 0.3  # Weight of the newest frame in the moving average (lower = steadier)
+CONTINUOUS_LEVEL_STEP = 10  # Levels change in steps of this many percent
+CONTINUOUS_MIN_LEVEL = 10  # Lowest level a control sets (switching off stays a gesture)
+CONTINUOUS_MAX_UPDATES_PER_SEC = 5  # Per device; levels in between are merged into the next update
+
+# Speculative actions: reversible devices act before debounce confirms, undone if it doesn't (see speculative.py)
+SPECULATIVE_ENABLED = False  # Also enabled by --speculative
+SPECULATIVE_DEVICE_TYPES = ("led", "tv")  # Only where a briefly wrong state is harmless (never door_lock)
+SPECULATIVE_FRAMES = 2  # Matching frames before acting early (below DEBOUNCE_FRAMES; 1 undoes far more often)
+SPECULATIVE_MIN_CONFIDENCE = 0.9  # Hand confidence (handedness score) needed to act early
+
+# Optional: Frames too old to reach the screen in time are skipped before inference (see frame_deadline.py)
+FRAME_DEADLINE_MS = 0.0  # Capture → display budget per frame, 0 = off (also set by --frame-deadline)
+FRAME_DEADLINE_DEFAULT_MS = 100.0  # Budget for a bare --frame-deadline
+
 # =============================================================================
 # CONFIGURATION SECTION - CUSTOMIZE YOUR PROJECT HERE
 # =============================================================================
@@ -92,6 +180,9 @@ DEVICE_CONFIG = {
     "TV1": {"type": "tv", "color_on": "#4488FF", "color_off": "#1a1a1a", "label": "📺 Smart TV"},
 }
 
+# Device types with a 0-100% level (LED brightness, fan speed)
+LEVEL_DEVICE_TYPES = ("led", "fan", "rgb_strip")
+
 # Keep LED_CONFIG for backward compatibility
 LED_CONFIG = DEVICE_CONFIG
 
@@ -104,10 +195,28 @@ GESTURE_TO_LED = {
     'peace_sign': 'TV1'      # Two fingers (index+middle) → TV
 }
 
+# Scenes: one gesture applies a whole batch of device changes at once.
+# Map a gesture to a scene name in GESTURE_TO_LED to trigger it.
+# Each value is True (ON/UNLOCKED), False (OFF/LOCKED) or "toggle".
+SCENES = {}
+
 # Debounce settings to prevent flickering
 DEBOUNCE_FRAMES = 3  # Number of consecutive frames needed to confirm gesture (reduced for faster response)
 CONFIDENCE_THRESHOLD = 0.6  # Minimum detection confidence (lowered for better detection)
 
+# Gesture detection thresholds (tuned per user by calibrate.py, see USER_PROFILE_DIR)
+DETECTION_PARAMS = {
+    "finger_angle": 140,  # Degrees at the PIP joint above which a finger counts as extended
+    "thumb_offset": 0.05,  # Min. horizontal thumb tip-to-wrist distance for thumb up (normalized)
+}
+USER_PROFILE_DIR = "user_profiles"  # <user>.json written by calibrate.py, loaded with --user
+
+# Model warm-up: run inference on synthetic frames until latency settles,
+# so the user's first real gesture isn't the slowest one
+WARMUP_MIN_RUNS = 3  # Always run at least this many warm-up inferences
+WARMUP_MAX_RUNS = 30  # Give up waiting for a steady latency after this many
+WARMUP_TOLERANCE = 0.25  # "Stable" = last runs within ±25% of their median
+
 # GUI Settings
 WINDOW_TITLE = "♿ Accessible Gesture Controller"
 WINDOW_WIDTH = 900
@@ -115,6 +224,12 @@ WINDOW_HEIGHT = 700
 DEVICE_SIZE = 110  # Size of device displays
 LED_SIZE = DEVICE_SIZE  # Backward compatibility
 LED_GLOW_EFFECT = True  # Enable glow effect on LEDs
+SPRITE_CACHE_SIZE = 512  # Max pre-rendered device images kept in memory
+GRID_CELL_WIDTH = DEVICE_SIZE + 120  # Device grid cell incl. padding and label width
+GRID_CELL_HEIGHT = DEVICE_SIZE + 90
+GUI_ANIMATION_FPS = 20  # Frame rate while a visible fan/TV animates (GUI idles otherwise)
+GUI_HIDDEN_FPS = 2  # Throttled frame rate while the window is minimized or hidden
+ANIMATION_SPEED = 300  # Fan/TV animation speed in degrees per second
 
 # TV channel data for animation
 TV_CHANNELS = ["News 24", "Sports HD", "Movies", "Music TV", "Nature"]
@@ -135,15 +250,73 @@ import os
 
 CONFIG_FILE = "gesture_config.json"
 
+CONFIG_WATCH_ENABLED = True  # Reload gesture_config.json automatically when it changes
+CONFIG_POLL_INTERVAL = 1.0  # Seconds between checks of the config file's mtime
+
+# Mapping used when the config file doesn't override a gesture
+DEFAULT_GESTURE_TO_LED = dict(GESTURE_TO_LED)
+
+def parse_gesture_config(config_data):
+    """
+    Validate a parsed gesture_config.json.
+    
+    Args:
+        config_data: Object loaded from the JSON file
+    
+    Returns:
+        tuple: (gestures, scenes) ready to swap in
+    
+    Raises:
+        ValueError: If anything in the config is invalid
+    """
+    if not isinstance(config_data, dict):
+        raise ValueError("config must be a JSON object")
+    
+    scenes_data = config_data.get('scenes', {})
+    if not isinstance(scenes_data, dict):
+        raise ValueError("'scenes' must map scene names to device states")
+    scenes = {}
+    for name, changes in scenes_data.items():
+        if name in DEVICE_CONFIG:
+            raise ValueError(f"scene '{name}' clashes with a device ID")
+        if not isinstance(changes, dict):
+            raise ValueError(f"scene '{name}' must map device IDs to states")
+        for device_id, target in changes.items():
+            if device_id not in DEVICE_CONFIG:
+                raise ValueError(f"scene '{name}': unknown device '{device_id}'")
+            if target not in (True, False, "toggle"):
+                raise ValueError(f"scene '{name}': bad state {target!r} for '{device_id}'")
+        scenes[name] = dict(changes)
+    
+    gestures_data = config_data.get('gestures', {})
+    if not isinstance(gestures_data, dict):
+        raise ValueError("'gestures' must map gesture names to devices or scenes")
+    gestures = dict(DEFAULT_GESTURE_TO_LED)
+    for gesture, target in gestures_data.items():
+        if not isinstance(target, str) or (target not in DEVICE_CONFIG and target not in scenes):
+            raise ValueError(f"gesture '{gesture}': unknown device or scene {target!r}")
+        gestures[gesture] = target
+    
+    return gestures, scenes
+
+def read_gesture_config(path=CONFIG_FILE):
+    """Read and validate a config file; returns (gestures, scenes) or raises ValueError/OSError."""
+    with open(path, 'r') as f:
+        try:
+            config_data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}")
+    return parse_gesture_config(config_data)
+
 def load_custom_gestures():
-    """Load custom gesture mappings from config file."""
-    global GESTURE_TO_LED
+    """Load custom gesture mappings and scenes from config file."""
+    global GESTURE_TO_LED, SCENES
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                custom_config = json.load(f)
-                GESTURE_TO_LED.update(custom_config.get('gestures', {}))
-                print(f"✓ Loaded custom gesture mappings from {CONFIG_FILE}")
+            GESTURE_TO_LED, SCENES = read_gesture_config(CONFIG_FILE)
+            print(f"✓ Loaded custom gesture mappings from {CONFIG_FILE}")
+            if SCENES:
+                print(f"✓ Loaded {len(SCENES)} scenes: {', '.join(SCENES)}")
         except Exception as e:
             print(f"⚠ Could not load config: {e}")
 
@@ -152,20 +325,72 @@ def save_custom_gestures():
     try:
         config_data = {
             'gestures': GESTURE_TO_LED,
-            'info': 'Gesture to Device Mapping - Edit to customize'
+            'scenes': SCENES,
+            'info': 'Gesture to Device Mapping - Edit to customize. To trigger a scene, '
+                    'add it under "scenes" and map a gesture to its name'
         }
         with open(CONFIG_FILE, 'w') as f:
             json.dump(config_data, f, indent=4)
+            f.write("\n")
         print(f"✓ Saved gesture mappings to {CONFIG_FILE}")
     except Exception as e:
         print(f"⚠ Could not save config: {e}")
 
-# Load custom gestures if config file exists
-load_custom_gestures()
+def user_profile_path(user):
+    """Calibration profile file for a user (see calibrate.py)."""
+    return os.path.join(USER_PROFILE_DIR, f"{user}.json")
+
+def apply_detection_profile(detection, debounce_frames):
+    """
+    Switch detection thresholds and debounce length.
+
+    Args:
+        detection: Values for DETECTION_PARAMS (missing keys keep their value)
+        debounce_frames: New DEBOUNCE_FRAMES
+    """
+    global DEBOUNCE_FRAMES, gesture_history
+    unknown = set(detection) - set(DETECTION_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown detection parameters: {', '.join(sorted(unknown))}")
+    DETECTION_PARAMS.update({name: float(value) for name, value in detection.items()})
+    DEBOUNCE_FRAMES = int(debounce_frames)
+    gesture_history = deque(maxlen=DEBOUNCE_FRAMES)
+
+def load_user_profile(user):
+    """
+    Apply a user's calibrated thresholds if calibrate.py has saved a profile for them.
+
+    Returns:
+        bool: True if a profile was loaded
+    """
+    path = user_profile_path(user)
+    if not os.path.exists(path):
+        print(f"ℹ No calibration for {user} (run: python calibrate.py --user {user})")
+        return False
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+        apply_detection_profile(profile["detection"], profile["debounce_frames"])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠ Could not load calibration {path}: {e}")
+        return False
+    settings = ", ".join(f"{name}={value:g}" for name, value in DETECTION_PARAMS.items())
+    print(f"✓ Loaded calibration for {user}: {settings}, debounce={DEBOUNCE_FRAMES} frames")
+    return True
 
 # Device states (all start as OFF, door locks start as LOCKED which is False)
 led_states = {device_id: False for device_id in DEVICE_CONFIG.keys()}
 
+# Level in percent of devices with one (LEVEL_DEVICE_TYPES); kept while OFF and restored when switched ON
+device_levels = {device_id: 100 for device_id, config in DEVICE_CONFIG.items()
+                 if config.get('type', 'led') in LEVEL_DEVICE_TYPES}
+
+# Every batch of device changes bumps state_version exactly once, under state_lock.
+# GUI and overlay redraw only when the version moves; listeners get whole batches.
+state_lock = threading.Lock()
+state_version = 0
+device_listeners = []
+
 # Gesture debounce queue
 gesture_history = deque(maxlen=DEBOUNCE_FRAMES)
 
@@ -176,6 +401,121 @@ voice_engine = None
 running = True
 last_gesture = None
 
+# Live pipeline telemetry (written by the webcam thread, read by dashboards)
+telemetry = {
+    "fps": 0.0,
+    "frames": 0,
+    "hand_detected": False,
+    "last_gesture": None,
+}
+
+# Per-stage latency histograms (pipeline_metrics.PipelineMetrics), None when disabled
+stage_metrics = None
+
+# Landmark recording of the live pipeline (landmark_recorder.LandmarkRecorder), None when off
+landmark_recorder = None
+
+# On-demand profiler (runtime_profiler.RuntimeProfiler), None when off
+runtime_profiler = None
+
+# Memory monitor (memory_monitor.MemoryMonitor), None when off
+memory_monitor = None
+
+# Gesture/device event log (event_log.GestureEventTracker), None when off
+event_log = None
+
+# Callables other threads hand to the webcam thread, run between frames (e.g. starting cProfile there)
+frame_thread_calls = deque()
+
+# =============================================================================
+# CONFIG HOT-RELOAD
+# =============================================================================
+
+# A validated config waiting to be swapped in between frames
+config_lock = threading.Lock()
+pending_config = None
+config_status = {"reloads": 0, "last_result": "Loaded at startup", "error": False}
+config_listeners = []
+
+def add_config_listener(callback):
+    """Register callback(gestures, scenes), called after a new config is swapped in."""
+    config_listeners.append(callback)
+
+def remove_config_listener(callback):
+    """Unregister a callback added with add_config_listener()."""
+    if callback in config_listeners:
+        config_listeners.remove(callback)
+
+def apply_pending_config():
+    """
+    Swap in a validated config, if one is waiting.
+    
+    Called by the frame loop between frames (and by the watcher while no
+    pipeline is attached), so a frame never sees half a mapping.
+    """
+    global pending_config, GESTURE_TO_LED, SCENES
+    with config_lock:
+        if pending_config is None:
+            return False
+        GESTURE_TO_LED, SCENES = pending_config
+        pending_config = None
+        config_status["reloads"] += 1
+        telemetry["config_reloads"] = config_status["reloads"]
+    print(f"✓ Reloaded {CONFIG_FILE}: {len(GESTURE_TO_LED)} gestures, {len(SCENES)} scenes")
+    notify_config_listeners()
+    return True
+
+def notify_config_listeners():
+    """Tell config listeners about the current mapping; one failing listener doesn't stop the others."""
+    for listener in list(config_listeners):
+        try:
+            listener(GESTURE_TO_LED, SCENES)
+        except Exception as e:
+            print(f"⚠ Config listener failed: {e}")
+
+def config_watcher_thread(path=CONFIG_FILE, interval=CONFIG_POLL_INTERVAL):
+    """
+    Poll the config file's mtime and stage valid changes for the frame loop.
+    
+    Parsing and validation happen here, off the frame loop. Invalid files
+    are rejected and the running mapping stays untouched.
+    """
+    global pending_config
+    
+    def signature():
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    last_seen = signature()
+    while running:
+        time.sleep(interval)
+        current = signature()
+        if current == last_seen or current is None:
+            continue
+        last_seen = current
+        try:
+            new_config = read_gesture_config(path)
+        except (OSError, ValueError) as e:
+            config_status.update(last_result=f"Rejected {time.strftime('%H:%M:%S')}: {e}", error=True)
+            print(f"⚠ {CONFIG_FILE} rejected, keeping current mapping: {e}")
+            notify_config_listeners()  # Lets the settings window show the rejection
+            continue
+        
+        with config_lock:
+            pending_config = new_config
+            config_status.update(last_result=f"Reloaded {time.strftime('%H:%M:%S')}", error=False)
+        if not startup_status["ready"]:
+            apply_pending_config()  # No frame loop yet to pick it up
+
+def start_config_watcher():
+    """Watch gesture_config.json in the background (see CONFIG_WATCH_ENABLED)."""
+    watcher = threading.Thread(target=config_watcher_thread, name="config-watcher", daemon=True)
+    watcher.start()
+    return watcher
+
 # =============================================================================
 # GESTURE DETECTION FUNCTIONS
 # =============================================================================
@@ -232,14 +572,16 @@ def is_finger_extended(landmarks, finger_tip_id, finger_pip_id, finger_mcp_id, t
     # More lenient: just check if finger is relatively straight
     return angle > threshold
 
-def is_thumb_extended_up(landmarks):
-    """Check if thumb is extended upward with high precision."""
+def is_thumb_extended_up(landmarks, min_offset=None):
+    """Check if thumb is extended upward with high precision (min_offset defaults to DETECTION_PARAMS)."""
     THUMB_TIP, THUMB_IP, THUMB_MCP, WRIST = 4, 3, 2, 0
     
     # Thumb tip should be above thumb IP joint
     tip_above_ip = landmarks[THUMB_TIP].y < landmarks[THUMB_IP].y
     # Thumb should be extended outward (x-distance check)
-    thumb_out = abs(landmarks[THUMB_TIP].x - landmarks[WRIST].x) > 0.05
+    if min_offset is None:
+        min_offset = DETECTION_PARAMS["thumb_offset"]
+    thumb_out = abs(landmarks[THUMB_TIP].x - landmarks[WRIST].x) > min_offset
     
     return tip_above_ip and thumb_out
 
@@ -254,7 +596,7 @@ def is_thumb_extended_down(landmarks):
     
     return tip_below_ip and tip_below_index
 
-def detect_gesture(hand_landmarks):
+def detect_gesture(hand_landmarks, params=None):
     """
     PRECISION GESTURE DETECTION for accessibility.
     Designed for people with limited mobility - high accuracy, low false positives.
@@ -268,10 +610,14 @@ def detect_gesture(hand_landmarks):
     
     Args:
         hand_landmarks: MediaPipe hand landmarks
+        params: Detection thresholds (default: DETECTION_PARAMS; the inference
+                server keeps one set per camera)
     
     Returns:
         str: Gesture name or None
     """
+    if params is None:
+        params = DETECTION_PARAMS
     landmarks = hand_landmarks.landmark
     
     # MediaPipe landmark IDs
@@ -283,12 +629,13 @@ def detect_gesture(hand_landmarks):
     WRIST = 0
     
     # High-precision finger extension detection
-    thumb_up = is_thumb_extended_up(landmarks)
+    thumb_up = is_thumb_extended_up(landmarks, params["thumb_offset"])
     thumb_down = is_thumb_extended_down(landmarks)
-    index_extended = is_finger_extended(landmarks, INDEX_TIP, INDEX_PIP, INDEX_MCP, threshold=140)
-    middle_extended = is_finger_extended(landmarks, MIDDLE_TIP, MIDDLE_PIP, MIDDLE_MCP, threshold=140)
-    ring_extended = is_finger_extended(landmarks, RING_TIP, RING_PIP, RING_MCP, threshold=140)
-    pinky_extended = is_finger_extended(landmarks, PINKY_TIP, PINKY_PIP, PINKY_MCP, threshold=140)
+    angle = params["finger_angle"]
+    index_extended = is_finger_extended(landmarks, INDEX_TIP, INDEX_PIP, INDEX_MCP, threshold=angle)
+    middle_extended = is_finger_extended(landmarks, MIDDLE_TIP, MIDDLE_PIP, MIDDLE_MCP, threshold=angle)
+    ring_extended = is_finger_extended(landmarks, RING_TIP, RING_PIP, RING_MCP, threshold=angle)
+    pinky_extended = is_finger_extended(landmarks, PINKY_TIP, PINKY_PIP, PINKY_MCP, threshold=angle)
     
     # Count extended fingers (excluding thumb)
     fingers_extended = sum([index_extended, middle_extended, ring_extended, pinky_extended])
@@ -320,24 +667,28 @@ def detect_gesture(hand_landmarks):
     
     return None
 
-def debounce_gesture(gesture):
+def debounce_gesture(gesture, history=None):
     """
     Apply debounce logic to prevent flickering from hand jitter.
     Only confirms gesture if detected consistently across multiple frames.
     
     Args:
         gesture: Currently detected gesture
+        history: Debounce queue (default: the live pipeline's gesture_history;
+                 the inference server keeps one per camera)
     
     Returns:
         str: Confirmed gesture or None
     """
-    gesture_history.append(gesture)
+    if history is None:
+        history = gesture_history
+    history.append(gesture)
     
-    if len(gesture_history) < DEBOUNCE_FRAMES:
+    if len(history) < history.maxlen:
         return None
     
     # Check if all recent frames show the same gesture
-    if all(g == gesture for g in gesture_history):
+    if all(g == gesture for g in history):
         return gesture
     
     return None
@@ -346,6 +697,143 @@ def debounce_gesture(gesture):
 # DEVICE CONTROL FUNCTIONS
 # =============================================================================
 
+def reset_pipeline_state():
+    """
+    Put gesture tracking and every device back to their startup state.
+
+    Used before replaying a recording so each run starts identically.
+    """
+    global gesture_history, last_gesture
+    gesture_history = deque(maxlen=DEBOUNCE_FRAMES)
+    last_gesture = None
+    # One batch, so listeners (GUI, dashboard, event log) see channels and levels reset too
+    changes = {device_id: False for device_id in DEVICE_CONFIG}
+    changes.update({device_id: {"on": False, "channel": 0} for device_id in TV_CHANNEL_INDEX})
+    changes.update({device_id: {"level": 100, "on": False} for device_id in device_levels})
+    apply_device_changes(changes)
+
+def device_status(device_id):
+    """
+    Describe one device's current state for display and backends.
+
+    Args:
+        device_id: ID of the device
+
+    Returns:
+        dict: {"on": bool} plus "channel" for TVs and "level" (percent) for
+              LEVEL_DEVICE_TYPES
+    """
+    status = {"on": led_states[device_id]}
+    if DEVICE_CONFIG[device_id].get('type', 'led') == 'tv':
+        status["channel"] = TV_CHANNELS[TV_CHANNEL_INDEX.get(device_id, 0)]
+    if device_id in device_levels:
+        status["level"] = device_levels[device_id]
+    return status
+
+def get_device_states(device_ids=None):
+    """
+    Return (state_version, {device_id: status}) as one consistent snapshot.
+    
+    Args:
+        device_ids: Only include these devices (default: all)
+    """
+    with state_lock:
+        if device_ids is None:
+            device_ids = led_states.keys()
+        return state_version, {device_id: device_status(device_id) for device_id in device_ids}
+
+def add_device_listener(callback):
+    """
+    Register a backend to receive device changes.
+
+    The callback is called as callback(version, changes) once per batch,
+    where changes maps each changed device ID to its device_status().
+    """
+    device_listeners.append(callback)
+
+def remove_device_listener(callback):
+    """Unregister a backend added with add_device_listener()."""
+    if callback in device_listeners:
+        device_listeners.remove(callback)
+
+def apply_device_changes(changes):
+    """
+    Apply a batch of device state changes as one atomic update.
+
+    Args:
+        changes: Dict of device_id → True, False, "toggle", {"level": percent}
+                 or {"on": bool, "channel": index}.
+                 "toggle" on a TV that is already ON moves to the next channel.
+                 A level (devices in LEVEL_DEVICE_TYPES) also switches the
+                 device ON, unless "on": False is given with it; level 0
+                 switches it OFF and keeps the last level.
+                 A channel sets a TV's exact state (undoing a channel change).
+
+    Returns:
+        dict: The devices that actually changed (device_id → device_status())
+    """
+    global state_version
+
+    with state_lock:
+        changed = {}
+        for device_id, target in changes.items():
+            if device_id not in led_states:
+                continue
+            current = led_states[device_id]
+            device_type = DEVICE_CONFIG[device_id].get('type', 'led')
+
+            if isinstance(target, dict) and "channel" in target:
+                if device_type != 'tv':
+                    continue
+                on, index = bool(target.get("on", True)), target["channel"] % len(TV_CHANNELS)
+                if current == on and TV_CHANNEL_INDEX.get(device_id, 0) == index:
+                    continue
+                led_states[device_id] = on
+                TV_CHANNEL_INDEX[device_id] = index
+                changed[device_id] = device_status(device_id)
+                continue
+
+            if isinstance(target, dict):
+                if device_id not in device_levels:
+                    continue
+                level = max(0, min(100, int(target["level"])))
+                if level == 0:
+                    target = False
+                else:
+                    on = bool(target.get("on", True))
+                    if current == on and device_levels[device_id] == level:
+                        continue
+                    device_levels[device_id] = level
+                    led_states[device_id] = on
+                    changed[device_id] = device_status(device_id)
+                    continue
+
+            if target == "toggle":
+                if device_type == 'tv' and current:
+                    TV_CHANNEL_INDEX[device_id] = (TV_CHANNEL_INDEX.get(device_id, 0) + 1) % len(TV_CHANNELS)
+                    changed[device_id] = device_status(device_id)
+                    continue
+                target = not current
+
+            if bool(target) != current:
+                led_states[device_id] = bool(target)
+                if device_type == 'tv' and target:
+                    TV_CHANNEL_INDEX[device_id] = 0
+                changed[device_id] = device_status(device_id)
+
+        if not changed:
+            return changed
+        state_version += 1
+        version = state_version
+
+    # Notify outside the lock so a slow backend never blocks the frame loop's next update
+    for listener in list(device_listeners):
+        try:
+            listener(version, changed)
+        except Exception as e:
+            print(f"⚠ Device listener failed: {e}")
+    return changed
+
 def toggle_led(led_id):
     """
     Toggle the state of a specific device (LED, Fan, Door Lock, TV).
@@ -353,31 +841,42 @@ def toggle_led(led_id):
     Args:
         led_id: ID of the device to toggle
     """
-    global led_states, TV_CHANNEL_INDEX
+    changed = apply_device_changes({led_id: "toggle"})
     
-    if led_id in led_states:
+    if led_id in changed:
         device_type = DEVICE_CONFIG[led_id].get('type', 'led')
+        status = changed[led_id]
         
         # Special handling for TV - cycles through channels when ON
-        if device_type == 'tv':
-            if not led_states[led_id]:
-                led_states[led_id] = True
-                TV_CHANNEL_INDEX[led_id] = 0
-                print(f"✓ {DEVICE_CONFIG[led_id]['label']} is now ON (Channel: {TV_CHANNELS[0]})")
-            else:
-                TV_CHANNEL_INDEX[led_id] = (TV_CHANNEL_INDEX[led_id] + 1) % len(TV_CHANNELS)
-                channel = TV_CHANNELS[TV_CHANNEL_INDEX[led_id]]
-                print(f"✓ {DEVICE_CONFIG[led_id]['label']} - Channel: {channel}")
+        if device_type == 'tv' and status["on"]:
+            print(f"✓ {DEVICE_CONFIG[led_id]['label']} - Channel: {status['channel']}")
         else:
-            led_states[led_id] = not led_states[led_id]
-            state = "ON" if led_states[led_id] else "OFF"
+            state = "ON" if status["on"] else "OFF"
             
             # Special labels for door lock
             if device_type == 'door_lock':
-                state = "UNLOCKED" if led_states[led_id] else "LOCKED"
+                state = "UNLOCKED" if status["on"] else "LOCKED"
             
             print(f"✓ {DEVICE_CONFIG[led_id]['label']} is now {state}")
 
+def activate_scene(scene_name):
+    """
+    Apply every device change in a scene as one batch.
+    
+    Args:
+        scene_name: Name of the scene in SCENES
+    """
+    changed = apply_device_changes(SCENES[scene_name])
+    print(f"✓ Scene '{scene_name}' applied ({len(changed)} devices changed)")
+
+def describe_target(target):
+    """Return a display name for a gesture target (device or scene)."""
+    if target in SCENES:
+        return f"🎬 Scene: {target.replace('_', ' ').title()}"
+    if target in DEVICE_CONFIG:
+        return DEVICE_CONFIG[target]['label']
+    return f"⚠ Unknown: {target}"
+
 def process_gesture_action(gesture):
     """
     Process detected gesture and trigger corresponding LED action.
@@ -390,8 +889,11 @@ def process_gesture_action(gesture):
     if gesture and gesture in GESTURE_TO_LED:
         # Only trigger if it's a new gesture (not repeated)
         if gesture != last_gesture:
-            led_id = GESTURE_TO_LED[gesture]
-            toggle_led(led_id)
+            target = GESTURE_TO_LED[gesture]
+            if target in SCENES:
+                activate_scene(target)
+            else:
+                toggle_led(target)
             last_gesture = gesture
     elif gesture is None:
         # Reset when no gesture detected
@@ -401,107 +903,458 @@ def process_gesture_action(gesture):
 # WEBCAM PROCESSING THREAD
 # =============================================================================
 
-def webcam_processing_thread():
+def build_overlay_lines(states, max_y=None):
     """
-    Main webcam processing thread - ULTRA STABLE VERSION.
-    No freezing, no hangs - just pure frame processing.
+    Build the device status lines drawn on the webcam feed.
+    
+    Args:
+        states: Dict of device_id → device_status() from get_device_states()
+        max_y: Stop once lines would go below this y (large installations)
+    
+    Returns:
+        list: (text, BGR color, y) tuples
     """
-    global running
+    lines = []
+    y = 70
+    for dev_id, status in states.items():
+        if max_y is not None and y > max_y:
+            break
+        state = status["on"]
+        dev_type = DEVICE_CONFIG[dev_id].get('type', 'led')
+        if dev_type == 'door_lock':
+            text = "UNLOCKED" if state else "LOCKED"
+        else:
+            text = "ON" if state else "OFF"
+            if state and status.get("level", 100) < 100:
+                text += f" {status['level']}%"
+        color = (0, 255, 0) if state else (0, 0, 255)
+        lines.append((f"{DEVICE_CONFIG[dev_id]['label']}: {text}", color, y))
+        y += 25
+    return lines
+
+def draw_overlay(frame, overlay_lines):
+    """
+    Draw the device status lines and the quit hint onto a webcam frame.
+
+    Args:
+        frame: BGR frame to draw on (modified in place)
+        overlay_lines: Lines from build_overlay_lines()
+    """
+    for text, color, y in overlay_lines:
+        cv2.putText(frame, text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    cv2.putText(frame, "Press 'q' to quit", (10, frame.shape[0] - 10),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+class StartupProfiler:
+    """Records how long each startup phase takes (thread-safe; phases may overlap)."""
+    
+    def __init__(self):
+        self.start = _IMPORT_START
+        self.phases = []  # (name, seconds, thread name)
+        self.milestones = []  # (name, seconds since start)
+        self.lock = threading.Lock()
+    
+    def record(self, name, seconds):
+        """Add a phase measured elsewhere."""
+        with self.lock:
+            self.phases.append((name, seconds, threading.current_thread().name))
+    
+    def phase(self, name):
+        """Context manager timing one phase."""
+        profiler = self
+        
+        class _Phase:
+            def __enter__(self):
+                self.t0 = time.perf_counter()
+            
+            def __exit__(self, *exc):
+                profiler.record(name, time.perf_counter() - self.t0)
+        
+        return _Phase()
+    
+    def milestone(self, name):
+        """Mark a point in time (e.g. GUI visible) relative to module import."""
+        with self.lock:
+            self.milestones.append((name, time.perf_counter() - self.start))
+    
+    def report(self):
+        """Print the per-phase breakdown."""
+        with self.lock:
+            phases, milestones = list(self.phases), list(self.milestones)
+        print("\n" + "=" * 60)
+        print("⏱  STARTUP PROFILE")
+        print("=" * 60)
+        for name, seconds, thread in phases:
+            where = "" if thread == "MainThread" else f"  ({thread})"
+            print(f"   {name:32} {seconds * 1000:9.1f} ms{where}")
+        print("-" * 60)
+        for name, seconds in milestones:
+            print(f"   {name + ' after':32} {seconds * 1000:9.1f} ms")
+        print("=" * 60 + "\n")
+
+startup_profile = StartupProfiler()
+startup_profile.record("import cv2/numpy/tkinter", _CORE_IMPORT_SECONDS)
+STARTUP_PROFILE_ENABLED = False  # Set by --startup-profile
+
+# Background startup progress, shown in the GUI while the camera pipeline loads
+startup_status = {"stage": "Starting...", "ready": False, "error": False}
+
+def set_startup_status(stage, ready=False, error=False):
+    """Report startup progress to the console, GUI and telemetry."""
+    startup_status.update(stage=stage, ready=ready, error=error)
+    telemetry["startup"] = stage
+    print(stage)
+
+def load_hand_tracking():
+    """
+    Import MediaPipe and build the Hands model (the slow part of startup).
+    
+    Returns:
+        mp_hands.Hands: Ready-to-use hand detector
+    """
+    global mp_hands, mp_drawing, mp_drawing_styles
+    
+    set_startup_status("🔄 Loading MediaPipe (first run can take 1-3 minutes)...")
+    with startup_profile.phase("import mediapipe"):
+        # Import only vision components from mediapipe to avoid audio dependencies
+        from mediapipe.python.solutions import hands as hands_module
+        from mediapipe.python.solutions import drawing_utils
+        from mediapipe.python.solutions import drawing_styles
+    mp_hands, mp_drawing, mp_drawing_styles = hands_module, drawing_utils, drawing_styles
+    
+    set_startup_status("🔄 Starting hand detection...")
+    with startup_profile.phase("Hands model init"):
+        return build_hands()
+
+def build_hands(model_complexity=0):
+    """
+    Create a Hands model (MediaPipe must already be imported by load_hand_tracking()).
     
-    print("🔄 Initializing webcam...")
+    Args:
+        model_complexity: 0 (fast) or 1 (more accurate landmarks, slower)
+    
+    Returns:
+        mp_hands.Hands: Hand detector
+    """
+    return mp_hands.Hands(
+        model_complexity=model_complexity,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+        max_num_hands=1
+    )
+
+def run_warmup(hands, width, height):
+    """
+    Time inferences on a rendered hand until the per-call latency settles.
     
+    A frame with a hand makes both the palm detector and the landmark model
+    run, as they will on the first real gesture. A final frame without the
+    hand clears the tracked hand so it can't leak into the live stream.
+    
+    Returns:
+        list: Seconds per inference, first to last
+    """
+    import synthetic_hands
+    frame = cv2.cvtColor(synthetic_hands.render_hand_frame(width=width, height=height), cv2.COLOR_BGR2RGB)
+    latencies = []
+    for _ in range(WARMUP_MAX_RUNS):
+        t0 = time.perf_counter()
+        hands.process(frame)
+        latencies.append(time.perf_counter() - t0)
+        if len(latencies) >= WARMUP_MIN_RUNS:
+            recent = sorted(latencies[-WARMUP_MIN_RUNS:])
+            median = recent[len(recent) // 2]
+            if all(abs(latency - median) <= WARMUP_TOLERANCE * median for latency in recent):
+                break
+    hands.process(np.zeros_like(frame))  # Hand leaves view
+    return latencies
+
+def warm_up_hands(hands, width, height):
+    """
+    Warm up the Hands model during startup and report how long it took.
+    
+    Updates the startup status line, telemetry and the startup profile.
+    
+    Args:
+        hands: mp_hands.Hands instance
+        width: Frame width the pipeline will use
+        height: Frame height the pipeline will use
+    
+    Returns:
+        dict: Warm-up statistics (also stored in telemetry)
+    """
+    set_startup_status("🔄 Warming up hand detection...")
+    start = time.perf_counter()
+    latencies = run_warmup(hands, width, height)
+    
+    stats = {
+        "warmup_ms": round((time.perf_counter() - start) * 1000, 1),
+        "warmup_runs": len(latencies),
+        "first_inference_ms": round(latencies[0] * 1000, 1),
+        "steady_inference_ms": round(latencies[-1] * 1000, 1),
+    }
+    telemetry.update(stats)
+    startup_profile.record("model warm-up", stats["warmup_ms"] / 1000)
+    print(f"✓ Warm-up: {stats['warmup_runs']} runs in {stats['warmup_ms']} ms "
+          f"(first {stats['first_inference_ms']} ms → steady {stats['steady_inference_ms']} ms)")
+    return stats
+
+def open_webcam():
+    """Open and configure the webcam; returns None if it can't be opened."""
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
-        print("❌ ERROR: Cannot open webcam!")
-        running = False
-        return
-    
+        return None
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-    print("✓ Webcam ready")
-    print("🔄 Starting hand detection...")
+    return cap
+
+def webcam_processing_thread():
+    """
+    Main webcam processing thread - ULTRA STABLE VERSION.
+    No freezing, no hangs - just pure frame processing.
     
-    # Minimal window creation
-    window_name = 'Virtual LED Controller - Webcam Feed'
-    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    Runs in the background while the GUI is already up: opens the webcam
+    (in parallel with loading MediaPipe), then attaches the frame loop.
+    """
+    global running
+    
+    camera = {}
+    
+    def open_webcam_job():
+        with startup_profile.phase("open webcam"):
+            camera["cap"] = open_webcam()
+    
+    camera_thread = threading.Thread(target=open_webcam_job, name="webcam-open", daemon=True)
+    camera_thread.start()
     
     hands = None
     try:
-        hands = mp_hands.Hands(
-            model_complexity=0,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            max_num_hands=1
-        )
-        print("✓ Hand detection ready!")
-        print("🎉 Running! Show your hand\n")
+        hands = load_hand_tracking()
     except Exception as e:
-        print(f"❌ Failed to load hand detection: {e}")
-        cap.release()
-        cv2.destroyAllWindows()
+        set_startup_status(f"❌ Failed to load hand detection: {e}", error=True)
+        camera_thread.join()
+        if camera.get("cap") is not None:
+            camera["cap"].release()
         running = False
         return
     
+    camera_thread.join()
+    cap = camera.get("cap")
+    if cap is None:
+        set_startup_status("❌ ERROR: Cannot open webcam!", error=True)
+        hands.close()
+        running = False
+        return
+    
+    # Warm up at the capture resolution before reporting ready
+    capture_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+    capture_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+    warm_up_hands(hands, capture_width, capture_height)
+    quality = None
+    if QUALITY_CONTROL_ENABLED:
+        import quality_controller
+        quality = quality_controller.start_quality_controller(
+            QUALITY_LEVELS, capture_width, capture_height, QUALITY_MAX_INFERENCE_MS, QUALITY_MIN_CONFIDENCE,
+            QUALITY_WINDOW)
+    power = None
+    if POWER_SAVE_ENABLED:
+        import power_save
+        power = power_save.start_power_save(IDLE_AFTER_SECONDS, IDLE_FPS, IDLE_CAPTURE_SIZE, IDLE_MOTION_FRACTION,
+                                            IDLE_WAKE_BUDGET_MS)
+    continuous = None
+    if CONTINUOUS_CONTROL_ENABLED:
+        import continuous_control
+        continuous = continuous_control.start_continuous_control(
+            CONTINUOUS_CONTROLS, CONTINUOUS_ENGAGE_FRAMES, CONTINUOUS_SMOOTHING, CONTINUOUS_LEVEL_STEP,
+            CONTINUOUS_MIN_LEVEL, CONTINUOUS_MAX_UPDATES_PER_SEC)
+    speculative = None
+    if SPECULATIVE_ENABLED:
+        import speculative as speculative_module
+        speculative = speculative_module.start_speculative(SPECULATIVE_DEVICE_TYPES, SPECULATIVE_FRAMES,
+                                                           SPECULATIVE_MIN_CONFIDENCE)
+    deadline = None
+    if FRAME_DEADLINE_MS:
+        import frame_deadline
+        deadline = frame_deadline.start_frame_deadline(FRAME_DEADLINE_MS, cap)
+    
+    # Minimal window creation
+    window_name = 'Virtual LED Controller - Webcam Feed'
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    
+    set_startup_status("✓ Hand detection ready! Show your hand", ready=True)
+    startup_profile.milestone("Pipeline ready")
+    if STARTUP_PROFILE_ENABLED:
+        startup_profile.report()
+    
     frame_count = 0
     display_frame = None
+    overlay_version = -1
+    overlay_lines = []
+    fps_start = time.monotonic()
+    fps_frames = 0
+    metrics = stage_metrics  # Local: a None check per stage is all it costs when disabled
+    actuations = metrics.actuations if metrics else None
+    recorder = landmark_recorder
+    events = event_log
+    clock = time.perf_counter
+    profiler = runtime_profiler
+    if profiler:
+        profiler.register_thread("webcam", frame_thread_calls.append)
     
     while running:
         try:
+            # Swap in a reloaded gesture_config.json between frames
+            if pending_config is not None:
+                apply_pending_config()
+            while frame_thread_calls:
+                frame_thread_calls.popleft()()
+            # Swap in a Hands model / capture size the quality controller prepared in the background
+            if quality and quality.pending and not (power and power.idle):
+                hands = quality.swap(hands, cap)
+            
             # Read frame - if fails, skip
-            ret, frame = cap.read()
+            if metrics:
+                frame_start = t = clock()
+            if deadline:
+                # Skips buffered frames that are already too old (not while idling)
+                ret, frame = deadline.read(cap, drain=not (power and power.idle))
+            else:
+                ret, frame = cap.read()
             if not ret or frame is None:
                 continue
+            if metrics:
+                capture_ts = t = metrics.lap("capture", t)  # Frame timestamp for end-to-end latency
+            elif recorder or events:
+                capture_ts = clock()
+            if deadline:
+                capture_ts = deadline.capture_ts
             
             frame_count += 1
+            fps_frames += 1
+            now = time.monotonic()
+            if now - fps_start >= 1.0:
+                telemetry["fps"] = round(fps_frames / (now - fps_start), 1)
+                telemetry["frames"] = frame_count
+                fps_start, fps_frames = now, 0
+            
+            # Idle: only look for motion, at a low rate, until someone shows up
+            if power and power.idle and not power.wake_on_motion(frame):
+                cv2.imshow(window_name, power.idle_view(frame))
+                key = cv2.waitKey(power.idle_wait_ms()) & 0xFF
+                if key == ord('q') or key == 27:
+                    break
+                continue
+            
             frame = cv2.flip(frame, 1)
             h, w = frame.shape[:2]
             
-            # Convert color ONLY when needed
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Convert color ONLY when needed (shrunk first if the camera ignored a lower quality level)
+            if quality and quality.resize:
+                rgb = cv2.cvtColor(cv2.resize(frame, quality.resize, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+            else:
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if metrics:
+                t = metrics.lap("convert", t)
+            # Don't spend inference on a frame that can no longer be shown in time
+            if deadline and not deadline.admit("convert"):
+                continue
             
             # Process gesture (wrapped in try-except)
             try:
+                infer_start = time.perf_counter()
                 results = hands.process(rgb)
+                if deadline:
+                    deadline.mark("inference")
+                if quality:
+                    quality.observe(time.perf_counter() - infer_start, results)
+                if "first_live_inference_ms" not in telemetry:
+                    telemetry["first_live_inference_ms"] = round((time.perf_counter() - infer_start) * 1000, 1)
+                if metrics:
+                    t = metrics.lap("inference", t)
+                if recorder:
+                    recorder.add(capture_ts, results)
+                telemetry["hand_detected"] = bool(results.multi_hand_landmarks)
+                if power:
+                    power.observe(telemetry["hand_detected"], cap)
                 if results.multi_hand_landmarks:
                     for landmark in results.multi_hand_landmarks:
                         mp_drawing.draw_landmarks(frame, landmark, mp_hands.HAND_CONNECTIONS,
                                                 mp_drawing_styles.get_default_hand_landmarks_style(),
                                                 mp_drawing_styles.get_default_hand_connections_style())
+                        if metrics:
+                            t = metrics.lap("landmarks", t)
                         
                         gesture = detect_gesture(landmark)
+                        if metrics:
+                            t = metrics.lap("detect", t)
                         confirmed = debounce_gesture(gesture)
+                        if metrics:
+                            t = metrics.lap("debounce", t)
+                            actuations.observe(gesture, capture_ts)
+                        if events:
+                            events.observe(gesture, confirmed, capture_ts)
+                        if speculative:
+                            # Acts early on LEDs/TV, or commits / undoes an earlier action
+                            speculative.observe(gesture, confirmed,
+                                                results.multi_handedness[0].classification[0].score)
                         if confirmed:
+                            if metrics:
+                                actuations.dispatch(confirmed, capture_ts, t)
                             process_gesture_action(confirmed)
+                            if metrics:
+                                actuations.finish()
+                            if events:
+                                events.dispatched()
+                            telemetry["last_gesture"] = confirmed
                             cv2.putText(frame, f"Gesture: {confirmed.replace('_', ' ').title()}",
                                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                            if metrics:
+                                t = metrics.lap("actuate", t)
+                else:
+                    # Hand gone: the next gesture is a new onset
+                    if metrics:
+                        actuations.observe(None, capture_ts)
+                    if events:
+                        events.observe(None, None, capture_ts)
+                    if speculative:
+                        speculative.observe(None, None, None)
+                # Pinch / hand height levels (rate-limited; most frames send nothing)
+                if continuous:
+                    continuous.update(results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None)
+                    level_text = continuous.overlay_text()
+                    if level_text:
+                        cv2.putText(frame, level_text, (10, h - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2)
             except:
                 pass
+            if deadline:
+                deadline.mark("gesture")
             
-            # Draw device states - fast version
-            y = 70
-            for dev_id, state in led_states.items():
-                dev_type = DEVICE_CONFIG[dev_id].get('type', 'led')
-                if dev_type == 'door_lock':
-                    status = "UNLOCKED" if state else "LOCKED"
-                    color = (0, 255, 0) if state else (0, 0, 255)
-                else:
-                    status = "ON" if state else "OFF"
-                    color = (0, 255, 0) if state else (0, 0, 255)
-                cv2.putText(frame, f"{DEVICE_CONFIG[dev_id]['label']}: {status}",
-                          (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-                y += 25
-            
-            cv2.putText(frame, "Press 'q' to quit", (10, h - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Draw device states - status lines are rebuilt only when state_version moves
+            if overlay_version != state_version:
+                overlay_version, states = get_device_states()
+                overlay_lines = build_overlay_lines(states, max_y=h - 30)
+            draw_overlay(frame, overlay_lines)
+            if metrics:
+                t = metrics.lap("overlay", t)
+            if deadline:
+                deadline.mark("overlay")
             
             # Display
             cv2.imshow(window_name, frame)
             
             # Non-blocking key check
             key = cv2.waitKey(1) & 0xFF
+            if metrics:
+                metrics.lap("display", t)
+                metrics.end_frame(frame_start)
+            if deadline:
+                deadline.finish()
             if key == ord('q') or key == 27:  # q or ESC
                 break
+            if key == ord('p') and profiler:
+                profiler.toggle()
                 
         except KeyboardInterrupt:
             break
@@ -511,6 +1364,8 @@ def webcam_processing_thread():
     
     # Cleanup
     running = False
+    if profiler:
+        profiler.unregister_thread("webcam")
     try:
         cap.release()
         cv2.destroyAllWindows()
@@ -518,8 +1373,191 @@ def webcam_processing_thread():
         pass
     if hands:
         hands.close()
+    if quality:
+        quality.close()
+    if power:
+        power.report()
+    if continuous:
+        continuous.report()
+    if speculative:
+        speculative.report()
+    if deadline:
+        deadline.report()
     print("✓ Webcam closed")
 
+# =============================================================================
+# DEVICE SPRITES - Pre-rendered device visuals
+# =============================================================================
+
+def hex_to_bgr(color):
+    """Convert a '#RRGGBB' colour to an OpenCV BGR tuple."""
+    color = color.lstrip('#')
+    return (int(color[4:6], 16), int(color[2:4], 16), int(color[0:2], 16))
+
+def dim_color(color, level):
+    """
+    Scale a '#RRGGBB' colour to a brightness level in percent.
+    
+    Never fully dark, so a dimmed LED still reads as ON.
+    """
+    if level >= 100:
+        return color
+    factor = 0.25 + 0.75 * level / 100
+    color = color.lstrip('#')
+    return '#' + ''.join(f"{round(int(color[i:i + 2], 16) * factor):02X}" for i in (0, 2, 4))
+
+def sprite_frame(device_type, state, animation_angle):
+    """
+    Return the animation frame a device shows at the given angle.
+    
+    Static devices always use frame 0. A running fan repeats every 120°
+    (three blades), so it only needs 8 frames instead of 24.
+    """
+    if device_type == 'fan' and state:
+        return animation_angle % 120
+    if device_type == 'tv' and state:
+        return animation_angle
+    return 0
+
+def render_device_sprite(device_type, state, frame, size, color_on, color_off, glow=LED_GLOW_EFFECT):
+    """
+    Rasterize one device visual into an image.
+    
+    Mirrors the original procedural Tk drawing. TV channel names are not
+    baked in; the GUI draws them as a canvas text item on top.
+    
+    Args:
+        device_type: led, fan, buzzer, rgb_strip, door_lock or tv
+        state: Device ON/OFF
+        frame: Animation frame from sprite_frame()
+        size: Width/height in pixels
+        color_on: Hex colour when ON
+        color_off: Hex colour when OFF
+        glow: Draw LED glow when ON
+    
+    Returns:
+        numpy.ndarray: size x size BGR image
+    """
+    img = np.empty((size, size, 3), dtype=np.uint8)
+    img[:] = hex_to_bgr('#1a1a1a')
+    center = size // 2
+    color = hex_to_bgr(color_on if state else color_off)
+    outline = hex_to_bgr('#555555')
+    aa = cv2.LINE_AA
+    
+    if device_type == 'led':
+        if state and glow:
+            cv2.circle(img, (center, center), center, color, -1, aa)
+        radius = center - 10
+        cv2.circle(img, (center, center), radius, color, -1, aa)
+        cv2.circle(img, (center, center), radius, outline, 2, aa)
+    
+    elif device_type == 'fan':
+        if state:
+            for i in range(3):
+                blade_angle = math.radians(frame + (i * 120))
+                x1 = center + math.cos(blade_angle) * 10
+                y1 = center + math.sin(blade_angle) * 10
+                x2 = center + math.cos(blade_angle) * (center - 10)
+                y2 = center + math.sin(blade_angle) * (center - 10)
+                cv2.line(img, (round(x1), round(y1)), (round(x2), round(y2)), color, 6, aa)
+        cv2.circle(img, (center, center), 30, color, 3, aa)
+        cv2.circle(img, (center, center), 5, color, -1, aa)
+    
+    elif device_type == 'buzzer':
+        cv2.rectangle(img, (center - 20, center - 25), (center + 20, center + 25), color, -1)
+        cv2.rectangle(img, (center - 20, center - 25), (center + 20, center + 25), outline, 2)
+        if state:
+            for i in range(1, 4):
+                axes = (round(i * 7.5), i * 10)
+                cv2.ellipse(img, (round(center + 20 + i * 7.5), center), axes, 0, -90, 90, color, 2, aa)
+    
+    elif device_type == 'rgb_strip':
+        strip_width = size - 20
+        led_count = 5
+        led_spacing = strip_width // led_count
+        for i in range(led_count):
+            x = 10 + i * led_spacing
+            cv2.rectangle(img, (x, center - 10), (x + led_spacing - 5, center + 10), color, -1)
+            cv2.rectangle(img, (x, center - 10), (x + led_spacing - 5, center + 10), outline, 1)
+    
+    elif device_type == 'door_lock':
+        if state:  # Unlocked (open) - shackle swung down
+            cv2.ellipse(img, (center, center - 20), (15, 10), 0, 0, 180, color, 4, aa)
+        else:  # Locked (closed)
+            cv2.ellipse(img, (center, center - 20), (15, 15), 0, 180, 360, color, 4, aa)
+        cv2.rectangle(img, (center - 20, center - 10), (center + 20, center + 20), color, -1)
+        cv2.rectangle(img, (center - 20, center - 10), (center + 20, center + 20), outline, 2)
+        cv2.circle(img, (center, center + 3), 3, hex_to_bgr('#1a1a1a'), -1, aa)
+    
+    elif device_type == 'tv':
+        # TV frame (bezel)
+        cv2.rectangle(img, (5, 5), (size - 5, size - 5), hex_to_bgr('#333333'), -1)
+        cv2.rectangle(img, (5, 5), (size - 5, size - 5), hex_to_bgr('#666666'), 3)
+        if state:  # TV ON - animated scan lines
+            cv2.rectangle(img, (15, 15), (size - 15, size - 25), hex_to_bgr('#000055'), -1)
+            for i in range(5):
+                y = 20 + (i * 15) + (frame // 10) % 15
+                if y < size - 25:
+                    cv2.line(img, (15, y), (size - 15, y), (255, 255, 255), 1)
+            cv2.circle(img, (center, size - 12), 3, hex_to_bgr('#00FF00'), -1, aa)
+        else:  # TV OFF - static noise
+            cv2.rectangle(img, (15, 15), (size - 15, size - 25), hex_to_bgr('#1a1a1a'), -1)
+            rng = random.Random(int(frame / 10))
+            for _ in range(30):
+                x = rng.randint(15, size - 15)
+                y = rng.randint(15, size - 25)
+                gray = hex_to_bgr(rng.choice(['#333333', '#555555', '#777777']))
+                cv2.rectangle(img, (x, y), (x + 2, y + 2), gray, -1)
+            cv2.circle(img, (center, size - 12), 3, hex_to_bgr('#FF0000'), -1, aa)
+    
+    return img
+
+class SpriteCache:
+    """
+    LRU cache of pre-rendered device sprites as Tk PhotoImages.
+    
+    Sprites are keyed by everything that changes their pixels (type, state,
+    animation frame, size, colours), so devices that look the same share one
+    image. Evicted images stay alive while a canvas still holds a reference.
+    """
+    
+    def __init__(self, master, max_sprites=SPRITE_CACHE_SIZE):
+        self.master = master
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+    
+    def get(self, device_type, state, frame, size, color_on, color_off):
+        """
+        Return the PhotoImage for a device look, rendering it on first use.
+        
+        Returns None if the sprite could not be encoded; the caller then
+        draws the device directly.
+        """
+        key = (device_type, state, frame, size, color_on, color_off, LED_GLOW_EFFECT)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        
+        self.misses += 1
+        img = render_device_sprite(device_type, state, frame, size, color_on, color_off)
+        ok, png = cv2.imencode('.png', img)
+        if not ok:
+            if not self.failures:
+                print(f"⚠ Could not encode {device_type} sprite - drawing devices directly")
+            self.failures += 1
+            return None
+        sprite = tk.PhotoImage(master=self.master, data=base64.b64encode(png.tobytes()))
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
 # =============================================================================
 # GUI FUNCTIONS
 # =============================================================================
@@ -536,10 +1574,11 @@ class LEDController:
         self.root.title(WINDOW_TITLE)
         self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.configure(bg='#1a1a1a')
-        self.root.resizable(False, False)
+        self.root.minsize(GRID_CELL_WIDTH + 60, 500)
         
         # Animation state
         self.animation_angle = 0
+        self.animation_time = 0.0
         
         # Create main frame
         self.main_frame = tk.Frame(root, bg='#1a1a1a')
@@ -579,73 +1618,21 @@ class LEDController:
             bg='#1a1a1a',
             fg='#888888'
         )
-        subtitle_label.pack(pady=(0, 30))
-        
-        # Create LED display area
-        self.led_frame = tk.Frame(self.main_frame, bg='#1a1a1a')
-        self.led_frame.pack(expand=True)
+        subtitle_label.pack(pady=(0, 5))
         
-        # Create canvases for each device
-        self.led_canvases = {}
-        self.led_labels = {}
-        self.glow_animation_ids = {}
-        self.animation_angle = 0  # For animations
-        
-        # Calculate device layout (3 rows x 2 columns for 5 devices)
-        rows = 3
-        cols = 2
-        device_ids = list(DEVICE_CONFIG.keys())
-        
-        for idx, device_id in enumerate(device_ids):
-            row = idx // cols
-            col = idx % cols
-            
-            # Create frame for each device
-            device_container = tk.Frame(self.led_frame, bg='#1a1a1a')
-            device_container.grid(row=row, column=col, padx=30, pady=15)
-            
-            # Device label
-            label = tk.Label(
-                device_container,
-                text=DEVICE_CONFIG[device_id]['label'],
-                font=('Arial', 12, 'bold'),
-                bg='#1a1a1a',
-                fg='#FFFFFF'
-            )
-            label.pack()
-            
-            # Device canvas
-            canvas = tk.Canvas(
-                device_container,
-                width=DEVICE_SIZE,
-                height=DEVICE_SIZE,
-                bg='#1a1a1a',
-                highlightthickness=0
-            )
-            canvas.pack(pady=(5, 5))
-            
-            # Status label
-            device_type = DEVICE_CONFIG[device_id].get('type', 'led')
-            if device_type == 'door_lock':
-                status_text = "LOCKED"
-            else:
-                status_text = "OFF"
-            
-            status_label = tk.Label(
-                device_container,
-                text=status_text,
-                font=('Arial', 10, 'bold'),
-                bg='#1a1a1a',
-                fg='#FF0000'
-            )
-            status_label.pack()
-            
-            self.led_canvases[device_id] = canvas
-            self.led_labels[device_id] = status_label
+        # Startup progress (hand detection loads in the background)
+        self.startup_label = tk.Label(
+            self.main_frame,
+            text=startup_status["stage"],
+            font=('Arial', 10, 'italic'),
+            bg='#1a1a1a',
+            fg='#FFD700'
+        )
+        self.startup_label.pack(pady=(0, 20))
         
-        # Instructions panel
+        # Instructions panel (packed first so it stays visible below the scrolling grid)
         instruction_frame = tk.Frame(self.main_frame, bg='#2a2a2a', relief=tk.RIDGE, bd=2)
-        instruction_frame.pack(fill=tk.X, pady=(20, 0))
+        instruction_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(20, 0))
         
         instructions_text = "♿ Accessibility Mode | 👍Thumb Up=LED1 | 👎Thumb Down=LED2 | ☝Index=Lock | ✌Two Fingers=TV | 🤟Three Fingers=Fan"
         instruction_label = tk.Label(
@@ -658,114 +1645,258 @@ class LEDController:
         )
         instruction_label.pack()
         
-        # Start GUI update loop
+        # Scrollable device grid. Only visible devices get widgets: a small pool
+        # of tiles is re-bound to whichever devices are scrolled into view.
+        self.led_frame = tk.Frame(self.main_frame, bg='#1a1a1a')
+        self.led_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.grid_canvas = tk.Canvas(self.led_frame, bg='#1a1a1a', highlightthickness=0)
+        self.grid_scrollbar = tk.Scrollbar(self.led_frame, orient=tk.VERTICAL, command=self.grid_canvas.yview)
+        self.grid_canvas.configure(yscrollcommand=self.on_grid_scroll)
+        self.grid_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.grid_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.grid_canvas.bind('<Configure>', lambda event: self.layout_tiles())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.root.bind_all(sequence, self.on_mousewheel)
+        
+        # Canvases and labels of the devices currently bound to tiles
+        self.led_canvases = {}
+        self.led_labels = {}
+        self.glow_animation_ids = {}
+        self.animation_angle = 0  # For animations
+        self.device_items = {}  # device_id → persistent canvas item IDs
+        self.sprites = SpriteCache(root)
+        self.drawn_keys = {}  # device_id → (state, channel) last drawn
+        self.device_ids = list(DEVICE_CONFIG.keys())
+        self.grid_columns = 1
+        self.tiles = []  # Recycled widget pool
+        self.scrollregion = None  # Last scrollregion set on the grid canvas
+        self.scroll_view = None  # Last (first, last) reported by the grid canvas
+        
+        # Event-driven refresh: state changes wake the GUI, and the animation
+        # timer only runs while a visible device animates
+        self.tick_id = None
+        self.settings_window = None
+        self.refresh_pending = False
+        self.window_visible = True
+        self.root.bind('<Map>', self.on_visibility_change)
+        self.root.bind('<Unmap>', self.on_visibility_change)
+        self.root.bind('<<DeviceChange>>', lambda event: self.refresh_now())
+        add_device_listener(self.on_device_change)
+        
+        # First draw; later ticks only run while something animates
         self.update_leds()
+        self.poll_startup()
+    
+    def poll_startup(self):
+        """Show background startup progress until the camera pipeline is attached."""
+        color = '#FF0000' if startup_status["error"] else '#00FF00' if startup_status["ready"] else '#FFD700'
+        self.startup_label.config(text=startup_status["stage"], fg=color)
+        if not startup_status["ready"] and not startup_status["error"]:
+            self.root.after(200, self.poll_startup)
+    
+    def create_tile(self):
+        """Create one recyclable device tile (name, canvas, status) on the grid canvas."""
+        container = tk.Frame(self.grid_canvas, bg='#1a1a1a')
+        
+        # Device label
+        name_label = tk.Label(
+            container,
+            font=('Arial', 12, 'bold'),
+            bg='#1a1a1a',
+            fg='#FFFFFF'
+        )
+        name_label.pack()
+        
+        # Device canvas
+        canvas = tk.Canvas(
+            container,
+            width=DEVICE_SIZE,
+            height=DEVICE_SIZE,
+            bg='#1a1a1a',
+            highlightthickness=0
+        )
+        canvas.pack(pady=(5, 5))
+        
+        # Status label
+        status_label = tk.Label(
+            container,
+            font=('Arial', 10, 'bold'),
+            bg='#1a1a1a',
+            fg='#FF0000'
+        )
+        status_label.pack()
+        
+        window_id = self.grid_canvas.create_window(0, 0, window=container, anchor=tk.NW, state='hidden')
+        tile = {'window': window_id, 'name': name_label, 'canvas': canvas, 'status': status_label, 'device_id': None}
+        self.tiles.append(tile)
+        return tile
+    
+    def bind_tile(self, tile, device_id):
+        """
+        Point a tile at a different device (or at none).
+        
+        Args:
+            tile: Tile dict from create_tile()
+            device_id: Device to show, or None to park the tile
+        """
+        old_id = tile['device_id']
+        if old_id == device_id:
+            return
+        if old_id is not None:
+            self.led_canvases.pop(old_id, None)
+            self.led_labels.pop(old_id, None)
+            self.device_items.pop(old_id, None)
+            self.drawn_keys.pop(old_id, None)
+        tile['device_id'] = device_id
+        if device_id is None:
+            self.grid_canvas.itemconfig(tile['window'], state='hidden')
+            return
+        
+        tile['name'].config(text=DEVICE_CONFIG[device_id]['label'])
+        self.led_canvases[device_id] = tile['canvas']
+        self.led_labels[device_id] = tile['status']
+        _, states = get_device_states([device_id])
+        self.update_device(device_id, states[device_id])
+    
+    def layout_tiles(self):
+        """Bind pooled tiles to the devices inside the visible part of the grid."""
+        width = max(self.grid_canvas.winfo_width(), GRID_CELL_WIDTH)
+        height = max(self.grid_canvas.winfo_height(), GRID_CELL_HEIGHT)
+        self.grid_columns = max(1, width // GRID_CELL_WIDTH)
+        total_rows = math.ceil(len(self.device_ids) / self.grid_columns)
+        scrollregion = (0, 0, width, total_rows * GRID_CELL_HEIGHT)
+        if scrollregion != self.scrollregion:
+            # Setting it re-fires yscrollcommand, so only touch it when it changes
+            self.scrollregion = scrollregion
+            self.grid_canvas.configure(scrollregion=scrollregion)
+        
+        # Grow the pool to cover one screenful plus a partially visible row
+        visible_rows = math.ceil(height / GRID_CELL_HEIGHT) + 1
+        while len(self.tiles) < visible_rows * self.grid_columns:
+            self.create_tile()
+        
+        first_row = int(self.grid_canvas.canvasy(0) // GRID_CELL_HEIGHT)
+        first = first_row * self.grid_columns
+        wanted = self.device_ids[first:first + visible_rows * self.grid_columns]
+        
+        # Keep tiles already showing a still-visible device; recycle the rest
+        bound = {tile['device_id']: tile for tile in self.tiles if tile['device_id'] in wanted}
+        free = [tile for tile in self.tiles if tile['device_id'] not in bound]
+        x_offset = (width - self.grid_columns * GRID_CELL_WIDTH) // 2
+        
+        for offset, device_id in enumerate(wanted):
+            tile = bound.get(device_id) or free.pop()
+            self.bind_tile(tile, device_id)
+            row, col = divmod(first + offset, self.grid_columns)
+            self.grid_canvas.coords(tile['window'], x_offset + col * GRID_CELL_WIDTH + 30, row * GRID_CELL_HEIGHT + 15)
+            self.grid_canvas.itemconfig(tile['window'], state='normal')
+        for tile in free:
+            self.bind_tile(tile, None)
+        if any(self.is_animated(device_id, self.drawn_keys[device_id][0]) for device_id in self.led_canvases):
+            self.schedule_tick()
+    
+    def on_grid_scroll(self, first, last):
+        """Keep the scrollbar in sync and re-bind tiles after the grid moves."""
+        self.grid_scrollbar.set(first, last)
+        if (first, last) != self.scroll_view:
+            self.scroll_view = (first, last)
+            self.layout_tiles()
+    
+    def on_mousewheel(self, event):
+        """Scroll the device grid with the mouse wheel (Windows/macOS and X11)."""
+        if not str(event.widget).startswith(str(self.grid_canvas)):
+            return  # Wheel over another widget (settings window, instructions)
+        if event.num == 4 or event.delta > 0:
+            self.grid_canvas.yview_scroll(-1, 'units')
+        elif event.num == 5 or event.delta < 0:
+            self.grid_canvas.yview_scroll(1, 'units')
+    
+    def create_device_items(self, canvas, device_id, size=DEVICE_SIZE):
+        """
+        Create the persistent canvas items for one device.
+        
+        A device is one image item (its current sprite) plus, for TVs,
+        a text item for the channel name.
+        
+        Args:
+            canvas: Tkinter canvas to draw on
+            device_id: ID of the device
+            size: Size of the display
+        
+        Returns:
+            dict: Item IDs by role
+        """
+        canvas.delete("all")
+        center = size // 2
+        items = {'image': canvas.create_image(0, 0, anchor=tk.NW), 'sprite': None}
+        if DEVICE_CONFIG[device_id].get('type', 'led') == 'tv':
+            items['channel'] = canvas.create_text(center, center - 10, text='', fill=DEVICE_CONFIG[device_id]['color_on'],
+                                                  font=('Arial', 10, 'bold'), state='hidden')
+        self.device_items[device_id] = items
+        return items
     
     def draw_device(self, canvas, device_id, state, size=DEVICE_SIZE):
         """
         Draw device visualization based on device type.
         
+        Swaps in the cached sprite for the device's state and animation frame;
+        nothing is re-rendered unless the sprite cache misses.
+        
         Args:
             canvas: Tkinter canvas to draw on
             device_id: ID of the device
             state: Current state (ON/OFF)
             size: Size of the display
         """
-        canvas.delete("all")
-        center = size // 2
-        device_type = DEVICE_CONFIG[device_id].get('type', 'led')
-        color = DEVICE_CONFIG[device_id]['color_on'] if state else DEVICE_CONFIG[device_id]['color_off']
-        
-        if device_type == 'led':
-            # Draw LED with glow effect
-            if state and LED_GLOW_EFFECT:
-                for i in range(3):
-                    radius = center - (i * 8)
-                    canvas.create_oval(center - radius, center - radius, center + radius, center + radius, fill=color, outline='')
-            radius = center - 10
-            canvas.create_oval(center - radius, center - radius, center + radius, center + radius, fill=color, outline='#555555', width=2)
-        
-        elif device_type == 'fan':
-            # Draw rotating fan blades
-            if state:
-                for i in range(3):
-                    blade_angle = self.animation_angle + (i * 120)
-                    import math
-                    x1 = center + math.cos(math.radians(blade_angle)) * 10
-                    y1 = center + math.sin(math.radians(blade_angle)) * 10
-                    x2 = center + math.cos(math.radians(blade_angle)) * (center - 10)
-                    y2 = center + math.sin(math.radians(blade_angle)) * (center - 10)
-                    canvas.create_line(x1, y1, x2, y2, fill=color, width=6)
-            canvas.create_oval(center - 30, center - 30, center + 30, center + 30, outline=color, width=3)
-            canvas.create_oval(center - 5, center - 5, center + 5, center + 5, fill=color)
-        
-        elif device_type == 'buzzer':
-            # Draw speaker/buzzer with sound waves
-            canvas.create_rectangle(center - 20, center - 25, center + 20, center + 25, fill=color, outline='#555555', width=2)
-            if state:
-                for i in range(1, 4):
-                    canvas.create_arc(center + 20, center - i*10, center + 20 + i*15, center + i*10, 
-                                    start=270, extent=180, outline=color, width=2, style='arc')
-        
-        elif device_type == 'rgb_strip':
-            # Draw RGB LED strip
-            strip_width = size - 20
-            led_count = 5
-            led_spacing = strip_width // led_count
-            for i in range(led_count):
-                x = 10 + i * led_spacing
-                canvas.create_rectangle(x, center - 10, x + led_spacing - 5, center + 10, 
-                                      fill=color if state else DEVICE_CONFIG[device_id]['color_off'], 
-                                      outline='#555555', width=1)
-        
-        elif device_type == 'door_lock':
-            # Draw lock/unlock symbol
-            if state:  # Unlocked (open)
-                canvas.create_arc(center - 15, center - 30, center + 15, center - 10, 
-                                start=180, extent=180, outline=color, width=4, style='arc')
-                canvas.create_rectangle(center - 20, center - 10, center + 20, center + 20, 
-                                      fill=color, outline='#555555', width=2)
-                canvas.create_oval(center - 3, center, center + 3, center + 6, fill='#1a1a1a')
-            else:  # Locked (closed)
-                canvas.create_arc(center - 15, center - 35, center + 15, center - 5, 
-                                start=0, extent=180, outline=color, width=4, style='arc')
-                canvas.create_rectangle(center - 20, center - 10, center + 20, center + 20, 
-                                      fill=color, outline='#555555', width=2)
-                canvas.create_oval(center - 3, center, center + 3, center + 6, fill='#1a1a1a')
+        items = self.device_items.get(device_id)
+        if items is None:
+            items = self.create_device_items(canvas, device_id, size)
+        config = DEVICE_CONFIG[device_id]
+        device_type = config.get('type', 'led')
+        level = device_levels.get(device_id, 100)
+        angle = self.animation_angle
+        if device_type == 'fan' and level < 100:
+            # Slower fan speed, slower blades
+            angle = int(self.animation_time * ANIMATION_SPEED * level / 100) // 15 * 15 % 360
+        frame = sprite_frame(device_type, state, angle)
+        color_on = dim_color(config['color_on'], level) if device_type in ('led', 'rgb_strip') else config['color_on']
+        sprite = self.sprites.get(device_type, state, frame, size, color_on, config['color_off'])
+        if sprite is None:
+            self.draw_device_fallback(canvas, items, color_on if state else config['color_off'], size)
+        elif 'fallback' in items:
+            canvas.itemconfig(items['fallback'], state='hidden')
         
-        elif device_type == 'tv':
-            # Draw TV with screen and frame
-            # TV frame (bezel)
-            canvas.create_rectangle(5, 5, size-5, size-5, fill='#333333', outline='#666666', width=3)
-            
-            if state:  # TV ON - show channel
-                # Screen background
-                canvas.create_rectangle(15, 15, size-15, size-25, fill='#000055', outline='')
-                # Channel text
+        if sprite is not None and sprite is not items['sprite']:
+            canvas.itemconfig(items['image'], image=sprite)
+            items['sprite'] = sprite  # Keeps the image alive even after cache eviction
+        
+        if device_type == 'tv':
+            if state:
                 channel_idx = TV_CHANNEL_INDEX.get(device_id, 0)
-                channel_name = TV_CHANNELS[channel_idx]
-                canvas.create_text(center, center - 10, text=channel_name, 
-                                 fill=color, font=('Arial', 10, 'bold'))
-                # Animated scan lines for TV effect
-                for i in range(5):
-                    y = 20 + (i * 15) + (self.animation_angle // 10) % 15
-                    if y < size - 25:
-                        canvas.create_line(15, y, size-15, y, fill='#ffffff', width=1)
-                # Power indicator LED
-                canvas.create_oval(center - 3, size - 15, center + 3, size - 9, fill='#00FF00')
-            else:  # TV OFF - show static
-                # Dark screen with static noise pattern
-                canvas.create_rectangle(15, 15, size-15, size-25, fill='#1a1a1a', outline='')
-                # Random static dots
-                import random
-                random.seed(int(self.animation_angle / 10))
-                for _ in range(30):
-                    x = random.randint(15, size-15)
-                    y = random.randint(15, size-25)
-                    gray = random.choice(['#333333', '#555555', '#777777'])
-                    canvas.create_rectangle(x, y, x+2, y+2, fill=gray, outline='')
-                # Power indicator LED (red when off)
-                canvas.create_oval(center - 3, size - 15, center + 3, size - 9, fill='#FF0000')
+                canvas.itemconfig(items['channel'], text=TV_CHANNELS[channel_idx], state='normal')
+            else:
+                canvas.itemconfig(items['channel'], state='hidden')
+    
+    def draw_device_fallback(self, canvas, items, color, size=DEVICE_SIZE):
+        """Show the device as a plain coloured circle when its sprite is unavailable."""
+        if 'fallback' not in items:
+            center, radius = size // 2, size // 2 - 10
+            items['fallback'] = canvas.create_oval(center - radius, center - radius, center + radius, center + radius,
+                                                   outline='#555555', width=2)
+            canvas.tag_lower(items['fallback'], items['image'])
+        canvas.itemconfig(items['image'], image='')
+        canvas.itemconfig(items['fallback'], fill=color, state='normal')
+        items['sprite'] = None
+    
+    def is_animated(self, device_id, state):
+        """
+        Return True if the device changes appearance every tick (running fan, TV that is on).
+        
+        A TV that is off shows a still frame of static so an all-off GUI can idle.
+        """
+        device_type = DEVICE_CONFIG[device_id].get('type', 'led')
+        return state and device_type in ('tv', 'fan')
     
     def draw_led(self, canvas, color, size=LED_SIZE, glow=False):
         """Legacy function - calls draw_device for backward compatibility"""
@@ -780,6 +1911,9 @@ class LEDController:
     
     def show_settings(self):
         """Open settings window to customize gesture mappings."""
+        if self.settings_window is not None:
+            self.settings_window.lift()
+            return
         settings_window = tk.Toplevel(self.root)
         settings_window.title("⚙ Customize Gestures")
         settings_window.geometry("600x500")
@@ -808,11 +1942,70 @@ class LEDController:
         # Mappings frame
         mappings_frame = tk.Frame(settings_window, bg='#2a2a2a', relief=tk.RIDGE, bd=2)
         mappings_frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
+        self.mappings_frame = mappings_frame
+        self.populate_mappings()
+        
+        # Buttons
+        button_frame = tk.Frame(settings_window, bg='#1a1a1a')
+        button_frame.pack(pady=10)
+        
+        save_btn = tk.Button(
+            button_frame,
+            text="💾 Save to File",
+            font=('Arial', 11, 'bold'),
+            bg='#00AA00',
+            fg='#FFFFFF',
+            command=lambda: [save_custom_gestures(), settings_window.focus()],
+            padx=15,
+            pady=8
+        )
+        save_btn.pack(side=tk.LEFT, padx=10)
+        
+        close_btn = tk.Button(
+            button_frame,
+            text="✖ Close",
+            font=('Arial', 11, 'bold'),
+            bg='#AA0000',
+            fg='#FFFFFF',
+            command=settings_window.destroy,
+            padx=15,
+            pady=8
+        )
+        close_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Help text
+        help_text = tk.Label(
+            settings_window,
+            text="To customize: Edit gesture_config.json - changes apply automatically, no restart needed",
+            font=('Arial', 9, 'italic'),
+            bg='#1a1a1a',
+            fg='#888888'
+        )
+        help_text.pack(pady=5)
+        
+        # Result of the last config reload
+        self.config_status_label = tk.Label(
+            settings_window,
+            font=('Arial', 9, 'bold'),
+            bg='#1a1a1a'
+        )
+        self.config_status_label.pack(pady=(0, 5))
+        
+        self.settings_window = settings_window
+        self.refresh_settings()
+        settings_window.bind('<Destroy>', self.on_settings_closed)
+        add_config_listener(self.on_config_change)
+    
+    def populate_mappings(self):
+        """(Re)build the gesture → device rows in the settings window."""
+        mappings_frame = self.mappings_frame
+        for child in mappings_frame.winfo_children():
+            child.destroy()
         
         # Display current mappings
         row = 0
         for gesture, device_id in GESTURE_TO_LED.items():
-            device_name = DEVICE_CONFIG[device_id]['label']
+            device_name = describe_target(device_id)
             
             gesture_label = tk.Label(
                 mappings_frame,
@@ -846,103 +2039,232 @@ class LEDController:
             device_label.grid(row=row, column=2, padx=10, pady=8, sticky='w')
             
             row += 1
+    
+    def refresh_settings(self):
+        """Show the live mapping and last reload result in the settings window."""
+        if self.settings_window is None:
+            return
+        self.populate_mappings()
+        self.config_status_label.config(text=config_status["last_result"],
+                                        fg='#FF0000' if config_status["error"] else '#00FF00')
+    
+    def on_config_change(self, gestures, scenes):
+        """Config listener: refresh the settings window on the Tk thread."""
+        try:
+            self.root.after(0, self.refresh_settings)
+        except (RuntimeError, tk.TclError):
+            pass  # Window is closing
+    
+    def on_settings_closed(self, event):
+        """Stop listening for config changes once the settings window is gone."""
+        if event.widget is self.settings_window:
+            remove_config_listener(self.on_config_change)
+            self.settings_window = None
+    
+    def update_device(self, led_id, status):
+        """
+        Redraw one bound device if its state changed or it animates.
         
-        # Buttons
-        button_frame = tk.Frame(settings_window, bg='#1a1a1a')
-        button_frame.pack(pady=10)
+        Args:
+            led_id: ID of the device
+            status: device_status() snapshot for the device
+        """
+        state = status["on"]
+        key = (state, status.get("channel"), status.get("level"))
+        changed = self.drawn_keys.get(led_id) != key
         
-        save_btn = tk.Button(
-            button_frame,
-            text="💾 Save to File",
-            font=('Arial', 11, 'bold'),
-            bg='#00AA00',
-            fg='#FFFFFF',
-            command=lambda: [save_custom_gestures(), settings_window.focus()],
-            padx=15,
-            pady=8
-        )
-        save_btn.pack(side=tk.LEFT, padx=10)
+        if changed or self.is_animated(led_id, state):
+            # Draw device with appropriate visualization
+            self.draw_device(self.led_canvases[led_id], led_id, state)
         
-        close_btn = tk.Button(
-            button_frame,
-            text="✖ Close",
-            font=('Arial', 11, 'bold'),
-            bg='#AA0000',
-            fg='#FFFFFF',
-            command=settings_window.destroy,
-            padx=15,
-            pady=8
-        )
-        close_btn.pack(side=tk.LEFT, padx=10)
+        if not changed:
+            return
+        self.drawn_keys[led_id] = key
         
-        # Help text
-        help_text = tk.Label(
-            settings_window,
-            text="To customize: Edit gesture_config.json file and restart the application",
-            font=('Arial', 9, 'italic'),
-            bg='#1a1a1a',
-            fg='#888888'
-        )
-        help_text.pack(pady=5)
+        # Update status label based on device type
+        label = self.led_labels[led_id]
+        device_type = DEVICE_CONFIG[led_id].get('type', 'led')
+        if device_type == 'door_lock':
+            if state:
+                label.config(text="UNLOCKED", fg='#00FF00')
+            else:
+                label.config(text="LOCKED", fg='#FF0000')
+        elif device_type == 'tv':
+            if state:
+                label.config(text=f"📺 {status['channel']}", fg='#00FF00')
+            else:
+                label.config(text="OFF", fg='#FF0000')
+        else:
+            if state and status.get("level", 100) < 100:
+                label.config(text=f"ON {status['level']}%", fg='#00FF00')
+            elif state:
+                label.config(text="ON", fg='#00FF00')
+            else:
+                label.config(text="OFF", fg='#FF0000')
     
     def update_leds(self):
-        """Update all LED displays based on current states."""
-        for led_id, state in led_states.items():
-            if led_id in self.led_canvases:
-                canvas = self.led_canvases[led_id]
-                label = self.led_labels[led_id]
-                device_type = DEVICE_CONFIG[led_id].get('type', 'led')
-                
-                # Draw device with appropriate visualization
-                self.draw_device(canvas, led_id, state)
-                
-                # Update status label based on device type
-                if device_type == 'door_lock':
-                    if state:
-                        label.config(text="UNLOCKED", fg='#00FF00')
-                    else:
-                        label.config(text="LOCKED", fg='#FF0000')
-                elif device_type == 'tv':
-                    if state:
-                        channel_idx = TV_CHANNEL_INDEX.get(led_id, 0)
-                        label.config(text=f"📺 {TV_CHANNELS[channel_idx]}", fg='#00FF00')
-                    else:
-                        label.config(text="OFF", fg='#FF0000')
-                else:
-                    if state:
-                        label.config(text="ON", fg='#00FF00')
-                    else:
-                        label.config(text="OFF", fg='#FF0000')
+        """
+        Update the visible device displays based on current states.
         
-        # Update animation angle for rotating devices (fan)
-        self.animation_angle = (self.animation_angle + 15) % 360
+        Only devices bound to on-screen tiles are looked at. Static devices
+        are skipped entirely unless their state changed; only animated
+        devices (running fan, TV) are touched every tick. The next tick is
+        scheduled only while one of them is visible.
+        """
+        self.tick_id = None
         
-        # Schedule next update
-        if running:
-            self.root.after(50, self.update_leds)
+        # Animation is time-based so the configured frame rate doesn't change its speed
+        self.animation_time = time.monotonic()
+        self.animation_angle = int(self.animation_time * ANIMATION_SPEED) // 15 * 15 % 360
+        
+        animating = False
+        _, states = get_device_states(list(self.led_canvases))
+        for led_id, status in states.items():
+            self.update_device(led_id, status)
+            animating = animating or self.is_animated(led_id, status["on"])
+        
+        if animating:
+            self.schedule_tick()
+    
+    def schedule_tick(self):
+        """Start the animation timer if it isn't already pending."""
+        if self.tick_id is not None or not running:
+            return
+        fps = GUI_ANIMATION_FPS if self.window_visible else GUI_HIDDEN_FPS
+        self.tick_id = self.root.after(max(1, int(1000 / fps)), self.update_leds)
+    
+    def refresh_now(self):
+        """Redraw immediately (cancelling a pending animation tick)."""
+        self.refresh_pending = False
+        if self.tick_id is not None:
+            self.root.after_cancel(self.tick_id)
+            self.tick_id = None
+        self.update_leds()
+    
+    def on_device_change(self, version, changes):
+        """
+        Device listener: wake the Tk thread to redraw (called from any thread).
+        
+        Tkinter hands the <<DeviceChange>> event to the Tk thread, so no
+        timer runs while nothing changes. Changes that arrive before the
+        redraw share it.
+        """
+        if self.refresh_pending:
+            return
+        self.refresh_pending = True
+        try:
+            self.root.event_generate('<<DeviceChange>>', when='tail')
+        except (RuntimeError, tk.TclError):
+            self.refresh_pending = False  # Window is closing or not running yet
+    
+    def on_visibility_change(self, event):
+        """Throttle animation while the window is minimized or hidden."""
+        if event.widget is not self.root:
+            return
+        self.window_visible = event.type == tk.EventType.Map
+        if self.window_visible:
+            self.refresh_now()
     
     def on_closing(self):
         """Handle window close event."""
         global running
         running = False
+        remove_device_listener(self.on_device_change)
         self.root.destroy()
 
 def start_gui():
     """Start the Tkinter GUI."""
-    root = tk.Tk()
-    app = LEDController(root)
+    with startup_profile.phase("build GUI"):
+        root = tk.Tk()
+        app = LEDController(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    if runtime_profiler:
+        runtime_profiler.register_thread("gui", lambda fn: root.after(0, fn))
+    if memory_monitor:
+        memory_monitor.add_gauge("tk_images", lambda: len(root.image_names()))
+        memory_monitor.add_gauge("tk_canvas_items", lambda: sum(
+            len(canvas.find_all()) for canvas in [app.grid_canvas, *app.led_canvases.values()]))
+        memory_monitor.add_gauge("sprite_cache", lambda: len(app.sprites.sprites))
+    root.after_idle(startup_profile.milestone, "GUI visible")
     root.mainloop()
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Accessible gesture controller")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print import and init time for each startup phase")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-stage frame latency (CSV log + Prometheus /metrics)")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Record hand landmarks to DIR for replay with landmark_recorder.py")
+    parser.add_argument("--memory", action="store_true",
+                        help="Track RSS and tracemalloc allocation sites and flag steady growth")
+    parser.add_argument("--events", action="store_true",
+                        help="Log every gesture and device change to the event log (see event_log.py)")
+    parser.add_argument("--user", help="User name: loads their calibration (calibrate.py) and tags logged events")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="Adjust model complexity and capture resolution to this machine while running")
+    parser.add_argument("--power-save", action="store_true",
+                        help="Stop hand tracking and slow the camera down when no hand has been seen for a while")
+    parser.add_argument("--inference-server", metavar="SOCKET",
+                        help="Capture only: send frames to a shared inference_server.py at this Unix socket")
+    parser.add_argument("--camera-name", help="Name of this camera on the inference server")
+    parser.add_argument("--continuous", action="store_true",
+                        help="Pinch to dim the LED and raise/lower an open palm for fan speed")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Switch LEDs/TV as soon as a gesture appears; undo it if debounce doesn't confirm")
+    parser.add_argument("--frame-deadline", type=float, nargs="?", const=FRAME_DEADLINE_DEFAULT_MS, metavar="MS",
+                        help="Skip frames that can't be shown within MS of capture (default MS: "
+                             f"{FRAME_DEADLINE_DEFAULT_MS:g})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Allow on-demand profiling ('p' key, SIGUSR1, control port on PROFILER_PORT)")
+    parser.add_argument("--profile-mode", choices=["sample", "cprofile"],
+                        help="Profiler started by 'p' / SIGUSR1 (default: PROFILER_MODE); implies --profile")
+    return parser.parse_args(argv)
+
 def main():
     """
     Main function to start the application.
     Launches webcam processing and GUI in separate threads.
+    
+    The GUI comes up immediately; MediaPipe loads in the background and the
+    webcam pipeline attaches when it is ready.
     """
+    global STARTUP_PROFILE_ENABLED, METRICS_ENABLED, RECORD_LANDMARKS, PROFILER_ENABLED, PROFILER_MODE
+    global MEMORY_MONITOR_ENABLED
+    global EVENT_LOG_ENABLED, EVENT_LOG_USER, QUALITY_CONTROL_ENABLED, POWER_SAVE_ENABLED
+    global INFERENCE_SERVER, INFERENCE_CAMERA_NAME, CONTINUOUS_CONTROL_ENABLED, SPECULATIVE_ENABLED
+    global FRAME_DEADLINE_MS
+    global stage_metrics, landmark_recorder, runtime_profiler, memory_monitor, event_log
+    args = parse_args()
+    STARTUP_PROFILE_ENABLED = args.startup_profile
+    METRICS_ENABLED = METRICS_ENABLED or args.metrics
+    RECORD_LANDMARKS = args.record or RECORD_LANDMARKS
+    PROFILER_ENABLED = PROFILER_ENABLED or args.profile or bool(args.profile_mode)
+    PROFILER_MODE = args.profile_mode or PROFILER_MODE
+    MEMORY_MONITOR_ENABLED = MEMORY_MONITOR_ENABLED or args.memory
+    EVENT_LOG_ENABLED = EVENT_LOG_ENABLED or args.events
+    EVENT_LOG_USER = args.user or EVENT_LOG_USER
+    QUALITY_CONTROL_ENABLED = QUALITY_CONTROL_ENABLED or args.adaptive_quality
+    POWER_SAVE_ENABLED = POWER_SAVE_ENABLED or args.power_save
+    INFERENCE_SERVER = args.inference_server or INFERENCE_SERVER
+    INFERENCE_CAMERA_NAME = args.camera_name or INFERENCE_CAMERA_NAME
+    CONTINUOUS_CONTROL_ENABLED = CONTINUOUS_CONTROL_ENABLED or args.continuous
+    SPECULATIVE_ENABLED = SPECULATIVE_ENABLED or args.speculative
+    if args.frame_deadline is not None:
+        FRAME_DEADLINE_MS = args.frame_deadline
+    
+    with startup_profile.phase("load gesture config"):
+        load_custom_gestures()
+        if EVENT_LOG_USER:
+            load_user_profile(EVENT_LOG_USER)
+    if CONFIG_WATCH_ENABLED:
+        start_config_watcher()
+    
     print("=" * 75)
     print("♿ ACCESSIBLE GESTURE CONTROLLER - FOR LIMITED MOBILITY")
     print("=" * 75)
@@ -966,15 +2288,43 @@ def main():
     }
     for gesture, device_id in GESTURE_TO_LED.items():
         gesture_display = gestures_info.get(gesture, gesture.replace('_', ' ').title())
-        device_info = DEVICE_CONFIG[device_id]['label']
+        device_info = describe_target(device_id)
         print(f"   {gesture_display:20} → {device_info}")
     print("\n⚠ Press 'q' in webcam window to quit")
     print("💡 Click 'Customize Gestures' button to change mappings")
     print("=" * 75)
     print()
     
-    # Start webcam processing in separate thread
-    webcam_thread = threading.Thread(target=webcam_processing_thread, daemon=True)
+    dashboard = None
+    if DASHBOARD_ENABLED:
+        import web_dashboard
+        dashboard = web_dashboard.start_dashboard(DASHBOARD_HOST, DASHBOARD_PORT, DASHBOARD_PROTECTED_TYPES)
+    
+    if METRICS_ENABLED:
+        import pipeline_metrics
+        stage_metrics = pipeline_metrics.start_metrics(METRICS_CSV, METRICS_HOST, METRICS_PORT, METRICS_INTERVAL,
+                                                      METRICS_ACTUATION_CSV)
+    if RECORD_LANDMARKS:
+        import landmark_recorder as recorder_module
+        landmark_recorder = recorder_module.start_recording(RECORD_LANDMARKS)
+    if EVENT_LOG_ENABLED:
+        import event_log as event_log_module
+        event_log = event_log_module.start_event_log(EVENT_LOG_DIR, EVENT_LOG_USER)
+    if MEMORY_MONITOR_ENABLED:
+        import memory_monitor as memory_module
+        memory_monitor = memory_module.start_monitor(MEMORY_DIR, MEMORY_INTERVAL, MEMORY_TOP_N)
+    if PROFILER_ENABLED:
+        import runtime_profiler as profiler_module
+        runtime_profiler = profiler_module.start_profiler(PROFILER_DIR, PROFILER_MODE, PROFILER_SAMPLE_INTERVAL,
+                                                          PROFILER_HOST, PROFILER_PORT)
+    
+    # Start webcam processing in separate thread (loads MediaPipe in the background)
+    if INFERENCE_SERVER:
+        import inference_server
+        webcam_thread = threading.Thread(target=inference_server.capture_client_thread, name="webcam", daemon=True,
+                                         args=(INFERENCE_SERVER, INFERENCE_CAMERA_NAME, INFERENCE_SLO_MS))
+    else:
+        webcam_thread = threading.Thread(target=webcam_processing_thread, name="webcam", daemon=True)
     webcam_thread.start()
     
     # Start GUI in main thread
@@ -983,6 +2333,18 @@ def main():
     # Cleanup
     global running
     running = False
+    if dashboard:
+        dashboard.stop()
+    if stage_metrics:
+        stage_metrics.stop()
+    if landmark_recorder:
+        landmark_recorder.close()
+    if event_log:
+        event_log.close()
+    if runtime_profiler:
+        runtime_profiler.close()
+    if memory_monitor:
+        memory_monitor.stop()
     print("\n✓ Application closed successfully")
     print("=" * 70)
 
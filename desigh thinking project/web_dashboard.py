@@ -0,0 +1,573 @@
+"""
+Web Dashboard for Virtual LED Controller
+========================================
+
+Embedded HTTP + WebSocket server (standard library only) so browsers on the
+LAN can watch and control this controller.
+
+    GET /        Dashboard page
+    GET /state   Full JSON snapshot (devices, scenes, telemetry)
+    GET /ws      WebSocket: one snapshot on connect, then only device diffs
+                 and periodic telemetry. Browsers send
+                 {"action": "toggle", "device": "LED1"} or
+                 {"action": "scene", "scene": "all_on"}.
+
+Every request needs the per-run token printed at startup (?token=...), and
+WebSocket upgrades from a page on another site (Origin not this dashboard)
+are refused. Devices of DASHBOARD_PROTECTED_TYPES (the door lock), and
+scenes that include one, can be watched but not changed from the web.
+
+The server runs in its own process and works from a mirror of the device
+state, so viewers never compete with the frame loop for the GIL. The frame
+loop only pays for one queue put per batch of device changes, no matter how
+many viewers are connected. Each message is encoded once and the same bytes
+are queued to every viewer. A viewer that falls too far behind gets a fresh
+snapshot instead of an ever-growing queue.
+
+Usage: set DASHBOARD_ENABLED = True in virtual_led_controller.py
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+TELEMETRY_INTERVAL = 1.0  # Seconds between telemetry pushes
+MAX_PENDING_FRAMES = 256  # Queued messages per viewer before it is resynced with a snapshot
+MAX_MESSAGE_SIZE = 64 * 1024  # Largest message accepted from a browser
+
+
+# =============================================================================
+# WEBSOCKET FRAMING (RFC 6455, just what the dashboard needs)
+# =============================================================================
+
+def apply_mask(data, key):
+    """XOR data with a 4-byte WebSocket masking key."""
+    repeated = (key * (len(data) // 4 + 1))[:len(data)]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(data), 'big')
+
+
+def encode_frame(payload, opcode=0x1, mask=False):
+    """
+    Build one unfragmented WebSocket frame.
+
+    Args:
+        payload: str or bytes
+        opcode: 0x1 text, 0x8 close, 0x9 ping, 0xA pong
+        mask: True for client-to-server frames
+
+    Returns:
+        bytes: The encoded frame
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+async def read_frame(reader, max_size=MAX_MESSAGE_SIZE):
+    """
+    Read one WebSocket frame.
+
+    Returns:
+        tuple: (opcode, payload bytes)
+    """
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    if length > max_size:
+        raise ValueError(f"WebSocket message too large ({length} bytes)")
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = apply_mask(payload, key)
+    return opcode, payload
+
+
+def accept_key(client_key):
+    """Compute the Sec-WebSocket-Accept value for a client's handshake key."""
+    digest = hashlib.sha1((client_key + WS_GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+# =============================================================================
+# DASHBOARD SERVER (runs in its own process)
+# =============================================================================
+
+class Viewer:
+    """One connected browser: a queue of encoded frames plus a resync flag."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = deque()
+        self.wakeup = asyncio.Event()
+        self.needs_snapshot = True
+        self.wakeup.set()
+
+    def send(self, frame):
+        """Queue an encoded frame; too far behind means start over from a snapshot."""
+        if self.needs_snapshot:
+            return  # The snapshot about to be sent already covers this
+        if len(self.pending) >= MAX_PENDING_FRAMES:
+            self.pending.clear()
+            self.needs_snapshot = True
+        else:
+            self.pending.append(frame)
+        self.wakeup.set()
+
+
+class DashboardServer:
+    """
+    Async HTTP + WebSocket server working from a mirror of the controller's state.
+
+    The mirror is fed through a pipe (snapshot first, then diffs and telemetry),
+    so serving viewers never touches the controller process.
+    """
+
+    def __init__(self, host, port, token, updates, commands):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.updates = updates  # Connection: controller → dashboard
+        self.commands = commands  # Connection: dashboard → controller
+        self.loop = None
+        self.viewers = set()
+        self.device_versions = {}
+        self.state = {"version": -1, "devices": {}, "scenes": [], "gestures": {}, "telemetry": {},
+                      "protected_types": [], "controller": socket.gethostname()}
+
+    def run(self, ready):
+        """Serve until the controller closes the update pipe."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=1024))
+        ready.send(server.sockets[0].getsockname()[1])
+        threading.Thread(target=self._receive_updates, name="dashboard-updates", daemon=True).start()
+        try:
+            self.loop.run_forever()
+        finally:
+            server.close()
+
+    def _receive_updates(self):
+        """Pipe reader thread: hand every update to the event loop."""
+        try:
+            while True:
+                update = self.updates.recv()
+                self.loop.call_soon_threadsafe(self._apply_update, update)
+        except (EOFError, OSError):
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _apply_update(self, update):
+        kind, payload = update
+        if kind == "stop":
+            self.loop.stop()
+        elif kind == "snapshot":
+            self.state.update(payload)
+            self.device_versions = {device_id: payload["version"] for device_id in payload["devices"]}
+            for viewer in self.viewers:
+                viewer.needs_snapshot = True
+                viewer.wakeup.set()
+        elif kind == "diff":
+            # Batches from different threads can reach the pipe out of order,
+            # so staleness is judged per device, not per message
+            version, changes, timestamp = payload
+            fresh = {device_id: status for device_id, status in changes.items()
+                     if version > self.device_versions.get(device_id, -1)}
+            if not fresh:
+                return
+            for device_id, status in fresh.items():
+                self.state["devices"][device_id].update(status)
+                self.device_versions[device_id] = version
+            self.state["version"] = max(self.state["version"], version)
+            self._broadcast({"type": "diff", "version": version, "ts": timestamp, "devices": fresh})
+        elif kind == "telemetry":
+            self.state["telemetry"] = payload
+            if self.viewers:
+                self._broadcast(dict(payload, type="telemetry", ts=time.time(), viewers=len(self.viewers)))
+
+    def snapshot_message(self):
+        """Full state for a newly connected (or resynced) viewer."""
+        return dict(self.state, type="snapshot")
+
+    def _broadcast(self, message):
+        frame = encode_frame(json.dumps(message))
+        for viewer in self.viewers:
+            viewer.send(frame)
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode('latin-1').split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            url = urlsplit(target)
+            path = url.path
+            token = parse_qs(url.query).get("token", [""])[0]
+
+            if not hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8')):
+                self._respond(writer, 403, "text/plain", b"Missing or wrong dashboard token")
+            elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                if not self._same_origin(headers):
+                    self._respond(writer, 403, "text/plain", b"Cross-origin WebSocket refused")
+                else:
+                    await self._serve_websocket(reader, writer, headers)
+            elif method != "GET":
+                self._respond(writer, 405, "text/plain", b"Method not allowed")
+            elif path in ("/", "/index.html"):
+                self._respond(writer, 200, "text/html; charset=utf-8", DASHBOARD_HTML.encode('utf-8'))
+            elif path == "/state":
+                self._respond(writer, 200, "application/json", json.dumps(self.snapshot_message()).encode('utf-8'))
+            else:
+                self._respond(writer, 404, "text/plain", b"Not found")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _same_origin(headers):
+        """True if the upgrade comes from a page served by this dashboard (Origin matches Host)."""
+        origin = urlsplit(headers.get("origin", ""))
+        return origin.scheme == "http" and bool(origin.netloc) and origin.netloc == headers.get("host")
+
+    @staticmethod
+    def _respond(writer, status, content_type, body):
+        reason = {200: "OK", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+
+    async def _serve_websocket(self, reader, writer, headers):
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept_key(headers['sec-websocket-key'])}\r\n\r\n").encode('latin-1'))
+        viewer = Viewer(writer)
+        self.viewers.add(viewer)
+        pump = asyncio.ensure_future(self._pump(viewer))
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 0x8:  # Close
+                    writer.write(encode_frame(b"", opcode=0x8))
+                    break
+                if opcode == 0x9:  # Ping
+                    writer.write(encode_frame(payload, opcode=0xA))
+                elif opcode == 0x1:
+                    self._forward_command(payload)
+        finally:
+            self.viewers.discard(viewer)
+            pump.cancel()
+
+    async def _pump(self, viewer):
+        """Write a viewer's queued frames, coalescing whatever piled up since the last write."""
+        try:
+            while True:
+                await viewer.wakeup.wait()
+                viewer.wakeup.clear()
+                if viewer.needs_snapshot:
+                    viewer.needs_snapshot = False
+                    viewer.pending.clear()
+                    viewer.writer.write(encode_frame(json.dumps(self.snapshot_message())))
+                if viewer.pending:
+                    viewer.writer.write(b"".join(viewer.pending))
+                    viewer.pending.clear()
+                await viewer.writer.drain()
+        except ConnectionError:
+            viewer.writer.close()
+
+    def _forward_command(self, payload):
+        """Pass a well-formed browser command to the controller process."""
+        try:
+            command = json.loads(payload)
+        except ValueError:
+            return
+        if not isinstance(command, dict):
+            return
+        device = self.state["devices"].get(command.get("device"))
+        if command.get("action") == "toggle" and device and device["type"] not in self.state["protected_types"]:
+            self.commands.send(("toggle", command["device"]))
+        elif command.get("action") == "scene" and command.get("scene") in self.state["scenes"]:
+            self.commands.send(("scene", command["scene"]))
+
+
+def dashboard_process(host, port, token, updates, commands, ready):
+    """Process entry point for the dashboard server."""
+    DashboardServer(host, port, token, updates, commands).run(ready)
+
+
+# =============================================================================
+# CONTROLLER SIDE
+# =============================================================================
+
+class DashboardBridge:
+    """
+    Connects the controller to the dashboard process.
+
+    The device listener only puts the batch on a queue, so the frame loop
+    never waits on pickling, pipes or viewers. A sender thread forwards
+    batches and telemetry; a receiver thread runs browser commands.
+    """
+
+    def __init__(self, host, port, protected_types=("door_lock",)):
+        import virtual_led_controller as vlc
+        self.vlc = vlc
+        self.protected_types = tuple(protected_types)
+        self.token = secrets.token_urlsafe(16)  # Per run; required on every request
+        self.outbox = queue.SimpleQueue()
+        updates_out, updates_in = multiprocessing.Pipe(duplex=False)
+        commands_out, commands_in = multiprocessing.Pipe(duplex=False)
+        ready_out, ready_in = multiprocessing.Pipe(duplex=False)
+        self.updates = updates_in
+        self.commands = commands_out
+        self.process = multiprocessing.Process(target=dashboard_process, name="web-dashboard", daemon=True,
+                                               args=(host, port, self.token, updates_out, commands_in, ready_in))
+        self.process.start()
+        self.port = ready_out.recv()
+        self.running = True
+
+        self.updates.send(("snapshot", self.snapshot()))
+        vlc.add_device_listener(self.on_device_change)
+        vlc.add_config_listener(self.on_config_change)
+        self.sender = threading.Thread(target=self._send_loop, name="dashboard-sender", daemon=True)
+        self.sender.start()
+        threading.Thread(target=self._command_loop, name="dashboard-commands", daemon=True).start()
+
+    def snapshot(self):
+        """Everything a viewer needs before it can apply diffs."""
+        vlc = self.vlc
+        version, states = vlc.get_device_states()
+        devices = {}
+        for device_id, status in states.items():
+            config = vlc.DEVICE_CONFIG[device_id]
+            devices[device_id] = dict(status, label=config['label'], type=config.get('type', 'led'),
+                                      color_on=config['color_on'])
+        return {
+            "version": version,
+            "devices": devices,
+            "scenes": [name for name in vlc.SCENES if self.web_allowed(name)],
+            "gestures": dict(vlc.GESTURE_TO_LED),
+            "telemetry": dict(vlc.telemetry),
+            "protected_types": list(self.protected_types),
+        }
+
+    def web_allowed(self, target):
+        """True if a device or scene may be changed from the web (no protected device involved)."""
+        vlc = self.vlc
+        devices = vlc.SCENES[target] if target in vlc.SCENES else [target]
+        return all(device_id in vlc.DEVICE_CONFIG
+                   and vlc.DEVICE_CONFIG[device_id].get('type', 'led') not in self.protected_types
+                   for device_id in devices)
+
+    def on_device_change(self, version, changes):
+        """Device listener (frame loop / GUI thread): just queue the batch."""
+        self.outbox.put(("diff", (version, changes, time.time())))
+
+    def on_config_change(self, gestures, scenes):
+        """Config listener: gestures/scenes changed, so viewers need a fresh snapshot."""
+        self.outbox.put(("resync", None))
+
+    def _send_loop(self):
+        next_telemetry = time.monotonic() + TELEMETRY_INTERVAL
+        try:
+            while self.running:
+                try:
+                    update = self.outbox.get(timeout=max(0.0, next_telemetry - time.monotonic()))
+                    if update[0] == "resync":
+                        update = ("snapshot", self.snapshot())
+                    self.updates.send(update)
+                    if update[0] == "stop":
+                        return
+                except queue.Empty:
+                    self.updates.send(("telemetry", dict(self.vlc.telemetry)))
+                    next_telemetry = time.monotonic() + TELEMETRY_INTERVAL
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _command_loop(self):
+        try:
+            while self.running:
+                action, target = self.commands.recv()
+                if not self.web_allowed(target):
+                    print(f"⚠ Dashboard: refused to change {target} from the web (protected device)")
+                elif action == "toggle" and target in self.vlc.DEVICE_CONFIG:
+                    self.vlc.toggle_led(target)
+                elif action == "scene" and target in self.vlc.SCENES:
+                    self.vlc.activate_scene(target)
+        except (EOFError, OSError):
+            pass
+
+    def stop(self):
+        """Disconnect from the controller and shut the dashboard process down."""
+        self.vlc.remove_device_listener(self.on_device_change)
+        self.vlc.remove_config_listener(self.on_config_change)
+        # Ask the server to exit: a forked child also holds our end of the
+        # pipe, so closing it alone never reaches EOF there
+        self.outbox.put(("stop", None))
+        self.sender.join(2)
+        self.running = False
+        self.updates.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+
+
+def start_dashboard(host="127.0.0.1", port=8080, protected_types=("door_lock",)):
+    """
+    Start the dashboard process and return its bridge (call stop() at shutdown).
+
+    Only this PC can connect unless host is "0.0.0.0" (whole LAN).
+    """
+    bridge = DashboardBridge(host, port, protected_types)
+    shown_host = socket.gethostname() if host in ("0.0.0.0", "") else host
+    print(f"🌐 Web dashboard: http://{shown_host}:{bridge.port}/?token={bridge.token}")
+    if protected_types:
+        print(f"   Read-only from the web: {', '.join(protected_types)} (and scenes that include one)")
+    return bridge
+
+
+# =============================================================================
+# DASHBOARD PAGE
+# =============================================================================
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Gesture Controller Dashboard</title>
+<style>
+  body { background: #1a1a1a; color: #fff; font-family: Arial, sans-serif; margin: 20px; }
+  h1 { color: #00FF00; font-size: 22px; }
+  #status { color: #888; font-size: 13px; margin-bottom: 16px; }
+  #devices { display: flex; flex-wrap: wrap; gap: 12px; }
+  .device { background: #2a2a2a; border: 2px solid #444; border-radius: 8px; padding: 12px;
+            width: 160px; cursor: pointer; text-align: center; }
+  .device .dot { width: 48px; height: 48px; border-radius: 50%; margin: 8px auto; background: #333; }
+  .device.on { border-color: #00FF00; }
+  .device.protected { cursor: default; }
+  .state { font-weight: bold; color: #FF0000; }
+  .on .state { color: #00FF00; }
+  #scenes button { background: #2a2a2a; color: #00FF00; border: 1px solid #00FF00; margin: 4px;
+                   padding: 6px 12px; cursor: pointer; }
+  #telemetry { color: #AAA; font-size: 13px; margin-top: 16px; }
+</style>
+</head>
+<body>
+<h1>&#9855; Accessible Gesture Controller</h1>
+<div id="status">Connecting...</div>
+<div id="devices"></div>
+<div id="scenes"></div>
+<div id="telemetry"></div>
+<script>
+let devices = {}, versions = {}, protectedTypes = [], ws;
+const token = new URLSearchParams(location.search).get('token') || '';
+
+function stateText(d) {
+  if (d.type === 'door_lock') return d.on ? 'UNLOCKED' : 'LOCKED';
+  if (d.type === 'tv' && d.on) return '\\u{1F4FA} ' + d.channel;
+  if (d.on && d.level !== undefined && d.level < 100) return 'ON ' + d.level + '%';
+  return d.on ? 'ON' : 'OFF';
+}
+
+function render(id) {
+  const d = devices[id];
+  let el = document.getElementById('dev-' + id);
+  if (!el) {
+    el = document.createElement('div');
+    el.id = 'dev-' + id;
+    el.className = 'device';
+    el.innerHTML = '<div class="label"></div><div class="dot"></div><div class="state"></div>';
+    document.getElementById('devices').appendChild(el);
+  }
+  if (protectedTypes.includes(d.type)) {
+    el.classList.add('protected');
+    el.title = 'Use a gesture to change this device';
+    el.onclick = null;
+  } else {
+    el.onclick = () => ws.send(JSON.stringify({action: 'toggle', device: id}));
+  }
+  el.classList.toggle('on', d.on);
+  el.querySelector('.label').textContent = d.label;
+  el.querySelector('.dot').style.background = d.on ? d.color_on : '#333';
+  el.querySelector('.state').textContent = stateText(d);
+}
+
+function connect() {
+  ws = new WebSocket('ws://' + location.host + '/ws?token=' + encodeURIComponent(token));
+  ws.onmessage = (event) => {
+    const msg = JSON.parse(event.data);
+    if (msg.type === 'snapshot') {
+      devices = msg.devices;
+      protectedTypes = msg.protected_types || [];
+      versions = {};
+      Object.keys(devices).forEach((id) => { versions[id] = msg.version; });
+      document.getElementById('devices').innerHTML = '';
+      Object.keys(devices).forEach(render);
+      const scenes = document.getElementById('scenes');
+      scenes.innerHTML = '';
+      msg.scenes.forEach((name) => {
+        const b = document.createElement('button');
+        b.textContent = '\\u{1F3AC} ' + name.replace(/_/g, ' ');
+        b.onclick = () => ws.send(JSON.stringify({action: 'scene', scene: name}));
+        scenes.appendChild(b);
+      });
+      document.getElementById('status').textContent = 'Connected to ' + msg.controller;
+    } else if (msg.type === 'diff') {
+      for (const [id, status] of Object.entries(msg.devices)) {
+        if (msg.version <= versions[id]) continue;  // Already included in the snapshot
+        versions[id] = msg.version;
+        Object.assign(devices[id], status);
+        render(id);
+      }
+    } else if (msg.type === 'telemetry') {
+      document.getElementById('telemetry').textContent =
+        'FPS ' + msg.fps + ' | frames ' + msg.frames + ' | hand ' + (msg.hand_detected ? 'yes' : 'no') +
+        ' | last gesture ' + (msg.last_gesture || '-') + ' | viewers ' + msg.viewers +
+        (msg.deadline_skipped === undefined ? '' : ' | skipped ' + msg.deadline_skipped + ' | late ' +
+          Object.values(msg.deadline_misses || {}).reduce((a, b) => a + b, 0));
+    }
+  };
+  ws.onclose = () => {
+    document.getElementById('status').textContent = 'Disconnected - retrying...';
+    setTimeout(connect, 2000);
+  };
+}
+connect();
+</script>
+</body>
+</html>
+"""